@@ -0,0 +1,68 @@
+"""Cold start of the `gps` command, each round in a fresh interpreter."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(*args):
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    subprocess.run([sys.executable, *args], env=env, check=True, capture_output=True)
+
+
+def bench_interpreter_baseline(benchmark):
+    benchmark.pedantic(_run, args=("-c", "pass"), rounds=20)
+
+
+def bench_cli_import(benchmark):
+    benchmark.pedantic(_run, args=("-c", "import pkg_wizard.cli"), rounds=20)
+
+
+def bench_cli_help(benchmark):
+    benchmark.pedantic(_run, args=("-m", "pkg_wizard.cli", "--help"), rounds=20)
+
+
+def bench_cli_generate(benchmark, fresh_dir):
+    def run():
+        _run("-m", "pkg_wizard.cli", "bench_pkg", "--sub_dirs", "core,utils")
+
+    def setup():
+        os.chdir(fresh_dir())
+
+    cwd = os.getcwd()
+    try:
+        benchmark.pedantic(run, setup=setup, rounds=10)
+    finally:
+        os.chdir(cwd)
+
+
+@pytest.fixture(scope="module")
+def zipapp(tmp_path_factory):
+    """Build the single-file `gps.pyz` with `tools/build_zipapp.py`."""
+    output = str(tmp_path_factory.mktemp("zipapp") / "gps.pyz")
+    _run(os.path.join(REPO_ROOT, "tools", "build_zipapp.py"), "-o", output)
+    return output
+
+
+def bench_zipapp_help(benchmark, zipapp):
+    benchmark.pedantic(_run, args=(zipapp, "--help"), rounds=20)
+
+
+def bench_zipapp_generate(benchmark, zipapp, fresh_dir):
+    def setup():
+        os.chdir(fresh_dir())
+
+    cwd = os.getcwd()
+    try:
+        benchmark.pedantic(
+            _run,
+            args=(zipapp, "bench_pkg", "--sub_dirs", "core,utils"),
+            setup=setup,
+            rounds=10,
+        )
+    finally:
+        os.chdir(cwd)
@@ -0,0 +1,20 @@
+"""Cost of each feature's `create_files()`, planned in memory."""
+
+import pytest
+
+from pkg_wizard.features import BUILTIN_FEATURES, load_feature
+from pkg_wizard.spec import PackageSpec
+from pkg_wizard.utils.plan import planning
+from pkg_wizard.utils.template import get_registry
+
+
+@pytest.mark.parametrize("name", list(BUILTIN_FEATURES))
+def bench_feature_create_files(benchmark, name):
+    get_registry()
+    feature = load_feature(name).from_spec(PackageSpec("bench_pkg"))
+
+    def run():
+        with planning():
+            feature.create_files()
+
+    benchmark(run)
@@ -0,0 +1,43 @@
+"""Full generation of one package and batch throughput."""
+
+import json
+import os
+
+import pytest
+
+from pkg_wizard.batch import run_batch
+from pkg_wizard.generator import build_plan, generate
+from pkg_wizard.spec import PackageSpec
+
+
+def bench_build_plan(benchmark):
+    spec = PackageSpec("bench_pkg", sub_dirs=["core", "utils"], llm=True)
+    benchmark(build_plan, spec)
+
+
+def bench_generate_package(benchmark, fresh_dir):
+    spec = PackageSpec("bench_pkg", sub_dirs=["core", "utils"], llm=True)
+
+    def setup():
+        return (spec, fresh_dir()), {}
+
+    benchmark.pedantic(generate, setup=setup, rounds=50)
+
+
+def bench_regenerate_unchanged_package(benchmark, tmp_path):
+    spec = PackageSpec("bench_pkg", sub_dirs=["core", "utils"], llm=True)
+    generate(spec, str(tmp_path))
+    benchmark(generate, spec, str(tmp_path))
+
+
+@pytest.mark.parametrize("count", [1, 100, 1000])
+def bench_batch(benchmark, fresh_dir, count):
+    def setup():
+        root = fresh_dir()
+        manifest = os.path.join(root, "packages.json")
+        with open(manifest, "w") as f:
+            json.dump([{"package_name": f"pkg_{i}"} for i in range(count)], f)
+        return (manifest,), {}
+
+    results = benchmark.pedantic(run_batch, setup=setup, rounds=3 if count > 1 else 10)
+    assert len(results) == count and not any("error" in r for r in results)
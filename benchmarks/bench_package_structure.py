@@ -0,0 +1,34 @@
+"""Directory creation for packages with many `--sub_dirs`."""
+
+import os
+
+import pytest
+
+from pkg_wizard.package_structure import PackageStructure
+from pkg_wizard.utils.plan import planning
+
+
+@pytest.mark.parametrize("count", [10, 100, 1000])
+def bench_create_directories(benchmark, fresh_dir, count):
+    sub_dirs = [f"module_{i}" for i in range(count)]
+    structure = PackageStructure("bench_pkg", sub_dirs=sub_dirs)
+    cwd = os.getcwd()
+
+    def setup():
+        os.chdir(fresh_dir())
+
+    try:
+        benchmark.pedantic(structure.create_directories, setup=setup, rounds=10)
+    finally:
+        os.chdir(cwd)
+
+
+@pytest.mark.parametrize("count", [10, 100, 1000])
+def bench_plan_directories(benchmark, count):
+    sub_dirs = [f"module_{i}" for i in range(count)]
+
+    def run():
+        with planning():
+            PackageStructure("bench_pkg", sub_dirs=sub_dirs).create_directories()
+
+    benchmark(run)
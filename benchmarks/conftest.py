@@ -0,0 +1,21 @@
+import itertools
+import os
+import sys
+
+import pytest
+
+# Make the checkout importable without installing it.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def fresh_dir(tmp_path):
+    """Return a function giving a new empty directory on every call."""
+    counter = itertools.count()
+
+    def make():
+        path = tmp_path / f"run_{next(counter)}"
+        path.mkdir()
+        return str(path)
+
+    return make
@@ -0,0 +1,5 @@
+from pkg_wizard.generator import generate
+from pkg_wizard.spec import PackageSpec
+from pkg_wizard.utils.sink import GenerationResult
+
+__all__ = ["generate", "GenerationResult", "PackageSpec"]
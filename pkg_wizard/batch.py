@@ -0,0 +1,134 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pkg_wizard.generator import generate
+from pkg_wizard.spec import PackageSpec
+from pkg_wizard.utils.template import get_registry
+
+
+def load_manifest(manifest_path):
+    """Load the package entries of a JSON or YAML manifest.
+
+    The manifest is either a list of entries or a mapping with a `packages` list.
+    Every entry is turned into a `PackageSpec`; its optional `target_dir` is resolved
+    relative to the manifest and defaults to a directory named after the package.
+    A relative `template_pack` is resolved relative to the manifest as well.
+
+    Args:
+        manifest_path (str): The path of the `.json`, `.yaml` or `.yml` manifest.
+
+    Returns:
+        list: `(PackageSpec, target_dir)` tuples, in manifest order.
+
+    Raises:
+        ImportError: If the manifest is YAML and PyYAML is not installed.
+        ValueError: If the manifest or one of its entries is malformed.
+    """
+    with open(manifest_path, "r") as f:
+        if manifest_path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError(
+                    "PyYAML is required to read YAML manifests: pip install pkg_wizard[yaml]"
+                )
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+
+    if isinstance(data, dict):
+        data = data.get("packages")
+    if not isinstance(data, list):
+        raise ValueError(f"The manifest {manifest_path} does not list any packages.")
+
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    entries = []
+    for index, entry in enumerate(data):
+        try:
+            if not isinstance(entry, dict):
+                raise ValueError(f"expected a mapping, got {entry!r}")
+            spec = PackageSpec.from_dict(entry)
+            target_dir = os.path.join(
+                base_dir, entry.get("target_dir", spec.package_name)
+            )
+            if spec.template_pack:
+                spec.template_pack = os.path.join(base_dir, spec.template_pack)
+        except (ValueError, TypeError) as e:
+            raise ValueError(
+                f"Invalid entry {index} of the manifest {manifest_path}: {e}"
+            )
+        entries.append((spec, target_dir))
+    return entries
+
+
+def _generate_entry(entry):
+    spec, target_dir = entry
+    try:
+        result = generate(spec, target_dir)
+    except Exception as e:
+        return {"package_name": spec.package_name, "error": str(e)}
+    return {
+        "package_name": spec.package_name,
+        "created": len(result.written) - len(result.updated),
+        "updated": len(result.updated),
+        "skipped": len(result.skipped),
+        "conflicts": len(result.conflicts),
+    }
+
+
+def _warm_up():
+    get_registry()
+
+
+def run_batch(manifest_path, max_workers=None):
+    """Generate every package of a manifest with a process pool.
+
+    Templates are loaded before the pool starts (and by each worker on platforms
+    that do not fork) so no worker pays for it per package.
+
+    Args:
+        manifest_path (str): The path of the manifest.
+        max_workers (int, optional): The number of worker processes. Defaults to the
+            number of CPUs.
+
+    Returns:
+        list: One result per package with the number of created, updated, skipped
+            and conflicting files, or the error that made the package fail.
+    """
+    entries = load_manifest(manifest_path)
+    _warm_up()
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(entries) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_warm_up) as pool:
+        return list(pool.map(_generate_entry, entries, chunksize=chunksize))
+
+
+def report_batch(results, events):
+    """Emit one event per package and a single aggregated summary.
+
+    Args:
+        results (list): The results returned by `run_batch`.
+        events (EventSink): Where to send the events.
+
+    Returns:
+        bool: True if every package was generated successfully.
+    """
+    failed = 0
+    for result in results:
+        if "error" in result:
+            failed += 1
+            events.emit("error", **result)
+        else:
+            events.emit("package", **result)
+    created = sum(result.get("created", 0) for result in results)
+    updated = sum(result.get("updated", 0) for result in results)
+    skipped = sum(result.get("skipped", 0) for result in results)
+    conflicts = sum(result.get("conflicts", 0) for result in results)
+    events.emit(
+        "message",
+        text=f"Generated {len(results) - failed}/{len(results)} packages: "
+        f"{created} files created, {updated} updated, {skipped} skipped, "
+        f"{conflicts} conflicts.",
+    )
+    events.flush()
+    return not failed
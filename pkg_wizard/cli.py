@@ -1,12 +1,27 @@
 import argparse
 import os
-from pkg_wizard.core.configuration_support import ConfigurationSupport
-from pkg_wizard.core.docker_support import DockerSupport
-from pkg_wizard.core.github_action_support import GithubActionSupport
-from pkg_wizard.core.init_dir import InitDir
-from pkg_wizard.core.pre_commit_support import PreCommitSupport
-from pkg_wizard.core.test_support import TestSupport
-from pkg_wizard.core.dev_container_support import DevContainerSupport
+import sys
+from pkg_wizard.client import archive_via_daemon, generate_via_daemon
+from pkg_wizard.generator import generate
+from pkg_wizard.features import BUILTIN_FEATURES, available_features
+from pkg_wizard.spec import (
+    DEFAULT_DOCKER_IMAGE,
+    DOCKER_RUNTIMES,
+    DOCKER_VARIANTS,
+    FEATURES,
+    INSTALLERS,
+    PRE_COMMIT_PROFILES,
+    PackageSpec,
+)
+from pkg_wizard.utils.installers import is_locked, lock_package
+from pkg_wizard.utils.sink import ARCHIVE_FORMATS
+from pkg_wizard.utils.events import (
+    EVENT_FORMATS,
+    emit_result,
+    emit_timings,
+    get_event_sink,
+)
+from pkg_wizard.utils.trace import NULL_TRACER, Tracer
 
 
 def print_pypi_instructions():
@@ -43,33 +58,94 @@ The GitHub Actions workflow will use this secret to publish your package to PyPI
     )
 
 
-def main():
-    """Generate a Python package structure with optional Docker support.
+def write_archive(spec, archive, archive_format=None, daemon=None):
+    """Generate a package straight into an archive file or stdout.
 
     Args:
-        package_name (str): The name of the package to create.
-        docker_image (str): The Docker image to use (default: python:3.9-slim).
+        spec (PackageSpec): The package to generate.
+        archive (str): The archive path, or '-' to stream to stdout.
+        archive_format (str, optional): 'tar.gz' or 'zip'. Inferred from the archive
+            path when omitted.
+        daemon (str, optional): The address of a running generator daemon.
 
     Returns:
         None
 
     Raises:
-        argparse.ArgumentError: If there are issues with parsing command-line arguments.
-        FileNotFoundError: If any file creation operation fails.
-        OSError: If there are issues with directory creation or file writing.
+        ValueError: If the package cannot be generated.
+        OSError: If the archive cannot be written.
+    """
+    if archive_format is None:
+        archive_format = "zip" if archive.endswith(".zip") else "tar.gz"
+    if archive == "-":
+        archive_via_daemon(spec, sys.stdout.buffer, archive_format, daemon)
+        sys.stdout.buffer.flush()
+        return
+    with open(archive, "wb") as f:
+        try:
+            archive_via_daemon(spec, f, archive_format, daemon)
+        except Exception:
+            # Do not leave an empty or truncated archive behind.
+            f.close()
+            os.remove(archive)
+            raise
+
+
+def exit_with_error(events, package_name, error):
+    """Report a package that could not be generated and exit with status 1.
+
+    Args:
+        events (EventSink): Where to report the error.
+        package_name (str): The name of the package.
+        error (Exception): The reason it failed.
+    """
+    events.emit("error", package_name=package_name, error=str(error))
+    events.flush()
+    sys.exit(1)
+
+
+def add_spec_arguments(parser):
+    """Add the options describing a package, shared by `gps` and `gps watch`.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser to add them to.
     """
-    parser = argparse.ArgumentParser(
-        description="Generate a Python package structure with optional Docker support."
-    )
-    parser.add_argument(
-        "package_name", type=str, help="The name of the package to create."
-    )
     parser.add_argument(
         "--docker_image",
         type=str,
-        default="python:3.9-slim",
+        default=DEFAULT_DOCKER_IMAGE,
         help="The Docker image to use (default: python:3.9-slim).",
     )
+    parser.add_argument(
+        "--docker_variant",
+        choices=DOCKER_VARIANTS,
+        default="simple",
+        help="The Dockerfile layout: a single stage (simple), or a multi-stage build "
+        "with a cached dependency layer, a wheel builder stage and a .dockerignore "
+        "(multistage). Default: simple.",
+    )
+    parser.add_argument(
+        "--docker_runtime",
+        choices=DOCKER_RUNTIMES,
+        default=None,
+        help="Also write a Dockerfile.runtime for a slim, precompiled production image "
+        "on a slim or distroless base, and scripts/benchmark_runtime.py to measure it.",
+    )
+    parser.add_argument(
+        "--installer",
+        choices=INSTALLERS,
+        default="pip",
+        help="How the generated Dockerfile, devcontainer and workflows install the "
+        "requirements: resolved by pip (default), or from lock files with hashes "
+        "written by pip-tools or uv.",
+    )
+    parser.add_argument(
+        "--pre_commit_profile",
+        choices=PRE_COMMIT_PROFILES,
+        default="default",
+        help="The pre-commit hooks: docformatter, black and checks (default), or a "
+        "single ruff lint and format hook with docformatter in a CI-only stage (fast).",
+    )
     parser.add_argument(
         "--sub_dirs",
         nargs="*",
@@ -80,84 +156,321 @@ def main():
         "--exclude_features",
         nargs="*",
         default=[],
-        choices=[
-            "config",
-            "docker",
-            "github_actions",
-            "pre_commit",
-            "tests",
-            "dev_container",
-        ],
-        help="The features to exclude from the package.",
+        metavar="FEATURE",
+        help="The features to exclude from the package: "
+        + ", ".join(BUILTIN_FEATURES)
+        + " or a plugin feature.",
     )
     parser.add_argument(
         "--include_features",
         nargs="*",
-        default=[
-            "config",
-            "docker",
-            "github_actions",
-            "pre_commit",
-            "tests",
-            "dev_container",
-        ],
-        choices=[
-            "config",
-            "docker",
-            "github_actions",
-            "pre_commit",
-            "tests",
-            "dev_container",
-        ],
-        help="The features to include in the package (default: all features).",
-    )
-
-    # add llm support arg
+        default=FEATURES,
+        metavar="FEATURE",
+        help="The features to include in the package (default: "
+        + ", ".join(FEATURES)
+        + ").",
+    )
     parser.add_argument(
         "--llm",
         action="store_true",
         help="Include support for the LLM package.",
     )
+    parser.add_argument(
+        "--lazy_init",
+        action="store_true",
+        help="Generate __init__.py files that import submodules and public names on "
+        "first access (PEP 562), so that importing the package stays cheap.",
+    )
+    parser.add_argument(
+        "--template_pack",
+        type=str,
+        default=None,
+        help="A directory or tarball of templates overriding or extending the "
+        "built-in ones, laid out as <feature folder>/<file>.",
+    )
 
-    args = parser.parse_args()
 
-    # set the package name in the environment variable
-    os.environ["PACKAGE_NAME"] = args.package_name
-    os.environ["BASE_IMAGE"] = args.docker_image
-    print(args.sub_dirs)
-    # ['units,core']
-    if args.sub_dirs:
-        dirs = args.sub_dirs[0]
-        dirs = dirs.split(",")
+def spec_from_args(parser, args):
+    """Build the package spec from the options of `add_spec_arguments()`.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser, to report invalid options.
+        args (argparse.Namespace): The parsed options, with a `package_name`.
+
+    Returns:
+        PackageSpec: The package to generate.
+    """
+    requested = set(args.include_features + args.exclude_features)
+    if not requested.issubset(BUILTIN_FEATURES):
+        unknown = requested.difference(available_features())
+        if unknown:
+            parser.error(f"unknown features: {', '.join(sorted(unknown))}")
+    return PackageSpec(
+        args.package_name,
+        docker_image=args.docker_image,
+        sub_dirs=args.sub_dirs,
+        include_features=args.include_features,
+        exclude_features=args.exclude_features,
+        llm=args.llm,
+        template_pack=args.template_pack,
+        docker_variant=args.docker_variant,
+        docker_runtime=args.docker_runtime,
+        installer=args.installer,
+        pre_commit_profile=args.pre_commit_profile,
+        lazy_init=args.lazy_init,
+    )
+
+
+def serve_main(argv):
+    """Run the generator daemon (`gps serve`).
+
+    Args:
+        argv (list): The command-line arguments following `serve`.
+    """
+    from pkg_wizard.server import DEFAULT_HOST, DEFAULT_PORT, serve
+
+    parser = argparse.ArgumentParser(
+        prog="gps serve",
+        description="Keep templates and features warm and serve generation requests.",
+    )
+    parser.add_argument("--socket", type=str, help="Listen on this Unix socket.")
+    parser.add_argument("--host", type=str, default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+    serve(args.socket, args.host, args.port)
+
+
+def watch_main(argv):
+    """Regenerate preview trees as templates change (`gps watch`).
+
+    Args:
+        argv (list): The command-line arguments following `watch`.
+    """
+    from pkg_wizard.batch import load_manifest
+    from pkg_wizard.watch import CONTENT_DIR, PreviewWatcher
+
+    parser = argparse.ArgumentParser(
+        prog="gps watch",
+        description="Re-render the files of preview packages whenever one of the "
+        "templates they are generated from changes.",
+    )
+    parser.add_argument(
+        "package_name",
+        type=str,
+        nargs="?",
+        help="The name of the preview package (not needed with --manifest).",
+    )
+    parser.add_argument(
+        "--preview_dir",
+        type=str,
+        default="preview",
+        help="The directory the preview package is generated into (default: preview).",
+    )
+    add_spec_arguments(parser)
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        help="A JSON or YAML manifest of several preview packages to keep in sync.",
+    )
+    parser.add_argument(
+        "--content_dir",
+        type=str,
+        default=CONTENT_DIR,
+        help="The template sources to watch (default: the installed templates).",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="Poll for changes instead of using inotify.",
+    )
+    parser.add_argument("--event_format", choices=EVENT_FORMATS, default="human")
+    args = parser.parse_args(argv)
+
+    if args.manifest:
+        try:
+            previews = load_manifest(args.manifest)
+        except (ValueError, OSError, ImportError) as e:
+            parser.exit(1, f"{parser.prog}: error: {e}\n")
+    elif args.package_name:
+        previews = [(spec_from_args(parser, args), args.preview_dir)]
     else:
-        dirs = []
+        parser.error("package_name is required unless --manifest is given.")
 
-    from pkg_wizard.package_structure import PackageStructure
+    events = get_event_sink(args.event_format)
+    PreviewWatcher(previews, events, args.content_dir).run(args.poll)
 
-    if args.llm:
-        dirs.append("llm")
 
-    # Create package structure and files
-    package_structure = PackageStructure(args.package_name, args.docker_image, dirs)
-    package_structure.create_directories()
-    ConfigurationSupport(package_name=args.package_name).create_files()
-    DockerSupport(docker_image=args.docker_image).create_files()
-    GithubActionSupport().create_files()
-    PreCommitSupport().create_files()
-    TestSupport().create_test_init()
-    DevContainerSupport(pakcage_name=args.package_name).create_files()
+def main():
+    """Generate a Python package structure with optional Docker support.
 
-    if args.llm:
-        from pkg_wizard.core.llm_support import LLMSupport
+    Args:
+        package_name (str): The name of the package to create.
+        docker_image (str): The Docker image to use (default: python:3.9-slim).
 
-        LLMSupport(package_name=args.package_name).create_files()
+    Returns:
+        None
 
-    InitDir().create_init_file(args.package_name, dirs)
+    Raises:
+        argparse.ArgumentError: If there are issues with parsing command-line arguments.
+        FileNotFoundError: If any file creation operation fails.
+        OSError: If there are issues with directory creation or file writing.
+    """
+    if sys.argv[1:2] == ["serve"]:
+        return serve_main(sys.argv[2:])
+    if sys.argv[1:2] == ["watch"]:
+        return watch_main(sys.argv[2:])
 
-    print(
-        f"Successfully created Python package: {args.package_name} with Docker Image: {args.docker_image} and devcontaier support.\n"
+    parser = argparse.ArgumentParser(
+        description="Generate a Python package structure with optional Docker support."
+    )
+    parser.add_argument(
+        "package_name",
+        type=str,
+        nargs="?",
+        help="The name of the package to create (not needed with --manifest).",
+    )
+    add_spec_arguments(parser)
+
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        help="A JSON or YAML manifest listing many packages to generate in parallel.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="The number of worker processes used with --manifest (default: CPU count).",
+    )
+
+    parser.add_argument(
+        "--archive",
+        type=str,
+        help="Write the package into a tar.gz or zip archive instead of the current "
+        "directory ('-' for stdout).",
     )
-    print_pypi_instructions()
+    parser.add_argument(
+        "--archive_format",
+        choices=ARCHIVE_FORMATS,
+        default=None,
+        help="The archive format (default: inferred from --archive, else tar.gz).",
+    )
+
+    parser.add_argument(
+        "--daemon",
+        type=str,
+        default=None,
+        help="The address of a `gps serve` daemon (Unix socket path or host:port); "
+        "falls back to in-process generation when it is not running.",
+    )
+
+    parser.add_argument(
+        "--retrofit",
+        action="store_true",
+        help="Add the selected features to the existing repository in the current "
+        "directory, writing only missing or stale files.",
+    )
+
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print the wall time and I/O of every stage at the end of the run.",
+    )
+    parser.add_argument(
+        "--trace",
+        type=str,
+        help="Write per-feature and per-file timings to this Chrome trace JSON file.",
+    )
+
+    parser.add_argument(
+        "--event_format",
+        choices=EVENT_FORMATS,
+        default="human",
+        help="How progress is reported: human readable messages, only errors and "
+        "conflicts (quiet), or one JSON object per line (json).",
+    )
+
+    args = parser.parse_args()
+    # Keep stdout free for the archive when it is streamed there.
+    stream = sys.stderr if args.archive == "-" else sys.stdout
+    events = get_event_sink(args.event_format, stream)
+
+    if args.manifest:
+        from pkg_wizard.batch import report_batch, run_batch
+
+        try:
+            results = run_batch(args.manifest, max_workers=args.workers)
+        except (ValueError, OSError, ImportError) as e:
+            parser.exit(1, f"{parser.prog}: error: {e}\n")
+        if not report_batch(results, events):
+            sys.exit(1)
+        return
+    if not args.package_name:
+        parser.error("package_name is required unless --manifest is given.")
+    if args.retrofit and args.archive:
+        parser.error("--retrofit writes into the current directory, not an archive.")
+    spec = spec_from_args(parser, args)
+
+    if args.archive:
+        try:
+            write_archive(spec, args.archive, args.archive_format, args.daemon)
+        except (ValueError, OSError) as e:
+            exit_with_error(events, spec.package_name, e)
+        if args.archive != "-":
+            events.emit(
+                "message",
+                text=f"Successfully wrote Python package {spec.package_name} to {args.archive}",
+            )
+        if is_locked(spec.installer):
+            events.emit(
+                "message",
+                text="Run scripts/lock.sh in the extracted package to write its "
+                "lock files.",
+            )
+        events.flush()
+        return
+
+    try:
+        if args.timings or args.trace or args.retrofit:
+            # Timings are only meaningful for an in-process generation, and the
+            # daemon only generates new packages.
+            tracer = Tracer() if args.timings or args.trace else None
+            result = generate(
+                spec, ".", tracer=tracer or NULL_TRACER, retrofit=args.retrofit
+            )
+        else:
+            tracer = None
+            result = generate_via_daemon(spec, ".", args.daemon)
+    except (ValueError, OSError) as e:
+        exit_with_error(events, spec.package_name, e)
+
+    emit_result(events, result, spec.package_name)
+    if is_locked(spec.installer):
+        # Resolving the locks needs the network, so it runs once the package is
+        # written rather than while it is generated.
+        try:
+            locked = lock_package(spec.installer, ".")
+        except (OSError, RuntimeError) as e:
+            exit_with_error(events, spec.package_name, e)
+        if locked:
+            events.emit("message", text=f"Locked {', '.join(locked)}")
+    if args.retrofit:
+        text = (
+            f"Retrofitted {args.package_name}: {len(result.written)} files written, "
+            f"{len(result.skipped)} already present, {len(result.conflicts)} conflicts.\n"
+        )
+    else:
+        text = f"Successfully created Python package: {args.package_name} with Docker Image: {args.docker_image} and devcontaier support.\n"
+    events.emit("message", text=text)
+    if tracer is not None:
+        if args.trace:
+            tracer.export(args.trace)
+        if args.timings:
+            emit_timings(events, tracer)
+    events.flush()
+    # A retrofitted repository is not a new package to publish.
+    if args.event_format == "human" and not args.retrofit:
+        print_pypi_instructions()
 
 
 if __name__ == "__main__":
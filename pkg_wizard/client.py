@@ -0,0 +1,192 @@
+import json
+import os
+import shutil
+from pkg_wizard.generator import generate
+from pkg_wizard.utils.sink import ArchiveSink, GenerationResult
+
+# The daemon address used when none is given: a Unix socket path or host:port.
+DAEMON_ENV = "PKG_WIZARD_DAEMON"
+
+DEFAULT_TIMEOUT = 30
+
+# Requests carry the token of the daemon in this header. The daemon writes its
+# token to a file only its user can read, see `token_path()`.
+TOKEN_HEADER = "X-PKG-Wizard-Token"
+
+
+def _is_socket(address):
+    return "/" in address or address.endswith(".sock")
+
+
+def _host_key(host):
+    """Return the same name for every spelling of a host.
+
+    Loopback and wildcard addresses (`localhost`, `127.0.0.1`, `::1`, `0.0.0.0`)
+    all reach a daemon of this machine, so they are keyed on the port alone.
+    Other hosts are keyed on their first resolved address.
+    """
+    import ipaddress
+    import socket
+
+    try:
+        infos = socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)
+    except (socket.gaierror, UnicodeError):
+        return host
+    addresses = sorted({info[4][0].partition("%")[0] for info in infos})
+    ips = [ipaddress.ip_address(address) for address in addresses]
+    if all(ip.is_loopback or ip.is_unspecified for ip in ips):
+        return "local"
+    return addresses[0]
+
+
+def token_path(address):
+    """Return the file holding the token of the daemon listening on an address.
+
+    Args:
+        address (str): A Unix socket path or host:port.
+
+    Returns:
+        str: `<socket>.token` next to a Unix socket, or a file of the cache
+            directory for a TCP port, named the same for every spelling of the
+            host.
+    """
+    if _is_socket(address):
+        return f"{address}.token"
+    from pkg_wizard.utils.packs import cache_dir
+
+    host, _, port = address.rpartition(":")
+    host = _host_key(host.strip("[]") or "127.0.0.1")
+    return os.path.join(cache_dir(), "daemons", f"{host}-{port}.token")
+
+
+def _read_token(address):
+    try:
+        with open(token_path(address), "r") as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+# The errors of connecting to an address nothing listens on. Only these fall back
+# to in-process generation: once a request is sent, the daemon may be writing the
+# package, so any later error is raised.
+NOT_RUNNING_ERRORS = (ConnectionRefusedError, FileNotFoundError)
+
+
+def _connect(address):
+    """Return a connection to the daemon, connected before any request is sent.
+
+    Raises:
+        ConnectionRefusedError: If nothing listens on a TCP port or Unix socket.
+        FileNotFoundError: If the Unix socket does not exist.
+    """
+    # Imported here so that commands not talking to a daemon do not pay for them.
+    import http.client
+    import socket
+
+    if _is_socket(address):
+        connection = http.client.HTTPConnection("localhost", timeout=DEFAULT_TIMEOUT)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(DEFAULT_TIMEOUT)
+        try:
+            sock.connect(address)
+        except OSError:
+            sock.close()
+            raise
+        connection.sock = sock
+        return connection
+    host, _, port = address.rpartition(":")
+    connection = http.client.HTTPConnection(
+        host or "127.0.0.1", int(port), DEFAULT_TIMEOUT
+    )
+    connection.connect()
+    return connection
+
+
+def _post(connection, address, body):
+    headers = {"Content-Type": "application/json"}
+    token = _read_token(address)
+    if token is not None:
+        headers[TOKEN_HEADER] = token
+    connection.request("POST", "/generate", json.dumps(body), headers)
+    return connection.getresponse()
+
+
+def _check(response):
+    if response.status != 200:
+        raise ValueError(json.loads(response.read()).get("error", response.reason))
+
+
+def _spec_data(spec):
+    # The daemon does not share our working directory.
+    data = spec.to_dict()
+    if data["template_pack"]:
+        data["template_pack"] = os.path.abspath(data["template_pack"])
+    return data
+
+
+def generate_via_daemon(spec, target_dir, address=None):
+    """Generate a package through the daemon, or in-process when none is running.
+
+    Args:
+        spec (PackageSpec): The package to generate.
+        target_dir (str): The project root the package is generated into.
+        address (str, optional): The daemon address, a Unix socket path or
+            host:port. Defaults to the `PKG_WIZARD_DAEMON` environment variable.
+
+    Returns:
+        GenerationResult: The written, skipped and conflicting paths.
+
+    Raises:
+        ValueError: If the daemon rejects the request.
+        OSError: If the connection fails after the request was sent, for example
+            on a timeout.
+    """
+    address = address or os.environ.get(DAEMON_ENV)
+    if not address:
+        return generate(spec, target_dir)
+    body = {"spec": _spec_data(spec), "target_dir": os.path.abspath(target_dir)}
+    try:
+        connection = _connect(address)
+    except NOT_RUNNING_ERRORS:
+        return generate(spec, target_dir)
+    try:
+        response = _post(connection, address, body)
+        _check(response)
+        return GenerationResult.from_dict(json.loads(response.read()))
+    finally:
+        connection.close()
+
+
+def archive_via_daemon(spec, fileobj, archive_format="tar.gz", address=None):
+    """Stream a package archive from the daemon, or build it in-process.
+
+    Args:
+        spec (PackageSpec): The package to generate.
+        fileobj (file): The binary file object to write the archive to.
+        archive_format (str, optional): 'tar.gz' or 'zip'. Defaults to 'tar.gz'.
+        address (str, optional): The daemon address, a Unix socket path or
+            host:port. Defaults to the `PKG_WIZARD_DAEMON` environment variable.
+
+    Raises:
+        ValueError: If the daemon rejects the request.
+        OSError: If the connection fails after the request was sent, for example
+            on a timeout.
+    """
+    address = address or os.environ.get(DAEMON_ENV)
+    sink = ArchiveSink(fileobj, archive_format, root=spec.package_name)
+    if not address:
+        generate(spec, sink=sink)
+        return
+    body = {"spec": _spec_data(spec), "archive": archive_format}
+    try:
+        connection = _connect(address)
+    except NOT_RUNNING_ERRORS:
+        generate(spec, sink=sink)
+        return
+    try:
+        response = _post(connection, address, body)
+        _check(response)
+        shutil.copyfileobj(response, fileobj)
+    finally:
+        connection.close()
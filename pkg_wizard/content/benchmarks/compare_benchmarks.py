@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Compare pytest-benchmark results with the stored baseline.
+
+Fails when a benchmark is slower than its baseline by more than the threshold of
+tests/benchmarks/config.json (a fraction, per benchmark in "thresholds").
+
+Usage:
+    pytest tests/benchmarks --benchmark-only --benchmark-json results.json
+    python scripts/compare_benchmarks.py results.json [--update]
+"""
+import argparse
+import json
+import os
+import sys
+
+
+def load_results(path, stat):
+    """Return the stat of every benchmark of a pytest-benchmark JSON file."""
+    with open(path, "r") as f:
+        data = json.load(f)
+    return {
+        benchmark["fullname"]: benchmark["stats"][stat]
+        for benchmark in data["benchmarks"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("results", help="The --benchmark-json output.")
+    parser.add_argument("--config", default="tests/benchmarks/config.json")
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="Store the results as the new baseline instead of comparing.",
+    )
+    args = parser.parse_args()
+
+    with open(args.config, "r") as f:
+        config = json.load(f)
+    stat = config.get("stat", "median")
+    results = load_results(args.results, stat)
+
+    if args.update:
+        with open(config["baseline"], "w") as f:
+            json.dump(
+                {"stat": stat, "benchmarks": results}, f, indent=4, sort_keys=True
+            )
+        print(f"Stored {len(results)} benchmarks in {config['baseline']}")
+        return 0
+
+    if not os.path.exists(config["baseline"]):
+        print(f"No baseline at {config['baseline']}: run with --update to store one.")
+        return 0
+    with open(config["baseline"], "r") as f:
+        baseline = json.load(f)["benchmarks"]
+
+    regressions = 0
+    print(f"{'benchmark':<60}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name, current in sorted(results.items()):
+        if name not in baseline:
+            print(f"{name:<60}{'new':>12}{current:>12.6f}")
+            continue
+        change = current / baseline[name] - 1
+        threshold = config.get("thresholds", {}).get(name, config["threshold"])
+        flag = ""
+        if change > threshold:
+            regressions += 1
+            flag = f"  regression (> {threshold:.0%})"
+        print(f"{name:<60}{baseline[name]:>12.6f}{current:>12.6f}{change:>+9.1%}{flag}")
+
+    if regressions:
+        print(f"{regressions} benchmarks regressed past their threshold.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
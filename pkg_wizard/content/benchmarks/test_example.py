@@ -0,0 +1,19 @@
+"""Example benchmark, to be replaced by benchmarks of the hot paths of
+{{package_name}}.
+
+Run the benchmarks with `pytest tests/benchmarks --benchmark-only`. Under
+pytest-xdist they run once each, as plain tests, without being timed.
+"""
+
+import pytest
+
+
+def sum_of_squares(values):
+    return sum(value * value for value in values)
+
+
+@pytest.mark.benchmark(group="example")
+def test_sum_of_squares(benchmark):
+    values = list(range(10_000))
+    result = benchmark(sum_of_squares, values)
+    assert result == 333283335000
@@ -0,0 +1,10 @@
+#!/bin/sh
+# Locks the requirements with hashes. Run it after editing a requirements file
+# and commit the lock files: every environment installs from them.
+set -e
+
+cd "$(dirname "$0")/.."
+
+{{lock}} requirements.lock requirements.txt
+{{lock}} dev_requirements.lock requirements.txt dev_requirements.txt build_requirements.txt
+{{lock}} build_requirements.lock build_requirements.txt
@@ -0,0 +1,38 @@
+#!/bin/sh
+# Installs the development dependencies, unless the image or a previous run
+# already installed them from a lock file with the same hash.
+set -e
+
+cd "${1:-.}"
+echo "$PWD"
+
+STAMP_DIR=/opt/devcontainer
+PRE_COMMIT_HOME=${PRE_COMMIT_HOME:-$HOME/.cache/pre-commit}
+
+requirements_hash() {
+    sha256sum dev_requirements.lock 2>/dev/null || true
+}
+
+# The lock file is only there with the config feature, once it is locked.
+if [ "$(requirements_hash)" != "$(cat "$STAMP_DIR/requirements.sha256" 2>/dev/null)" ]; then
+    {{install}} -r dev_requirements.lock
+    mkdir -p "$STAMP_DIR"
+    requirements_hash > "$STAMP_DIR/requirements.sha256"
+else
+    echo "Lock file unchanged, skipping install"
+fi
+
+if [ -f .pre-commit-config.yaml ]; then
+    command -v pre-commit > /dev/null || pip install pre-commit
+    pre-commit install
+    # The hooks live in the pre-commit cache volume of this package. Docker fills
+    # a new volume with the hooks baked into the image; after the config changes,
+    # the volume keeps the old hooks until they are installed again here.
+    stamp="$PRE_COMMIT_HOME/{{package_name}}.sha256"
+    if [ "$(sha256sum .pre-commit-config.yaml)" != "$(cat "$stamp" 2>/dev/null)" ]; then
+        pre-commit install-hooks
+        sha256sum .pre-commit-config.yaml > "$stamp"
+    else
+        echo "Pre-commit config unchanged, skipping hook installation"
+    fi
+fi
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Build the runtime image and report its size and start-to-import time.
+
+Usage: python scripts/benchmark_runtime.py [--image NAME] [--runs N]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--image", default="{{package_name}}-runtime")
+    parser.add_argument("--module", default="{{package_name}}")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no_build", action="store_true")
+    args = parser.parse_args()
+
+    if not args.no_build:
+        subprocess.run(
+            ["docker", "build", "-f", "Dockerfile.runtime", "-t", args.image, "."],
+            check=True,
+        )
+    inspect = subprocess.run(
+        ["docker", "image", "inspect", args.image],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    size = json.loads(inspect.stdout)[0]["Size"]
+
+    timings = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        subprocess.run(
+            ["docker", "run", "--rm", args.image, "-c", f"import {args.module}"],
+            check=True,
+        )
+        timings.append(time.perf_counter() - start)
+
+    print(f"Image:            {args.image}")
+    print(f"Size:             {size / 1024 / 1024:.1f} MiB")
+    print(f"Start-to-import:  {statistics.median(timings) * 1000:.0f} ms median")
+    print(f"                  {min(timings) * 1000:.0f} ms best of {args.runs}")
+
+
+if __name__ == "__main__":
+    main()
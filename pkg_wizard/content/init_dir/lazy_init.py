@@ -0,0 +1,40 @@
+"""Initialize the {{description}}.
+
+Submodules and public names are imported on first access (PEP 562), so importing
+it costs almost nothing until its attributes are used. Register a public name in
+_LAZY_NAMES as `"Name": ".module"`, and import it in the TYPE_CHECKING block for
+type checkers and IDEs.
+"""
+
+# Type checkers treat any TYPE_CHECKING constant as true; `typing` is not imported
+# at runtime as it is slow to import.
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    {{type_checking_imports}}
+
+# Submodules, imported on first access.
+_SUBMODULES = {{submodules}}
+
+# Public names, mapped to the module defining them, relative to this package.
+_LAZY_NAMES = {}
+
+__all__ = sorted([*_SUBMODULES, *_LAZY_NAMES])
+
+
+def __getattr__(name):
+    from importlib import import_module
+
+    if name in _SUBMODULES:
+        value = import_module(f".{name}", __name__)
+    elif name in _LAZY_NAMES:
+        value = getattr(import_module(_LAZY_NAMES[name], __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Later accesses find the attribute without calling __getattr__.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *__all__})
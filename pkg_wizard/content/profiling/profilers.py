@@ -0,0 +1,151 @@
+"""The profilers behind `profile_block`, only imported when profiling is enabled."""
+
+import itertools
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+_counter = itertools.count()
+_active = threading.local()
+
+# tracemalloc traces the whole process: it runs while any block needs it.
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+
+TOP_ALLOCATIONS = 50
+
+
+class CProfiler:
+    """Deterministic profiling of every function call, with cProfile."""
+
+    extensions = ("prof",)
+
+    def start(self):
+        import cProfile
+
+        self.profile = cProfile.Profile()
+        try:
+            self.profile.enable()
+        except ValueError:
+            # Since Python 3.12, a single profiler can run at a time per process.
+            logger.info("Another profiler is active, skipping cProfile")
+            self.profile = None
+
+    def stop(self, path):
+        if self.profile is None:
+            return
+        self.profile.disable()
+        self.profile.dump_stats(path)
+
+
+class TracemallocProfiler:
+    """A snapshot of the memory allocated by the block, with tracemalloc."""
+
+    extensions = ("tracemalloc", "txt")
+
+    def start(self):
+        global _tracemalloc_users
+        import tracemalloc
+
+        with _tracemalloc_lock:
+            if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start(25)
+            _tracemalloc_users += 1
+
+    def stop(self, snapshot_path, top_path):
+        global _tracemalloc_users
+        import tracemalloc
+
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        with _tracemalloc_lock:
+            _tracemalloc_users -= 1
+            if _tracemalloc_users == 0:
+                tracemalloc.stop()
+        snapshot.dump(snapshot_path)
+        with open(top_path, "w") as f:
+            f.write(f"current: {current} B, peak: {peak} B\n")
+            for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+                f.write(f"{stat}\n")
+
+
+class SamplingProfiler:
+    """Wall-clock stack samples of the profiled thread, taken by another thread."""
+
+    extensions = ("folded",)
+
+    def __init__(self, interval):
+        self.interval = interval
+
+    def start(self):
+        self.thread_id = threading.get_ident()
+        self.stacks = Counter()
+        self.done = threading.Event()
+        self.sampler = threading.Thread(target=self._sample, daemon=True)
+        self.sampler.start()
+
+    def _sample(self):
+        while not self.done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                name = os.path.basename(code.co_filename)
+                stack.append(f"{code.co_name} ({name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self, path):
+        self.done.set()
+        self.sampler.join()
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class ProfileBlock:
+    """Runs the enabled profilers around a block and writes their results."""
+
+    def __init__(self, name, enabled, output_dir, interval):
+        self.name = name
+        self.output_dir = output_dir
+        self.profilers = []
+        for profiler in enabled:
+            if profiler == "cprofile":
+                self.profilers.append(CProfiler())
+            elif profiler == "tracemalloc":
+                self.profilers.append(TracemallocProfiler())
+            elif profiler == "sampling":
+                self.profilers.append(SamplingProfiler(interval))
+
+    def __enter__(self):
+        self.nested = getattr(_active, "depth", 0) > 0
+        _active.depth = getattr(_active, "depth", 0) + 1
+        if not self.nested:
+            for profiler in self.profilers:
+                profiler.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        _active.depth -= 1
+        if self.nested:
+            return False
+        safe_name = "".join(c if c.isalnum() or c in "._-" else "_" for c in self.name)
+        stem = os.path.join(
+            self.output_dir,
+            f"{safe_name}-{time.strftime('%Y%m%d-%H%M%S')}"
+            f"-{os.getpid()}-{next(_counter)}",
+        )
+        for profiler in reversed(self.profilers):
+            try:
+                os.makedirs(self.output_dir, exist_ok=True)
+                profiler.stop(*(f"{stem}.{ext}" for ext in profiler.extensions))
+            except OSError:
+                logger.exception("Cannot write the %s profile", self.name)
+        return False
@@ -0,0 +1,96 @@
+"""Opt-in profiling of {{package_name}}, switched on by environment variables.
+
+{{env_prefix}}_PROFILE lists the profilers to run, separated by commas:
+`cprofile`, `tracemalloc` and `sampling`, or `all`. Every profiled call then
+writes its results to {{env_prefix}}_PROFILE_DIR (default: `profiles`):
+
+- cProfile stats (`.prof`), for `python -m pstats` or snakeviz;
+- a tracemalloc snapshot (`.tracemalloc`) and its top allocations (`.txt`);
+- wall-clock stack samples taken every {{env_prefix}}_PROFILE_INTERVAL
+  seconds (default: 0.005) in the folded format of flamegraph.pl and
+  speedscope (`.folded`).
+
+Usage:
+
+    from {{package_name}}.profiling import profile_block, profiled
+
+    @profiled
+    def handle(request):
+        ...
+
+    with profile_block("startup"):
+        ...
+
+The variables are read once, at import. When no profiler is enabled,
+`profiled` returns the function unchanged and `profile_block` returns a shared
+no-op context manager, so profiling costs nothing more than that call.
+"""
+
+import contextlib
+import functools
+import os
+
+PROFILE_ENV = "{{env_prefix}}_PROFILE"
+PROFILE_DIR_ENV = "{{env_prefix}}_PROFILE_DIR"
+PROFILE_INTERVAL_ENV = "{{env_prefix}}_PROFILE_INTERVAL"
+
+PROFILERS = ("cprofile", "tracemalloc", "sampling")
+
+
+def _enabled_profilers(value):
+    names = {name.strip().lower() for name in value.split(",") if name.strip()}
+    if "all" in names:
+        return PROFILERS
+    return tuple(name for name in PROFILERS if name in names)
+
+
+ENABLED = _enabled_profilers(os.environ.get(PROFILE_ENV, ""))
+OUTPUT_DIR = os.environ.get(PROFILE_DIR_ENV, "profiles")
+INTERVAL = float(os.environ.get(PROFILE_INTERVAL_ENV, "0.005"))
+
+_NULL_BLOCK = contextlib.nullcontext()
+
+
+def profile_block(name):
+    """Return a context manager profiling its block with the enabled profilers.
+
+    Blocks nested in a profiled block of the same thread are not profiled again.
+
+    Args:
+        name (str): The name of the output files.
+
+    Returns:
+        contextlib.AbstractContextManager: The profiling block, or a no-op one
+            when no profiler is enabled.
+    """
+    if not ENABLED:
+        return _NULL_BLOCK
+    from .profilers import ProfileBlock
+
+    return ProfileBlock(name, ENABLED, OUTPUT_DIR, INTERVAL)
+
+
+def profiled(func=None, *, name=None):
+    """Decorate a function to profile every call with the enabled profilers.
+
+    Args:
+        func (callable): The function to profile.
+        name (str, optional): The name of the output files. Defaults to the
+            qualified name of the function.
+
+    Returns:
+        callable: The profiled function, or `func` itself when no profiler is
+            enabled.
+    """
+    if func is None:
+        return functools.partial(profiled, name=name)
+    if not ENABLED:
+        return func
+    block_name = name or f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with profile_block(block_name):
+            return func(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,92 @@
+from pkg_wizard.utils.file import create_extra_files, create_file
+from pkg_wizard.utils.installers import render_install_template
+from pkg_wizard.utils.template import render_template
+import os
+
+
+class BenchmarkSupport:
+    # Added to dev_requirements.txt by ConfigurationSupport.
+    dev_requirements = ["pytest-benchmark"]
+
+    def __init__(self, package_name, override_files: list = [], installer="pip"):
+        self.override_files = override_files
+        self.folder_name = "benchmarks"
+        self.package_name = package_name
+        self.installer = installer
+        self.benchmarks_dir = os.path.join("tests", "benchmarks")
+
+    @classmethod
+    def from_spec(cls, spec):
+        """Create the feature for a package spec."""
+        return cls(package_name=spec.package_name, installer=spec.installer)
+
+    def create_benchmarks(self):
+        """Creates the tests/benchmarks package with an example pytest-benchmark
+        benchmark and the config of the regression check.
+
+        Raises:
+            OSError: If there is an issue creating the files.
+        """
+        create_file(
+            os.path.join(self.benchmarks_dir, "__init__.py"),
+            '"""Benchmarks of the package."""\n',
+        )
+        for template_name, context in [
+            ("test_example.py", {"package_name": self.package_name}),
+            ("config.json", {}),
+        ]:
+            file_name, content = render_template(
+                self.folder_name, template_name, **context
+            )
+            overwrite = file_name in self.override_files
+            create_file(
+                os.path.join(self.benchmarks_dir, file_name),
+                content,
+                overwrite=overwrite,
+                template=(self.folder_name, file_name),
+            )
+
+    def create_compare_script(self):
+        """Creates scripts/compare_benchmarks.py, which fails when a benchmark is
+        slower than its baseline by more than its threshold, or stores new results
+        as the baseline.
+
+        Raises:
+            OSError: If there is an issue creating the script.
+        """
+        file_name, content = render_template(self.folder_name, "compare_benchmarks.py")
+        overwrite = file_name in self.override_files
+        create_file(
+            os.path.join("scripts", file_name),
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, file_name),
+            mode=0o755,
+        )
+
+    def create_benchmarks_yml(self):
+        """Creates a GitHub Actions workflow that runs the benchmarks, compares pull
+        requests with the baseline of the default branch and fails on regressions.
+
+        Raises:
+            OSError: If there is an issue creating the benchmarks.yml file.
+        """
+        file_name = "benchmarks.yml"
+        template_name, content = render_install_template(
+            self.folder_name, file_name, self.installer
+        )
+        overwrite = file_name in self.override_files
+        create_file(
+            os.path.join(".github", "workflows", file_name),
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, template_name),
+        )
+
+    def create_files(self):
+        self.create_benchmarks()
+        self.create_compare_script()
+        self.create_benchmarks_yml()
+        create_extra_files(
+            self.folder_name, self.benchmarks_dir, package_name=self.package_name
+        )
@@ -1,13 +1,43 @@
 import os
-from pkg_wizard.utils.file import create_file, read_file, get_file_path
+from pkg_wizard.features import contributions
+from pkg_wizard.utils.file import create_extra_files, create_file
+from pkg_wizard.utils.installers import installer_context, is_locked
+from pkg_wizard.utils.template import render_template
 
 
 class ConfigurationSupport:
 
-    def __init__(self, package_name, override_files: list = []):
+    def __init__(
+        self,
+        package_name,
+        override_files: list = [],
+        installer="pip",
+        pre_commit_profile="default",
+        dev_requirements: list = [],
+    ):
         self.override_files = override_files
         self.folder_name = "configurations"
         self.package_name = package_name
+        self.installer = installer
+        self.pre_commit_profile = pre_commit_profile
+        self.dev_requirements = dev_requirements
+
+    @classmethod
+    def from_spec(cls, spec):
+        """Create the feature for a package spec."""
+        return cls(
+            package_name=spec.package_name,
+            installer=spec.installer,
+            pre_commit_profile=spec.pre_commit_profile,
+            dev_requirements=contributions(spec, "dev_requirements"),
+        )
+
+    def _requirements_template(self, file_name):
+        # The fast pre-commit profile lints and formats with ruff instead of
+        # flake8 and black.
+        if file_name == "dev_requirements.txt" and self.pre_commit_profile == "fast":
+            return "dev_requirements.fast.txt"
+        return file_name
 
     def create_gitignore(self):
         """Create a .gitignore file for the package.
@@ -17,10 +47,15 @@ class ConfigurationSupport:
         Raises:
             OSError: If there is an issue creating the .gitignore file.
         """
-        file_name, content = read_file(get_file_path(self.folder_name, ".gitignore"))
+        file_name, content = render_template(self.folder_name, ".gitignore")
         overwrite = True if file_name in self.override_files else False
         gitignore_path = os.path.join(file_name)
-        create_file(gitignore_path, content, overwrite=overwrite)
+        create_file(
+            gitignore_path,
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, file_name),
+        )
 
     def create_requirements(self):
         """Create a requirements.txt file for the package.
@@ -30,17 +65,20 @@ class ConfigurationSupport:
         Raises:
             OSError: If an error occurs while creating the requirements.txt file.
         """
-        file_name, content = read_file(
-            get_file_path(self.folder_name, "requirements.txt")
-        )
+        file_name, content = render_template(self.folder_name, "requirements.txt")
         overwrite = True if file_name in self.override_files else False
         requirements_path = os.path.join(file_name)
-        create_file(requirements_path, content, overwrite=overwrite)
+        create_file(
+            requirements_path,
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, file_name),
+        )
 
     def create_dev_requirements(self):
         """Create a 'dev_requirements.txt' file with specified development dependencies.
 
-        This function generates a 'dev_requirements.txt' file within the package directory containing the required development dependencies for the project.
+        This function generates a 'dev_requirements.txt' file within the package directory containing the required development dependencies for the project, followed by those of the selected features.
 
         Returns:
             None
@@ -49,12 +87,50 @@ class ConfigurationSupport:
             FileNotFoundError: If the package directory does not exist.
             OSError: If there is an issue creating the 'dev_requirements.txt' file.
         """
-        file_name, content = read_file(
-            get_file_path(self.folder_name, "dev_requirements.txt")
-        )
+        file_name = "dev_requirements.txt"
+        template_name = self._requirements_template(file_name)
+        _, content = render_template(self.folder_name, template_name)
+        if self.dev_requirements:
+            content = "\n".join([content.rstrip("\n"), *self.dev_requirements]) + "\n"
         overwrite = True if file_name in self.override_files else False
         dev_requirements_path = os.path.join(file_name)
-        create_file(dev_requirements_path, content, overwrite=overwrite)
+        create_file(
+            dev_requirements_path,
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, template_name),
+        )
+
+    def create_lock_script(self):
+        """Create the build requirements and scripts/lock.sh.
+
+        The script writes the lock files, which pin every requirement with its
+        hashes. Resolving them needs the network, so it is not part of the
+        generation: `gps` runs the same lock commands once the package is written.
+
+        Raises:
+            OSError: If there is an issue creating the files.
+        """
+        file_name, content = render_template(self.folder_name, "build_requirements.txt")
+        overwrite = True if file_name in self.override_files else False
+        create_file(
+            file_name,
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, file_name),
+        )
+
+        file_name, content = render_template(
+            self.folder_name, "lock.sh", **installer_context(self.installer)
+        )
+        overwrite = True if file_name in self.override_files else False
+        create_file(
+            os.path.join("scripts", file_name),
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, file_name),
+            mode=0o755,
+        )
 
     def create_readme(self):
         """Generate a README file for the Python package.
@@ -68,11 +144,17 @@ class ConfigurationSupport:
             FileNotFoundError: If the package directory does not exist.
             PermissionError: If the user does not have permission to create the README file.
         """
-        file_name, content = read_file(get_file_path(self.folder_name, "readme.md"))
-        content = content.replace("{{package_name}}", self.package_name)
+        file_name, content = render_template(
+            self.folder_name, "readme.md", package_name=self.package_name
+        )
         overwrite = True if file_name in self.override_files else False
         readme_path = os.path.join(file_name)
-        create_file(readme_path, content, overwrite=overwrite)
+        create_file(
+            readme_path,
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, file_name),
+        )
 
     def create_setup_file(self):
         """Creates a setup.py file for the package.
@@ -86,11 +168,17 @@ class ConfigurationSupport:
             FileNotFoundError: If the README.md file is not found.
             OSError: If an error occurs while creating the setup.py file.
         """
-        file_name, content = read_file(get_file_path(self.folder_name, "setup.py"))
-        content = content.replace("{{package_name}}", self.package_name)
+        file_name, content = render_template(
+            self.folder_name, "setup.py", package_name=self.package_name
+        )
         overwrite = True if file_name in self.override_files else False
         setup_path = os.path.join(file_name)
-        create_file(setup_path, content, overwrite=overwrite)
+        create_file(
+            setup_path,
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, file_name),
+        )
 
     def create_files(self):
         """Create configuration files for the package.
@@ -107,5 +195,8 @@ class ConfigurationSupport:
         self.create_gitignore()
         self.create_requirements()
         self.create_dev_requirements()
+        if is_locked(self.installer):
+            self.create_lock_script()
         self.create_readme()
         self.create_setup_file()
+        create_extra_files(self.folder_name, "", package_name=self.package_name)
@@ -1,13 +1,33 @@
-from pkg_wizard.utils.file import create_file, read_file, get_file_path
+from pkg_wizard.spec import DEFAULT_DOCKER_IMAGE
+from pkg_wizard.utils.file import create_extra_files, create_file
+from pkg_wizard.utils.installers import render_install_template
+from pkg_wizard.utils.template import render_template
 import os
 
 
 class DevContainerSupport:
 
-    def __init__(self, pakcage_name, override_files: list = []):
+    def __init__(
+        self,
+        pakcage_name,
+        override_files: list = [],
+        docker_image=DEFAULT_DOCKER_IMAGE,
+        installer="pip",
+    ):
         self.override_files = override_files
         self.folder_name = "devcontainer"
         self.package_name = pakcage_name
+        self.docker_image = docker_image
+        self.installer = installer
+
+    @classmethod
+    def from_spec(cls, spec):
+        """Create the feature for a package spec."""
+        return cls(
+            pakcage_name=spec.package_name,
+            docker_image=spec.docker_image,
+            installer=spec.installer,
+        )
 
     def create_devcontainer_json(self):
         """
@@ -21,14 +41,45 @@ class DevContainerSupport:
         Raises:
             None
         """
-        file_name, content = read_file(
-            get_file_path(self.folder_name, "devcontainer.json")
+        file_name, content = render_template(
+            self.folder_name, "devcontainer.json", package_name=self.package_name
         )
-        content = content.replace("{{package_name}}", self.package_name)
         overwrite = True if file_name in self.override_files else False
         devcontainer_dir = os.path.join(".devcontainer")
         devcontainer_json_path = os.path.join(devcontainer_dir, file_name)
-        create_file(devcontainer_json_path, content, overwrite=overwrite)
+        create_file(
+            devcontainer_json_path,
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, file_name),
+        )
+
+    def create_dockerfile(self):
+        """Creates the Dockerfile of the development container.
+
+        The image is built from the requirement files and the pre-commit config
+        only, with the dependencies and hooks installed and their hashes stamped,
+        so that it can be prebuilt and post-create.sh has nothing left to do until
+        the requirements change.
+
+        Raises:
+            OSError: If there is an issue creating the Dockerfile.
+        """
+        file_name = "Dockerfile"
+        template_name, content = render_install_template(
+            self.folder_name,
+            file_name,
+            self.installer,
+            docker_image=self.docker_image,
+            package_name=self.package_name,
+        )
+        overwrite = True if file_name in self.override_files else False
+        create_file(
+            os.path.join(".devcontainer", file_name),
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, template_name),
+        )
 
     def create_post_create_sh(self):
         """
@@ -42,26 +93,40 @@ class DevContainerSupport:
         Raises:
             None
         """
-        file_name, content = read_file(
-            get_file_path(self.folder_name, "post-create.sh")
+        file_name = "post-create.sh"
+        template_name, content = render_install_template(
+            self.folder_name, file_name, self.installer, package_name=self.package_name
         )
         overwrite = True if file_name in self.override_files else False
         devcontainer_dir = os.path.join(".devcontainer")
         post_create_sh_path = os.path.join(devcontainer_dir, file_name)
-        create_file(post_create_sh_path, content, overwrite=overwrite)
+        create_file(
+            post_create_sh_path,
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, template_name),
+            mode=0o755,
+        )
 
     def create_dev_container_env(self):
         """Creates a devcontainer.env directory in devcontainer.json."""
-        file_name, content = read_file(
-            get_file_path(self.folder_name, "devcontainer.env")
-        )
+        file_name, content = render_template(self.folder_name, "devcontainer.env")
         overwrite = True if file_name in self.override_files else False
         devcontainer_dir = os.path.join(".devcontainer")
         devcontainer_env_path = os.path.join(devcontainer_dir, file_name)
-        create_file(devcontainer_env_path, content, overwrite=overwrite)
+        create_file(
+            devcontainer_env_path,
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, file_name),
+        )
 
     def create_files(self):
         """Create all files for the devcontainer support."""
         self.create_devcontainer_json()
+        self.create_dockerfile()
         self.create_post_create_sh()
         self.create_dev_container_env()
+        create_extra_files(
+            self.folder_name, ".devcontainer", package_name=self.package_name
+        )
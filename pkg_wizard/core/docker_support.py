@@ -1,13 +1,49 @@
-from pkg_wizard.utils.file import create_file, read_file, get_file_path
+from pkg_wizard.utils.file import create_extra_files, create_file
+from pkg_wizard.utils.installers import render_install_template
+from pkg_wizard.utils.template import render_template
 import os
 
 
+# The Dockerfile template of each Docker variant.
+DOCKERFILE_TEMPLATES = {
+    "simple": "Dockerfile",
+    "multistage": "Dockerfile.multistage",
+}
+
+# The builder and runtime images of the distroless runtime, which must share the
+# same Python version. The slim runtime uses the Docker image of the package.
+DISTROLESS_IMAGES = ("python:3.11-slim-bookworm", "gcr.io/distroless/python3-debian12")
+
+
 class DockerSupport:
 
-    def __init__(self, docker_image, override_files: list = []):
+    def __init__(
+        self,
+        docker_image,
+        override_files: list = [],
+        variant="simple",
+        runtime=None,
+        package_name=None,
+        installer="pip",
+    ):
         self.override_files = override_files
         self.folder_name = "docker"
         self.docker_image = docker_image
+        self.variant = variant
+        self.runtime = runtime
+        self.package_name = package_name
+        self.installer = installer
+
+    @classmethod
+    def from_spec(cls, spec):
+        """Create the feature for a package spec."""
+        return cls(
+            docker_image=spec.docker_image,
+            variant=spec.docker_variant,
+            runtime=spec.docker_runtime,
+            package_name=spec.package_name,
+            installer=spec.installer,
+        )
 
     def create_dockerfile(self):
         """Create a Dockerfile for the project.
@@ -17,11 +53,95 @@ class DockerSupport:
         Raises:
             None
         """
-        file_name, content = read_file(get_file_path(self.folder_name, "Dockerfile"))
-        content = content.replace("{{docker_image}}", self.docker_image)
+        template_name, content = render_install_template(
+            self.folder_name,
+            DOCKERFILE_TEMPLATES[self.variant],
+            self.installer,
+            docker_image=self.docker_image,
+        )
+        file_name = "Dockerfile"
         overwrite = True if file_name in self.override_files else False
         dockerfile_path = os.path.join(file_name)
-        create_file(dockerfile_path, content, overwrite=overwrite)
+        create_file(
+            dockerfile_path,
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, template_name),
+        )
+
+    def create_dockerignore(self):
+        """Create a .dockerignore file that keeps the build context small.
+
+        Version control data, virtual environments, caches and build outputs are
+        left out, so they neither slow down the context upload nor invalidate the
+        `COPY . .` layers.
+
+        Raises:
+            OSError: If there is an issue creating the .dockerignore file.
+        """
+        file_name, content = render_template(self.folder_name, ".dockerignore")
+        overwrite = True if file_name in self.override_files else False
+        create_file(
+            file_name,
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, file_name),
+        )
+
+    def create_runtime_dockerfile(self):
+        """Create a Dockerfile.runtime for a slim production image.
+
+        The package and its runtime requirements, from `requirements.lock` with a
+        locked installer, are built as wheels, installed without dev dependencies
+        on a slim or distroless base, and compiled to bytecode at build time.
+
+        Raises:
+            OSError: If there is an issue creating the Dockerfile.runtime file.
+        """
+        if self.runtime == "distroless":
+            build_image, runtime_image = DISTROLESS_IMAGES
+        else:
+            build_image = runtime_image = self.docker_image
+        file_name = "Dockerfile.runtime"
+        template_name, content = render_install_template(
+            self.folder_name,
+            file_name,
+            self.installer,
+            build_image=build_image,
+            runtime_image=runtime_image,
+            package_name=self.package_name,
+        )
+        overwrite = True if file_name in self.override_files else False
+        create_file(
+            file_name,
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, template_name),
+        )
+
+    def create_runtime_benchmark(self):
+        """Create a script reporting the runtime image size and start-to-import time.
+
+        Raises:
+            OSError: If there is an issue creating the script.
+        """
+        file_name, content = render_template(
+            self.folder_name, "benchmark_runtime.py", package_name=self.package_name
+        )
+        overwrite = True if file_name in self.override_files else False
+        create_file(
+            os.path.join("scripts", file_name),
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, file_name),
+            mode=0o755,
+        )
 
     def create_files(self):
         self.create_dockerfile()
+        if self.variant == "multistage" or self.runtime:
+            self.create_dockerignore()
+        if self.runtime:
+            self.create_runtime_dockerfile()
+            self.create_runtime_benchmark()
+        create_extra_files(self.folder_name, "", docker_image=self.docker_image)
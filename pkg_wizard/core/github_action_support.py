@@ -1,12 +1,22 @@
-from pkg_wizard.utils.file import create_file, read_file, get_file_path
+from pkg_wizard.utils.file import create_extra_files, create_file
+from pkg_wizard.utils.installers import render_install_template
 import os
 
+# The number of jobs the tests of each Python version are split across.
+TEST_SHARDS = 4
+
 
 class GithubActionSupport:
 
-    def __init__(self, override_files: list = []):
+    def __init__(self, override_files: list = [], installer="pip"):
         self.override_files = override_files
         self.folder_name = "github_actions"
+        self.installer = installer
+
+    @classmethod
+    def from_spec(cls, spec):
+        """Create the feature for a package spec."""
+        return cls(installer=spec.installer)
 
     def create_publish_yml(self):
         """Creates a publish.yml file for GitHub Actions workflow to publish a Python
@@ -20,11 +30,49 @@ class GithubActionSupport:
         Raises:
             OSError: If there is an issue creating the publish.yml file.
         """
-        file_name, content = read_file(get_file_path(self.folder_name, "publish.yml"))
+        file_name = "publish.yml"
+        template_name, content = render_install_template(
+            self.folder_name, file_name, self.installer
+        )
         overwrite = True if file_name in self.override_files else False
         workflows_dir = os.path.join(".github", "workflows")
         publish_yml_path = os.path.join(workflows_dir, file_name)
-        create_file(publish_yml_path, content, overwrite=overwrite)
+        create_file(
+            publish_yml_path,
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, template_name),
+        )
+
+    def create_ci_yml(self):
+        """Creates a ci.yml file for a GitHub Actions workflow testing the package.
+
+        The workflow runs the tests on a matrix of Python versions, with the pip
+        cache keyed on the requirement files. The tests of each version are split
+        across `TEST_SHARDS` jobs by pytest-split, balanced by the test durations
+        stored by the previous run, and run in parallel within a job by
+        pytest-xdist.
+
+        Raises:
+            OSError: If there is an issue creating the ci.yml file.
+        """
+        file_name = "ci.yml"
+        template_name, content = render_install_template(
+            self.folder_name,
+            file_name,
+            self.installer,
+            shards=str(TEST_SHARDS),
+            groups=", ".join(str(group) for group in range(1, TEST_SHARDS + 1)),
+        )
+        overwrite = True if file_name in self.override_files else False
+        create_file(
+            os.path.join(".github", "workflows", file_name),
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, template_name),
+        )
 
     def create_files(self):
         self.create_publish_yml()
+        self.create_ci_yml()
+        create_extra_files(self.folder_name, os.path.join(".github", "workflows"))
@@ -1,22 +1,75 @@
 import os
 from pkg_wizard.utils.file import create_file
+from pkg_wizard.utils.template import render_template
 
 
 class InitDir:
 
-    def create_init_file(self, package_name, sub_dirs: list):
+    def __init__(self, lazy=False):
+        """Initialize an InitDir object.
+
+        Args:
+            lazy (bool, optional): Whether the `__init__.py` files import their
+                submodules and public names lazily (PEP 562).
+        """
+        self.lazy = lazy
+        self.folder_name = "init_dir"
+
+    def create_lazy_init_file(self, init_path, description, submodules):
+        """Create an __init__.py file with a lazy-import table.
+
+        Args:
+            init_path (str): The path of the __init__.py file.
+            description (str): What the file initializes, such as 'core module'.
+            submodules (list): The submodules imported on first access.
+
+        Raises:
+            OSError: If there are issues creating the file.
+        """
+        submodules = sorted(name for name in submodules if name.isidentifier())
+        names = [f'"{name}"' for name in submodules]
+        if submodules:
+            type_checking_imports = f"from . import {', '.join(submodules)}"
+        else:
+            type_checking_imports = "pass"
+        file_name, content = render_template(
+            self.folder_name,
+            "lazy_init.py",
+            description=description,
+            submodules=f"({', '.join(names)}{',' if len(names) == 1 else ''})",
+            type_checking_imports=type_checking_imports,
+        )
+        create_file(init_path, content, template=(self.folder_name, file_name))
+
+    def create_init_file(self, package_name, sub_dirs: list, submodules=None):
         """Create an __init__.py file to initialize the package.
 
         This function generates an __init__.py file within the package directory to initialize the package.
 
+        Args:
+            package_name (str): The name of the package.
+            sub_dirs (list): The subdirectories of the package.
+            submodules (list, optional): The submodules of the package listed by a
+                lazy __init__.py file. Defaults to `sub_dirs`.
+
         Raises:
             OSError: If there are issues creating the file.
         """
         init_path = os.path.join(package_name, "__init__.py")
-        content = f'"""Initialize the {package_name} package."""\n'
-        create_file(init_path, content)
+        if self.lazy:
+            self.create_lazy_init_file(
+                init_path,
+                f"{package_name} package",
+                sub_dirs if submodules is None else submodules,
+            )
+        else:
+            content = f'"""Initialize the {package_name} package."""\n'
+            create_file(init_path, content)
 
         for sub_dir in sub_dirs:
             init_path = os.path.join(package_name, sub_dir, "__init__.py")
+            if self.lazy:
+                self.create_lazy_init_file(init_path, f"{sub_dir} module", [])
+                continue
             content = f'"""Initialize the {sub_dir} module."""\n'
             create_file(init_path, content)
@@ -1,4 +1,5 @@
-from pkg_wizard.utils.file import create_file, read_file, get_file_path
+from pkg_wizard.utils.file import create_extra_files, create_file
+from pkg_wizard.utils.template import render_template
 import os
 
 
@@ -6,8 +7,14 @@ class LLMSupport:
     def __init__(self, package_name, override_files: list = []):
         self.override_files = override_files
         self.folder_name = "llm"
+        self.package_name = package_name
         self.llm_dir = os.path.join(package_name, "llm")
 
+    @classmethod
+    def from_spec(cls, spec):
+        """Create the feature for a package spec."""
+        return cls(package_name=spec.package_name)
+
     def create_few_shot_learning_py(self):
         """Creates the few_shot_learning.py file for LLM support.
 
@@ -17,12 +24,15 @@ class LLMSupport:
         Raises:
             OSError: If there is an issue creating the few_shot_learning.py file.
         """
-        file_name, content = read_file(
-            get_file_path(self.folder_name, "few_shot_learning.py")
-        )
+        file_name, content = render_template(self.folder_name, "few_shot_learning.py")
         overwrite = file_name in self.override_files
         few_shot_path = os.path.join(self.llm_dir, file_name)
-        create_file(few_shot_path, content, overwrite=overwrite)
+        create_file(
+            few_shot_path,
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, file_name),
+        )
 
     def create_apikey_handler_py(self):
         """Creates the apikey_handler.py file for API key management.
@@ -33,12 +43,15 @@ class LLMSupport:
         Raises:
             OSError: If there is an issue creating the apikey_handler.py file.
         """
-        file_name, content = read_file(
-            get_file_path(self.folder_name, "apikey_handler.py")
-        )
+        file_name, content = render_template(self.folder_name, "apikey_handler.py")
         overwrite = file_name in self.override_files
         apikey_handler_path = os.path.join(self.llm_dir, file_name)
-        create_file(apikey_handler_path, content, overwrite=overwrite)
+        create_file(
+            apikey_handler_path,
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, file_name),
+        )
 
     def create_azurekeyvault_apikey_handler_py(self):
         """Creates the azurekeyvault_apikey_handler.py file for Azure Key Vault API key
@@ -50,12 +63,17 @@ class LLMSupport:
         Raises:
             OSError: If there is an issue creating the azurekeyvault_apikey_handler.py file.
         """
-        file_name, content = read_file(
-            get_file_path(self.folder_name, "azurekeyvault_apikey_handler.py")
+        file_name, content = render_template(
+            self.folder_name, "azurekeyvault_apikey_handler.py"
         )
         overwrite = file_name in self.override_files
         azure_apikey_handler_path = os.path.join(self.llm_dir, file_name)
-        create_file(azure_apikey_handler_path, content, overwrite=overwrite)
+        create_file(
+            azure_apikey_handler_path,
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, file_name),
+        )
 
     def create_env_apikey_handler_py(self):
         """Creates the env_apikey_handler.py file for environment variable API key
@@ -67,12 +85,15 @@ class LLMSupport:
         Raises:
             OSError: If there is an issue creating the env_apikey_handler.py file.
         """
-        file_name, content = read_file(
-            get_file_path(self.folder_name, "env_apikey_handler.py")
-        )
+        file_name, content = render_template(self.folder_name, "env_apikey_handler.py")
         overwrite = file_name in self.override_files
         env_apikey_handler_path = os.path.join(self.llm_dir, file_name)
-        create_file(env_apikey_handler_path, content, overwrite=overwrite)
+        create_file(
+            env_apikey_handler_path,
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, file_name),
+        )
 
     def create_llm_util_py(self):
         """Creates the llm_util.py file for LLM utilities.
@@ -83,10 +104,15 @@ class LLMSupport:
         Raises:
             OSError: If there is an issue creating the llm_util.py file.
         """
-        file_name, content = read_file(get_file_path(self.folder_name, "llm_util.py"))
+        file_name, content = render_template(self.folder_name, "llm_util.py")
         overwrite = file_name in self.override_files
         llm_util_path = os.path.join(self.llm_dir, file_name)
-        create_file(llm_util_path, content, overwrite=overwrite)
+        create_file(
+            llm_util_path,
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, file_name),
+        )
 
     def create_llm_py(self):
         """Creates the llm.py file for LLM functionalities.
@@ -97,10 +123,15 @@ class LLMSupport:
         Raises:
             OSError: If there is an issue creating the llm.py file.
         """
-        file_name, content = read_file(get_file_path(self.folder_name, "llm.py"))
+        file_name, content = render_template(self.folder_name, "llm.py")
         overwrite = file_name in self.override_files
         llm_path = os.path.join(self.llm_dir, file_name)
-        create_file(llm_path, content, overwrite=overwrite)
+        create_file(
+            llm_path,
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, file_name),
+        )
 
     def create_constant_py(self):
         """Creates the llm.py file for LLM functionalities.
@@ -111,10 +142,15 @@ class LLMSupport:
         Raises:
             OSError: If there is an issue creating the llm.py file.
         """
-        file_name, content = read_file(get_file_path(self.folder_name, "constant.py"))
+        file_name, content = render_template(self.folder_name, "constant.py")
         overwrite = file_name in self.override_files
         llm_path = os.path.join(self.llm_dir, file_name)
-        create_file(llm_path, content, overwrite=overwrite)
+        create_file(
+            llm_path,
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, file_name),
+        )
 
     def create_init_file(self):
         """Create an __init__.py file to initialize the package.
@@ -137,3 +173,6 @@ class LLMSupport:
         self.create_llm_py()
         self.create_init_file()
         self.create_constant_py()
+        create_extra_files(
+            self.folder_name, self.llm_dir, package_name=self.package_name
+        )
@@ -1,12 +1,25 @@
 import os
-from pkg_wizard.utils.file import create_file, read_file, get_file_path
+from pkg_wizard.utils.file import create_extra_files, create_file
+from pkg_wizard.utils.template import render_template
+
+# The pre-commit config template of each profile.
+PROFILE_TEMPLATES = {
+    "default": ".pre-commit-config.yaml",
+    "fast": ".pre-commit-config.fast.yaml",
+}
 
 
 class PreCommitSupport:
 
-    def __init__(self, override_files: list = []):
+    def __init__(self, override_files: list = [], profile="default"):
         self.override_files = override_files
         self.folder_name = "pre_commit"
+        self.profile = profile
+
+    @classmethod
+    def from_spec(cls, spec):
+        """Create the feature for a package spec."""
+        return cls(profile=spec.pre_commit_profile)
 
     def create_pre_commit_config(self):
         """Creates a pre-commit configuration file for the project.
@@ -19,12 +32,54 @@ class PreCommitSupport:
         Raises:
             None
         """
-        file_name, content = read_file(
-            get_file_path(self.folder_name, ".pre-commit-config.yaml")
-        )
+        file_name = ".pre-commit-config.yaml"
+        template_name = PROFILE_TEMPLATES[self.profile]
+        _, content = render_template(self.folder_name, template_name)
         overwrite = True if file_name in self.override_files else False
         pre_commit_config_path = os.path.join(file_name)
-        create_file(pre_commit_config_path, content, overwrite=overwrite)
+        create_file(
+            pre_commit_config_path,
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, template_name),
+        )
+
+    def create_pre_commit_workflow(self):
+        """Creates a GitHub Actions workflow running every hook, including the
+        CI-only ones of the manual stage.
+
+        Raises:
+            OSError: If there is an issue creating the pre-commit.yml file.
+        """
+        file_name, content = render_template(self.folder_name, "pre-commit.yml")
+        overwrite = True if file_name in self.override_files else False
+        create_file(
+            os.path.join(".github", "workflows", file_name),
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, file_name),
+        )
+
+    def create_time_hooks_script(self):
+        """Creates scripts/time_hooks.py, which reports the runtime of every hook so
+        that the pre-commit profiles can be compared.
+
+        Raises:
+            OSError: If there is an issue creating the script.
+        """
+        file_name, content = render_template(self.folder_name, "time_hooks.py")
+        overwrite = True if file_name in self.override_files else False
+        create_file(
+            os.path.join("scripts", file_name),
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, file_name),
+            mode=0o755,
+        )
 
     def create_files(self):
         self.create_pre_commit_config()
+        if self.profile == "fast":
+            self.create_pre_commit_workflow()
+        self.create_time_hooks_script()
+        create_extra_files(self.folder_name, "")
@@ -0,0 +1,69 @@
+from pkg_wizard.utils.file import create_extra_files, create_file
+from pkg_wizard.utils.template import render_template
+import os
+import re
+
+
+class ProfilingSupport:
+    # Subpackages of the package, imported by a lazy __init__.py.
+    submodules = ["profiling"]
+
+    def __init__(self, package_name, override_files: list = []):
+        self.override_files = override_files
+        self.folder_name = "profiling"
+        self.package_name = package_name
+        self.profiling_dir = os.path.join(package_name, "profiling")
+
+    @classmethod
+    def from_spec(cls, spec):
+        """Create the feature for a package spec."""
+        return cls(package_name=spec.package_name)
+
+    @property
+    def env_prefix(self):
+        """The prefix of the environment variables enabling the profilers."""
+        return re.sub(r"\W", "_", self.package_name).upper()
+
+    def create_init_file(self):
+        """Creates the __init__.py file of the profiling package, with the
+        `profiled` decorator and `profile_block` context manager.
+
+        Raises:
+            OSError: If there is an issue creating the __init__.py file.
+        """
+        file_name, content = render_template(
+            self.folder_name,
+            "profiling_init.py",
+            package_name=self.package_name,
+            env_prefix=self.env_prefix,
+        )
+        overwrite = "__init__.py" in self.override_files
+        create_file(
+            os.path.join(self.profiling_dir, "__init__.py"),
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, file_name),
+        )
+
+    def create_profilers_py(self):
+        """Creates the profilers.py file with the cProfile, tracemalloc and sampling
+        profilers, which is only imported when profiling is enabled.
+
+        Raises:
+            OSError: If there is an issue creating the profilers.py file.
+        """
+        file_name, content = render_template(self.folder_name, "profilers.py")
+        overwrite = file_name in self.override_files
+        create_file(
+            os.path.join(self.profiling_dir, file_name),
+            content,
+            overwrite=overwrite,
+            template=(self.folder_name, file_name),
+        )
+
+    def create_files(self):
+        self.create_init_file()
+        self.create_profilers_py()
+        create_extra_files(
+            self.folder_name, self.profiling_dir, package_name=self.package_name
+        )
@@ -7,6 +7,11 @@ class TestSupport:
     def __init__(self, override_files: list = []):
         self.override_files = override_files
 
+    @classmethod
+    def from_spec(cls, spec):
+        """Create the feature for a package spec."""
+        return cls()
+
     def create_test_init(self):
         """Create an __init__.py file for the tests module.
 
@@ -23,3 +28,6 @@ class TestSupport:
         test_init_path = os.path.join("tests", "__init__.py")
         content = f'"""Initialize the test module."""\n'
         create_file(test_init_path, content)
+
+    def create_files(self):
+        self.create_test_init()
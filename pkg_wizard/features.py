@@ -0,0 +1,103 @@
+from importlib import import_module
+
+# Third party features register a `name = "module:Class"` entry point in this group.
+ENTRY_POINT_GROUP = "pkg_wizard.features"
+
+# Built-in features, in generation order. Modules are only imported when selected.
+BUILTIN_FEATURES = {
+    "config": "pkg_wizard.core.configuration_support:ConfigurationSupport",
+    "docker": "pkg_wizard.core.docker_support:DockerSupport",
+    "github_actions": "pkg_wizard.core.github_action_support:GithubActionSupport",
+    "pre_commit": "pkg_wizard.core.pre_commit_support:PreCommitSupport",
+    "tests": "pkg_wizard.core.test_support:TestSupport",
+    "benchmarks": "pkg_wizard.core.benchmark_support:BenchmarkSupport",
+    "dev_container": "pkg_wizard.core.dev_container_support:DevContainerSupport",
+    "llm": "pkg_wizard.core.llm_support:LLMSupport",
+    "profiling": "pkg_wizard.core.profiling_support:ProfilingSupport",
+}
+
+
+def _entry_points():
+    # importlib.metadata is slow to import, so only load it when plugins are needed.
+    from importlib import metadata
+
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        return entry_points.select(group=ENTRY_POINT_GROUP)
+    return entry_points.get(ENTRY_POINT_GROUP, [])
+
+
+def available_features():
+    """Return every known feature name mapped to its `module:Class` target.
+
+    Installed distributions are only scanned for entry points when this function
+    is called.
+    """
+    features = dict(BUILTIN_FEATURES)
+    for entry_point in _entry_points():
+        features.setdefault(entry_point.name, entry_point.value)
+    return features
+
+
+def load_feature(name):
+    """Import and return the class implementing a feature.
+
+    Built-in features are resolved without scanning for entry points.
+
+    Args:
+        name (str): The name of the feature.
+
+    Returns:
+        type: A class with a `from_spec(spec)` constructor and a `create_files()`
+            method.
+
+    Raises:
+        ValueError: If no feature with this name is registered.
+    """
+    target = BUILTIN_FEATURES.get(name) or available_features().get(name)
+    if target is None:
+        raise ValueError(f"Unknown feature: {name}")
+    module_name, _, class_name = target.partition(":")
+    return getattr(import_module(module_name), class_name)
+
+
+def selected_features(spec):
+    """Return the names of the features to generate for a spec, in generation order.
+
+    Args:
+        spec (PackageSpec): The package to generate.
+
+    Returns:
+        list: The included features minus the excluded ones, plus `llm` when the
+            spec asks for LLM support.
+    """
+    names = [
+        name for name in spec.include_features if name not in spec.exclude_features
+    ]
+    if spec.llm and "llm" not in names:
+        names.append("llm")
+    order = list(BUILTIN_FEATURES)
+    return sorted(
+        dict.fromkeys(names),
+        key=lambda name: order.index(name) if name in order else len(order),
+    )
+
+
+def contributions(spec, attribute):
+    """Collect a list attribute declared by the feature classes selected for a spec.
+
+    Features declare what they add to files generated by other features as class
+    attributes, for example `dev_requirements = ["pytest-benchmark"]`.
+
+    Args:
+        spec (PackageSpec): The package to generate.
+        attribute (str): The name of the class attribute to collect.
+
+    Returns:
+        list: The values of the selected features, in generation order, without
+            duplicates.
+    """
+    values = []
+    for name in selected_features(spec):
+        values.extend(getattr(load_feature(name), attribute, []))
+    return list(dict.fromkeys(values))
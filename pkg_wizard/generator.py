@@ -0,0 +1,111 @@
+from pkg_wizard.core.init_dir import InitDir
+from pkg_wizard.features import contributions, load_feature, selected_features
+from pkg_wizard.package_structure import PackageStructure
+from pkg_wizard.spec import PackageSpec
+from pkg_wizard.utils.plan import planning
+from pkg_wizard.utils.sink import FileSystemSink, RetrofitSink
+from pkg_wizard.utils.template import (
+    current_registry,
+    get_registry,
+    registry_loaded,
+    using_registry,
+)
+from pkg_wizard.utils.trace import NULL_TRACER
+
+
+def build_plan(spec, tracer=NULL_TRACER, structure=True):
+    """Build the generation plan for a package without touching the filesystem.
+
+    Only the selected features are imported and planned.
+
+    Args:
+        spec (PackageSpec): The package to generate.
+        tracer (Tracer, optional): Records the template loading, feature imports
+            and the time spent in each feature class.
+        structure (bool, optional): Whether to plan the package directories and
+            their `__init__.py` files, or only the feature files.
+
+    Returns:
+        GenerationPlan: Every directory and file the package is made of.
+
+    Raises:
+        ValueError: If a selected feature is unknown.
+    """
+    features = selected_features(spec)
+    dirs = list(spec.sub_dirs)
+    if "llm" in features and "llm" not in dirs:
+        dirs.append("llm")
+
+    with tracer.span("TemplateRegistry", "templates") as args:
+        if not registry_loaded():
+            registry = get_registry()
+            args.update(bytes_read=registry.bytes_read, fs_calls=registry.fs_calls)
+
+    with planning() as plan:
+        if structure:
+            with tracer.span("PackageStructure", "feature"):
+                package = PackageStructure(spec.package_name, spec.docker_image, dirs)
+                package.create_directories()
+        for name in features:
+            with tracer.span(name, "import"):
+                feature_class = load_feature(name)
+            with tracer.span(feature_class.__name__, "feature"):
+                feature_class.from_spec(spec).create_files()
+        if structure:
+            with tracer.span("InitDir", "feature"):
+                # Feature subpackages are submodules of a lazy __init__.py too.
+                submodules = list(
+                    dict.fromkeys(dirs + contributions(spec, "submodules"))
+                )
+                InitDir(lazy=spec.lazy_init).create_init_file(
+                    spec.package_name, dirs, submodules
+                )
+
+    return plan
+
+
+def generate(spec, target_dir=None, sink=None, tracer=NULL_TRACER, retrofit=False):
+    """Generate a package into a target directory or an output sink.
+
+    This is the in-process API behind the CLI. It neither prints nor touches the
+    process environment or working directory, so it can be called concurrently
+    from several threads.
+
+    Args:
+        spec (PackageSpec | dict): The package to generate, or a dict with the same
+            keys as a manifest entry.
+        target_dir (str, optional): The project root the package is generated into.
+        sink (ArchiveSink, optional): Where to write the package instead of
+            `target_dir`, for example an archive stream.
+        tracer (Tracer, optional): Records timings and I/O of every stage and file.
+        retrofit (bool, optional): Add the feature files to an existing repository
+            in `target_dir`: only missing and stale files are written and the package
+            directories are left alone.
+
+    Returns:
+        GenerationResult: The written, skipped and conflicting paths with their
+            byte counts.
+
+    Raises:
+        ValueError: If neither a target directory nor a sink is given.
+        OSError: If there is an issue creating a directory or writing a file.
+    """
+    if isinstance(spec, dict):
+        spec = PackageSpec.from_dict(spec)
+    if sink is None:
+        if target_dir is None:
+            raise ValueError("Either a target directory or a sink is required.")
+        sink_class = RetrofitSink if retrofit else FileSystemSink
+        sink = sink_class(target_dir, tracer=tracer)
+    if spec.template_pack is None:
+        return build_plan(spec, tracer, structure=not retrofit).write_to(sink)
+
+    from pkg_wizard.utils.packs import TemplateOverlay, open_pack
+
+    # Opening a pack is timed, its filesystem calls are not counted.
+    with tracer.span("TemplatePack", "templates"):
+        registry = TemplateOverlay(current_registry(), open_pack(spec.template_pack))
+    # The sink looks up template digests for the lockfile, so it writes with the
+    # pack in place as well.
+    with using_registry(registry):
+        return build_plan(spec, tracer, structure=not retrofit).write_to(sink)
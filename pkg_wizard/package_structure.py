@@ -1,4 +1,6 @@
 import os
+from pkg_wizard.utils.events import default_event_sink
+from pkg_wizard.utils.plan import active_plan
 
 
 class PackageStructure:
@@ -36,6 +38,7 @@ class PackageStructure:
 
         Creates directories using the list of directories stored in the 'dirs' attribute of the object.
         If a directory already exists, it does not raise an error due to the 'exist_ok=True' parameter in 'os.makedirs'.
+        When a generation plan is being built, the directories are recorded in the plan instead.
 
         Raises:
             OSError: If there is an issue creating the directories.
@@ -43,6 +46,14 @@ class PackageStructure:
         Returns:
             None
         """
+        plan = active_plan()
+        if plan is not None:
+            for dir in self.dirs:
+                plan.add_dir(dir)
+            return
+
+        events = default_event_sink()
         for dir in self.dirs:
             os.makedirs(dir, exist_ok=True)
-            print(f"Created directory: {dir}")
+            events.emit("directory", path=dir)
+        events.flush()
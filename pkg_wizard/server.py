@@ -0,0 +1,199 @@
+import hmac
+import io
+import json
+import os
+import secrets
+import socketserver
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pkg_wizard.client import TOKEN_HEADER, token_path
+from pkg_wizard.features import BUILTIN_FEATURES, load_feature
+from pkg_wizard.generator import generate
+from pkg_wizard.spec import PackageSpec
+from pkg_wizard.utils.sink import ARCHIVE_FORMATS, ArchiveSink
+from pkg_wizard.utils.template import get_registry
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Generation requests are a few hundred bytes of JSON.
+MAX_REQUEST_BYTES = 1024 * 1024
+
+ARCHIVE_CONTENT_TYPES = {"tar.gz": "application/gzip", "zip": "application/zip"}
+
+
+class GenerationRequestHandler(BaseHTTPRequestHandler):
+    """Serves generation requests.
+
+    `POST /generate` takes a JSON body with a `spec` (a manifest entry) and either a
+    `target_dir` to write the package into, answered with the JSON result, or an
+    `archive` format ('tar.gz' or 'zip'), answered with the archive once it is
+    complete. Failures are answered with a JSON `error` and a 4xx status.
+    Requests must be `application/json` and carry the daemon token.
+    `GET /health` answers once the daemon is ready.
+    """
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._send_json(404, {"error": f"Unknown path: {self.path}"})
+        self._send_json(200, {"status": "ok", "pid": os.getpid()})
+
+    def do_POST(self):
+        if self.path != "/generate":
+            return self._send_json(404, {"error": f"Unknown path: {self.path}"})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            return self._send_json(400, {"error": "Invalid Content-Length."})
+        if length > MAX_REQUEST_BYTES:
+            return self._send_json(413, {"error": "The request is too large."})
+        # The body is read before any check, so that a rejected client gets the
+        # answer rather than a broken pipe.
+        body = self.rfile.read(length)
+        # Browsers cannot send JSON or custom headers to another origin without
+        # a preflight, and other local users cannot read the token.
+        if self.headers.get_content_type() != "application/json":
+            return self._send_json(415, {"error": "Expected an application/json body."})
+        token = self.headers.get(TOKEN_HEADER, "").encode("utf-8")
+        if not hmac.compare_digest(token, self.server.token.encode("utf-8")):
+            return self._send_json(403, {"error": "Missing or invalid daemon token."})
+        try:
+            request = json.loads(body)
+            if not isinstance(request, dict):
+                raise ValueError("The request must be a JSON object.")
+            if not isinstance(request.get("spec"), dict):
+                raise ValueError("The spec must be a JSON object.")
+            spec = PackageSpec.from_dict(request["spec"])
+            archive = request.get("archive")
+            if archive is not None and archive not in ARCHIVE_FORMATS:
+                raise ValueError(f"Unsupported archive format: {archive}")
+            target_dir = request.get("target_dir")
+            if archive is None and not (isinstance(target_dir, str) and target_dir):
+                raise ValueError("Either target_dir or archive is required.")
+        except (KeyError, ValueError, TypeError, AttributeError) as e:
+            return self._send_json(400, {"error": str(e)})
+
+        if archive is not None:
+            # The archive is built in memory first, so that a failing generation
+            # is answered with an error instead of a truncated archive.
+            stream = io.BytesIO()
+            sink = ArchiveSink(stream, archive, root=spec.package_name)
+            try:
+                generate(spec, sink=sink)
+            except (ValueError, TypeError, OSError) as e:
+                return self._send_json(400, {"error": str(e)})
+            return self._send(200, stream.getvalue(), ARCHIVE_CONTENT_TYPES[archive])
+
+        try:
+            result = generate(spec, target_dir)
+        except (ValueError, TypeError, OSError) as e:
+            return self._send_json(400, {"error": str(e)})
+        self._send_json(200, result.to_dict())
+
+    def _send_json(self, status, data):
+        self._send(status, json.dumps(data).encode("utf-8"), "application/json")
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # Unix socket clients have no address.
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ThreadingUnixHTTPServer(
+    socketserver.ThreadingMixIn, socketserver.UnixStreamServer
+):
+    """An HTTP server listening on a Unix domain socket."""
+
+    daemon_threads = True
+
+
+def warm_up():
+    """Load the templates and import every built-in feature ahead of requests."""
+    get_registry()
+    for name in BUILTIN_FEATURES:
+        load_feature(name)
+
+
+def write_token(address):
+    """Create a random token for a daemon and write it to its token file.
+
+    The file is only readable by the current user, so only their processes can
+    send requests to the daemon.
+
+    Args:
+        address (str): The Unix socket path or host:port the daemon listens on.
+
+    Returns:
+        str: The token.
+
+    Raises:
+        OSError: If the token file cannot be written.
+    """
+    token = secrets.token_urlsafe(32)
+    path = token_path(address)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        os.fchmod(f.fileno(), 0o600)
+        f.write(token)
+    return token
+
+
+def create_server(socket_path=None, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Create the generator daemon, with templates and features already loaded.
+
+    A new token is written to the token file of the address (see
+    `client.token_path()`) and required from every generation request.
+
+    Args:
+        socket_path (str, optional): Listen on this Unix socket instead of TCP.
+        host (str, optional): The TCP host to listen on. Defaults to 127.0.0.1.
+        port (int, optional): The TCP port to listen on. Defaults to 8765.
+
+    Returns:
+        socketserver.BaseServer: The server, ready for `serve_forever()`.
+
+    Raises:
+        OSError: If the socket cannot be bound or the token cannot be written.
+    """
+    warm_up()
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = ThreadingUnixHTTPServer(socket_path, GenerationRequestHandler)
+        server.token = write_token(socket_path)
+        return server
+    server = ThreadingHTTPServer((host, port), GenerationRequestHandler)
+    server.token = write_token(f"{host}:{server.server_address[1]}")
+    return server
+
+
+def serve(socket_path=None, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Run the generator daemon until interrupted.
+
+    Args:
+        socket_path (str, optional): Listen on this Unix socket instead of TCP.
+        host (str, optional): The TCP host to listen on. Defaults to 127.0.0.1.
+        port (int, optional): The TCP port to listen on. Defaults to 8765.
+    """
+    server = create_server(socket_path, host, port)
+    # With port 0 the system picks the port the token file is named after.
+    address = socket_path or f"{host}:{server.server_address[1]}"
+    print(f"pkg_wizard daemon listening on {address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        for path in [socket_path, token_path(address)]:
+            if path and os.path.exists(path):
+                os.unlink(path)
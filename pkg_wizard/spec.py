@@ -0,0 +1,163 @@
+DEFAULT_DOCKER_IMAGE = "python:3.9-slim"
+
+# How DockerSupport writes the Dockerfile: a single stage, or cache-efficient stages
+# with a .dockerignore.
+DOCKER_VARIANTS = ["simple", "multistage"]
+
+# The base of the optional slim runtime image written next to the Dockerfile.
+DOCKER_RUNTIMES = ["slim", "distroless"]
+
+# How generated environments install the requirements: resolved by pip on every
+# install, or from lock files with hashes written by pip-tools or uv.
+INSTALLERS = ["pip", "pip-tools", "uv"]
+
+# The hooks of the generated pre-commit config: docformatter, black and the
+# pre-commit-hooks checks, or a single ruff lint and format pass on commit.
+PRE_COMMIT_PROFILES = ["default", "fast"]
+
+FEATURES = [
+    "config",
+    "docker",
+    "github_actions",
+    "pre_commit",
+    "tests",
+    "dev_container",
+]
+
+
+def parse_sub_dirs(sub_dirs):
+    """Normalize subdirectories given as a comma separated string or a list.
+
+    The CLI receives `--sub_dirs core,utils` as `['core,utils']`, while manifests may
+    use either form, so every element is split on commas.
+
+    Args:
+        sub_dirs (str | list | None): The subdirectories to parse.
+
+    Returns:
+        list: The subdirectory names.
+    """
+    if not sub_dirs:
+        return []
+    if isinstance(sub_dirs, str):
+        sub_dirs = [sub_dirs]
+    return [name for value in sub_dirs for name in value.split(",") if name]
+
+
+class PackageSpec:
+    """A description of a single package to generate."""
+
+    def __init__(
+        self,
+        package_name,
+        docker_image=DEFAULT_DOCKER_IMAGE,
+        sub_dirs=None,
+        include_features=None,
+        exclude_features=None,
+        llm=False,
+        template_pack=None,
+        docker_variant="simple",
+        docker_runtime=None,
+        installer="pip",
+        pre_commit_profile="default",
+        lazy_init=False,
+    ):
+        """Initialize a PackageSpec object.
+
+        Args:
+            package_name (str): The name of the package to create.
+            docker_image (str, optional): The Docker image to use. Defaults to 'python:3.9-slim'.
+            sub_dirs (list, optional): The subdirectories to create in the package.
+            include_features (list, optional): The features to include (default: all features).
+            exclude_features (list, optional): The features to exclude.
+            llm (bool, optional): Whether to include support for the LLM package.
+            template_pack (str, optional): A directory or tarball of templates that
+                override or extend the built-in ones.
+            docker_variant (str, optional): The Dockerfile layout, 'simple' or
+                'multistage'. Defaults to 'simple'.
+            docker_runtime (str, optional): Also write a `Dockerfile.runtime` on a
+                'slim' or 'distroless' base. Defaults to None.
+            installer (str, optional): 'pip', or 'pip-tools' or 'uv' to lock the
+                requirements with hashes and install from the locks. Defaults to
+                'pip'.
+            pre_commit_profile (str, optional): The pre-commit hooks, 'default' or
+                'fast'. Defaults to 'default'.
+            lazy_init (bool, optional): Whether the generated `__init__.py` files
+                import submodules and public names lazily (PEP 562).
+
+        Raises:
+            ValueError: If the Docker variant, runtime, installer or pre-commit
+                profile is not supported.
+        """
+        if docker_variant not in DOCKER_VARIANTS:
+            raise ValueError(f"Unsupported Docker variant: {docker_variant}")
+        if docker_runtime is not None and docker_runtime not in DOCKER_RUNTIMES:
+            raise ValueError(f"Unsupported Docker runtime: {docker_runtime}")
+        if installer not in INSTALLERS:
+            raise ValueError(f"Unsupported installer: {installer}")
+        if pre_commit_profile not in PRE_COMMIT_PROFILES:
+            raise ValueError(f"Unsupported pre-commit profile: {pre_commit_profile}")
+        self.package_name = package_name
+        self.docker_image = docker_image
+        self.sub_dirs = parse_sub_dirs(sub_dirs)
+        self.include_features = list(
+            FEATURES if include_features is None else include_features
+        )
+        self.exclude_features = list(exclude_features or [])
+        self.llm = llm
+        self.template_pack = template_pack
+        self.docker_variant = docker_variant
+        self.docker_runtime = docker_runtime
+        self.installer = installer
+        self.pre_commit_profile = pre_commit_profile
+        self.lazy_init = lazy_init
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create a spec from a manifest entry.
+
+        Args:
+            data (dict): The entry. `package_name` (or `name`) is required, the other
+                keys mirror the CLI options; `features` is accepted as an alias of
+                `include_features`.
+
+        Returns:
+            PackageSpec: The spec described by the entry.
+
+        Raises:
+            ValueError: If the entry has no package name or an unsupported value.
+        """
+        package_name = data.get("package_name", data.get("name"))
+        if not package_name:
+            raise ValueError(f"Manifest entry without a package name: {data!r}")
+        return cls(
+            package_name,
+            docker_image=data.get("docker_image", DEFAULT_DOCKER_IMAGE),
+            sub_dirs=data.get("sub_dirs"),
+            include_features=data.get("include_features", data.get("features")),
+            exclude_features=data.get("exclude_features"),
+            llm=bool(data.get("llm", False)),
+            template_pack=data.get("template_pack"),
+            docker_variant=data.get("docker_variant", "simple"),
+            docker_runtime=data.get("docker_runtime"),
+            installer=data.get("installer", "pip"),
+            pre_commit_profile=data.get("pre_commit_profile", "default"),
+            lazy_init=bool(data.get("lazy_init", False)),
+        )
+
+    def to_dict(self):
+        """Return the spec as a manifest entry, for example to send it to a daemon."""
+        return {
+            "package_name": self.package_name,
+            "docker_image": self.docker_image,
+            "sub_dirs": self.sub_dirs,
+            "include_features": self.include_features,
+            "exclude_features": self.exclude_features,
+            "llm": self.llm,
+            "template_pack": self.template_pack,
+            "docker_variant": self.docker_variant,
+            "docker_runtime": self.docker_runtime,
+            "installer": self.installer,
+            "pre_commit_profile": self.pre_commit_profile,
+            "lazy_init": self.lazy_init,
+        }
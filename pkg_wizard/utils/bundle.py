@@ -0,0 +1,149 @@
+import json
+import mmap
+import os
+import struct
+import sys
+
+BUNDLE_FILE = "content.bundle"
+BUNDLE_MAGIC = b"PKGWBNDL"
+
+# The magic bytes followed by the size of the JSON index.
+BUNDLE_HEADER = struct.Struct("<8sI")
+
+# The fixed part of a zip local file header, up to the name and extra field sizes.
+ZIP_LOCAL_HEADER = struct.Struct("<4sHHHHHLLLHH")
+ZIP_LOCAL_SIGNATURE = b"PK\x03\x04"
+ZIP_STORED = 0
+
+
+def pack_bundle(content_dir):
+    """Pack every template of a content directory into a single indexed blob.
+
+    The blob starts with a header and a JSON index mapping 'folder/file_name' to
+    the offset and size of the template bytes, which follow back to back.
+
+    Args:
+        content_dir (str): The directory holding the template folders.
+
+    Returns:
+        bytes: The bundle.
+
+    Raises:
+        OSError: If a template cannot be read.
+    """
+    index, chunks, offset = {}, [], 0
+    for folder in sorted(os.listdir(content_dir)):
+        folder_path = os.path.join(content_dir, folder)
+        if not os.path.isdir(folder_path) or folder.startswith("__"):
+            continue
+        for file_name in sorted(os.listdir(folder_path)):
+            file_path = os.path.join(folder_path, file_name)
+            if not os.path.isfile(file_path) or file_name == "__init__.py":
+                continue
+            with open(file_path, "rb") as f:
+                data = f.read()
+            index[f"{folder}/{file_name}"] = [offset, len(data)]
+            chunks.append(data)
+            offset += len(data)
+    index_data = json.dumps(index, separators=(",", ":")).encode("utf-8")
+    header = BUNDLE_HEADER.pack(BUNDLE_MAGIC, len(index_data))
+    return header + index_data + b"".join(chunks)
+
+
+class ContentBundle:
+    """A bundle written by `pack_bundle`, memory-mapped and read by offset."""
+
+    def __init__(self, mapping, start=0):
+        """Read the index of a bundle.
+
+        Args:
+            mapping (mmap.mmap): The mapped file holding the bundle.
+            start (int, optional): The offset of the bundle in the file.
+
+        Raises:
+            ValueError: If there is no bundle at this offset.
+        """
+        magic, index_size = BUNDLE_HEADER.unpack_from(mapping, start)
+        if magic != BUNDLE_MAGIC:
+            raise ValueError("Not a pkg_wizard content bundle.")
+        index_start = start + BUNDLE_HEADER.size
+        self.index = json.loads(mapping[index_start : index_start + index_size])
+        self.data_start = index_start + index_size
+        self.mapping = mapping
+
+    @classmethod
+    def open(cls, file_path, start=0):
+        """Map a file and read the bundle at an offset of it.
+
+        Raises:
+            OSError: If the file cannot be mapped.
+            ValueError: If there is no bundle at this offset.
+        """
+        with open(file_path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapping, start)
+
+    def keys(self):
+        """Return the (folder, file_name) pairs of the bundled templates."""
+        return [tuple(key.split("/", 1)) for key in self.index]
+
+    def read(self, folder, file_name):
+        """Return the bytes of a bundled template.
+
+        Raises:
+            KeyError: If the template is not in the bundle.
+        """
+        offset, size = self.index[f"{folder}/{file_name}"]
+        start = self.data_start + offset
+        return self.mapping[start : start + size]
+
+
+def _find_in_zip(archive, member):
+    # Walk the local file headers instead of importing zipfile; the zipapp build
+    # puts the bundle first and stores it uncompressed so it can be mapped as is.
+    with open(archive, "rb") as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    position = mapping.find(ZIP_LOCAL_SIGNATURE)
+    name = member.encode("utf-8")
+    while position >= 0 and mapping[position : position + 4] == ZIP_LOCAL_SIGNATURE:
+        fields = ZIP_LOCAL_HEADER.unpack_from(mapping, position)
+        compression, compressed_size, name_size, extra_size = (
+            fields[3],
+            fields[6],
+            fields[9],
+            fields[10],
+        )
+        name_start = position + ZIP_LOCAL_HEADER.size
+        data_start = name_start + name_size + extra_size
+        if mapping[name_start : name_start + name_size] == name:
+            if compression != ZIP_STORED:
+                return None
+            return ContentBundle(mapping, data_start)
+        position = data_start + compressed_size
+    return None
+
+
+def find_bundle(package="pkg_wizard"):
+    """Return the content bundle shipped next to a package, if there is one.
+
+    Bundles are only built for the zipapp distribution, where the bundle is a
+    member of the `.pyz` file; a `content.bundle` file in the package directory
+    is used as well.
+
+    Args:
+        package (str, optional): The imported package the bundle belongs to.
+
+    Returns:
+        ContentBundle | None: The bundle, or None to read the content folders.
+    """
+    module = sys.modules[package]
+    archive = getattr(module.__spec__.loader, "archive", None)
+    try:
+        if archive:
+            return _find_in_zip(archive, f"{package}/{BUNDLE_FILE}")
+        bundle_path = os.path.join(os.path.dirname(module.__file__), BUNDLE_FILE)
+        if os.path.exists(bundle_path):
+            return ContentBundle.open(bundle_path)
+    except (OSError, ValueError, struct.error):
+        pass
+    return None
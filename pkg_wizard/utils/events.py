@@ -0,0 +1,168 @@
+import json
+import sys
+import threading
+
+EVENT_FORMATS = ["human", "quiet", "json"]
+
+FILE_MESSAGES = {
+    "created": "Created file: {path}",
+    "updated": "Updated file: {path}",
+    "skipped": "Skipped file (already exists): {path}",
+    "conflict": "Conflict (modified since generated): {path}",
+}
+
+
+class EventSink:
+    """Collects structured events and writes them to a stream in one go.
+
+    Events are plain dicts with an `event` key ('directory', 'file', 'package',
+    'error', 'message' or 'timings') and event specific fields. They are buffered
+    until `flush()`, which callers do once per package, so large runs are not
+    held up by terminal output.
+    """
+
+    def __init__(self, stream=None):
+        """Initialize an EventSink object.
+
+        Args:
+            stream (file, optional): The text stream to write to. Defaults to stdout.
+        """
+        self.stream = stream
+        self._buffer = []
+        self._lock = threading.Lock()
+
+    def emit(self, event, **fields):
+        """Buffer an event.
+
+        Args:
+            event (str): The type of the event.
+            **fields: The event fields.
+        """
+        with self._lock:
+            self._buffer.append(dict(event=event, **fields))
+
+    def flush(self):
+        """Write every buffered event with a single write call."""
+        with self._lock:
+            events, self._buffer = self._buffer, []
+        lines = [line for line in map(self.format, events) if line is not None]
+        if lines:
+            stream = self.stream or sys.stdout
+            stream.write("\n".join(lines) + "\n")
+            stream.flush()
+
+    def format(self, event):
+        """Return the line written for an event, or None to drop it."""
+        raise NotImplementedError("Must implement format method.")
+
+
+class HumanEventSink(EventSink):
+    """Writes the messages `gps` has always printed."""
+
+    def format(self, event):
+        kind = event["event"]
+        if kind == "directory":
+            return f"Created directory: {event['path']}"
+        if kind == "file":
+            return FILE_MESSAGES[event["status"]].format(path=event["path"])
+        if kind == "error":
+            return f"Failed to generate {event['package_name']}: {event['error']}"
+        if kind in ("message", "timings"):
+            return event["text"]
+        return None
+
+
+class QuietEventSink(EventSink):
+    """Only writes errors, conflicts and the timings that were asked for."""
+
+    def format(self, event):
+        if event["event"] == "timings":
+            return event["text"]
+        if event["event"] == "error":
+            return f"Failed to generate {event['package_name']}: {event['error']}"
+        if event["event"] == "file" and event["status"] == "conflict":
+            return FILE_MESSAGES["conflict"].format(path=event["path"])
+        return None
+
+
+class JsonLinesEventSink(EventSink):
+    """Writes one JSON object per event."""
+
+    def format(self, event):
+        return json.dumps(event)
+
+
+EVENT_SINKS = {
+    "human": HumanEventSink,
+    "quiet": QuietEventSink,
+    "json": JsonLinesEventSink,
+}
+
+
+def get_event_sink(event_format="human", stream=None):
+    """Create the event sink for an output format.
+
+    Args:
+        event_format (str, optional): 'human', 'quiet' or 'json'. Defaults to 'human'.
+        stream (file, optional): The text stream to write to. Defaults to stdout.
+
+    Returns:
+        EventSink: The event sink.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    try:
+        return EVENT_SINKS[event_format](stream)
+    except KeyError:
+        raise ValueError(f"Unsupported event format: {event_format}")
+
+
+_default_sink = HumanEventSink()
+
+
+def default_event_sink():
+    """Return the human readable sink used by `create_file` outside of a plan."""
+    return _default_sink
+
+
+def emit_result(events, result, package_name):
+    """Emit the events of a generated package.
+
+    The events stay buffered until the caller flushes the sink.
+
+    Args:
+        events (EventSink): Where to send the events.
+        result (GenerationResult): The result of the generation.
+        package_name (str): The name of the generated package.
+    """
+    for path in result.dirs:
+        events.emit("directory", path=path)
+    updated = set(result.updated)
+    for path, size in result.written.items():
+        status = "updated" if path in updated else "created"
+        events.emit("file", path=path, status=status, bytes=size)
+    for status, files in (("conflict", result.conflicts), ("skipped", result.skipped)):
+        for path, size in files.items():
+            events.emit("file", path=path, status=status, bytes=size)
+    events.emit(
+        "package",
+        package_name=package_name,
+        target_dir=result.target_dir,
+        created=len(result.written) - len(updated),
+        updated=len(updated),
+        skipped=len(result.skipped),
+        conflicts=len(result.conflicts),
+        bytes_written=result.bytes_written,
+    )
+
+
+def emit_timings(events, tracer):
+    """Emit the timings of a traced generation, which every format writes.
+
+    Args:
+        events (EventSink): Where to send the event.
+        tracer (Tracer): The tracer of the generation.
+    """
+    stages, files = tracer.totals()
+    events.emit("timings", text=tracer.summary(), stages=stages, files=files)
@@ -0,0 +1,113 @@
+import errno
+import os
+from pkg_wizard.utils.trace import count_call
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# The FICLONE ioctl from linux/fs.h, supported by btrfs, XFS, bcachefs and others.
+FICLONE = 0x40049409
+
+# Errors meaning that a copy method does not work for a pair of files, as opposed
+# to the copy itself failing.
+UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EOPNOTSUPP,
+    errno.ENOTTY,
+    errno.EBADF,
+}
+
+# (method name, target device) pairs that failed once and are not tried again.
+_unsupported = set()
+
+
+def _reflink(src_fd, dst_fd, size, stats):
+    count_call(stats, fcntl.ioctl, dst_fd, FICLONE, src_fd)
+
+
+def _copy_file_range(src_fd, dst_fd, size, stats):
+    offset = 0
+    while offset < size:
+        copied = count_call(
+            stats, os.copy_file_range, src_fd, dst_fd, size - offset, offset, offset
+        )
+        if copied == 0:
+            raise OSError(errno.EINVAL, "copy_file_range copied nothing")
+        offset += copied
+
+
+def _sendfile(src_fd, dst_fd, size, stats):
+    offset = 0
+    while offset < size:
+        sent = count_call(stats, os.sendfile, dst_fd, src_fd, offset, size - offset)
+        if sent == 0:
+            raise OSError(errno.EINVAL, "sendfile copied nothing")
+        offset += sent
+
+
+COPY_METHODS = [
+    (name, method)
+    for name, method, available in [
+        ("reflink", _reflink, fcntl is not None and os.name == "posix"),
+        ("copy_file_range", _copy_file_range, hasattr(os, "copy_file_range")),
+        ("sendfile", _sendfile, hasattr(os, "sendfile")),
+    ]
+    if available
+]
+
+
+def copy_file(src, dst, mode=None, stats=None):
+    """Copy a file without reading it into Python objects where the OS allows it.
+
+    The copy is attempted as a reflink (sharing the blocks with the source), then
+    with `copy_file_range` and `sendfile`, which copy inside the kernel, and finally
+    with a buffered copy. A method that is not supported for a target device is
+    not tried again for that device. Hardlinks are never used: editing a
+    generated file would then change the template and every other generated copy.
+
+    Args:
+        src (str): The path of the file to copy.
+        dst (str): The path of the copy, created or truncated.
+        mode (int, optional): The permission bits of the copy. Defaults to the
+            permissions a newly created file gets.
+        stats (dict, optional): Span arguments counting the filesystem calls.
+
+    Returns:
+        str: The name of the method that made the copy.
+
+    Raises:
+        OSError: If the source cannot be read or the copy cannot be written.
+    """
+    with count_call(stats, open, src, "rb") as fsrc, count_call(
+        stats, open, dst, "wb"
+    ) as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        size = count_call(stats, os.fstat, src_fd).st_size
+        device = count_call(stats, os.fstat, dst_fd).st_dev
+        used = None
+        for name, method in COPY_METHODS:
+            if (name, device) in _unsupported:
+                continue
+            try:
+                method(src_fd, dst_fd, size, stats)
+                used = name
+                break
+            except OSError as e:
+                if e.errno not in UNSUPPORTED_ERRNOS:
+                    raise
+                _unsupported.add((name, device))
+                # Start over in case the failed method copied part of the file.
+                count_call(stats, os.ftruncate, dst_fd, 0)
+                count_call(stats, os.lseek, dst_fd, 0, os.SEEK_SET)
+        if used is None:
+            import shutil
+
+            count_call(stats, shutil.copyfileobj, fsrc, fdst)
+            used = "copy"
+    if mode is not None:
+        count_call(stats, os.chmod, dst, mode)
+    return used
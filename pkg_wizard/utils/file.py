@@ -1,13 +1,48 @@
 import os
-
-
-def create_file(file_path, content, overwrite=False):
-    if not os.path.exists(file_path) or overwrite:
+from pkg_wizard.utils.events import default_event_sink
+from pkg_wizard.utils.plan import active_plan
+from pkg_wizard.utils.template import current_registry
+
+
+def create_file(file_path, content, overwrite=False, template=None, mode=None):
+    plan = active_plan()
+    if plan is not None:
+        plan.add_file(
+            file_path, content, overwrite=overwrite, template=template, mode=mode
+        )
+        return
+
+    events = default_event_sink()
+    exists = os.path.exists(file_path)
+    if not exists or overwrite:
         with open(file_path, "w") as f:
             f.write(content)
-        print(f"Created file: {file_path}")
+        if mode is not None:
+            os.chmod(file_path, mode)
+        status = "updated" if exists else "created"
+        events.emit("file", path=file_path, status=status, bytes=len(content))
     else:
-        print(f"Skipped file (already exists): {file_path}")
+        events.emit("file", path=file_path, status="skipped", bytes=len(content))
+    events.flush()
+
+
+def create_extra_files(folder, output_dir, **context):
+    """Create the files a template pack adds to a content folder.
+
+    Args:
+        folder (str): The content folder of the feature.
+        output_dir (str): The directory the feature writes its files to.
+        **context: The values to substitute for the placeholders.
+    """
+    registry = current_registry()
+    for file_name in registry.extras(folder):
+        template = registry.get(folder, file_name)
+        create_file(
+            os.path.join(output_dir, file_name),
+            template.render(**context),
+            template=(folder, file_name),
+            mode=template.mode,
+        )
 
 
 def read_file(file_path):
@@ -15,7 +50,7 @@ def read_file(file_path):
         return (os.path.basename(f.name), f.read())
 
 
-BASE_PATH = os.path.dirname(os.path.dirname(os.path.relpath(__file__)))
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 
 # fetches the file path of files within the directory of content folder
@@ -0,0 +1,286 @@
+import os
+from pkg_wizard.utils.template import render_template
+
+LOCKS_DIR = "locks"
+
+# The lock files of a locked package, and the requirement files each resolves.
+# The dev lock includes the build tools so that the package itself can be
+# installed without build isolation, and therefore without resolving anything.
+LOCK_FILES = {
+    "requirements.lock": ["requirements.txt"],
+    "dev_requirements.lock": [
+        "requirements.txt",
+        "dev_requirements.txt",
+        "build_requirements.txt",
+    ],
+    "build_requirements.lock": ["build_requirements.txt"],
+}
+
+# The command writing a lock file with hashes, followed by the output file and the
+# requirement files.
+LOCK_COMMANDS = {
+    "pip-tools": [
+        "pip-compile",
+        "--quiet",
+        "--generate-hashes",
+        "--allow-unsafe",
+        "--strip-extras",
+        "--no-emit-index-url",
+        "--output-file",
+    ],
+    "uv": [
+        "uv",
+        "pip",
+        "compile",
+        "--quiet",
+        "--generate-hashes",
+        "--universal",
+        "--output-file",
+    ],
+}
+
+# The command installing a lock file, followed by `-r <lock file>`. Every
+# requirement is pinned and hashed, so nothing is resolved.
+INSTALL_COMMANDS = {
+    "pip-tools": "pip install --no-deps --require-hashes",
+    "uv": "uv pip install --system --no-deps --require-hashes",
+}
+
+# The command installing the package from its sources, with the build tools of
+# the dev lock.
+INSTALL_PROJECT_COMMANDS = {
+    "pip-tools": "pip install --no-deps --no-build-isolation",
+    "uv": "uv pip install --system --no-deps --no-build-isolation",
+}
+
+# How long a lock command may resolve, and how many of its results are cached.
+LOCK_TIMEOUT = 600
+DEFAULT_MAX_LOCKS = 256
+
+# The lines making the installer available where it is not part of the image.
+DOCKER_SETUPS = {
+    "pip-tools": "",
+    "uv": "COPY --from=ghcr.io/astral-sh/uv:0.5 /uv /usr/local/bin/uv\n",
+}
+ACTIONS_SETUPS = {
+    "pip-tools": "",
+    "uv": (
+        "      - name: Set up uv\n"
+        "        uses: astral-sh/setup-uv@v3\n"
+        "        with:\n"
+        "          enable-cache: true\n"
+        "          cache-dependency-glob: '*.lock'\n"
+        "\n"
+    ),
+}
+
+# The setup-python options caching the downloads of the installer.
+PYTHON_CACHES = {
+    "pip-tools": (
+        "          cache: pip\n"
+        "          cache-dependency-path: dev_requirements.lock\n"
+    ),
+    "uv": "",
+}
+
+
+def is_locked(installer):
+    """Return whether packages generated for an installer use lock files."""
+    return installer in LOCK_COMMANDS
+
+
+def installer_context(installer):
+    """Return the placeholders of the templates installing from lock files.
+
+    Args:
+        installer (str): 'pip-tools' or 'uv'.
+
+    Returns:
+        dict: The install commands and installer setup steps.
+    """
+    return {
+        "install": INSTALL_COMMANDS[installer],
+        "install_project": INSTALL_PROJECT_COMMANDS[installer],
+        "lock": " ".join(LOCK_COMMANDS[installer]),
+        "docker_setup": DOCKER_SETUPS[installer],
+        "actions_setup": ACTIONS_SETUPS[installer],
+        "python_cache": PYTHON_CACHES[installer],
+    }
+
+
+def render_install_template(folder, file_name, installer, **context):
+    """Render a template that installs requirements, for an installer.
+
+    Locked installers use the locked variant of the template, `<name>.locked<ext>`
+    (`ci.yml` becomes `ci.locked.yml`), rendered with `installer_context()`.
+
+    Args:
+        folder (str): The content folder of the template.
+        file_name (str): The file name of the template.
+        installer (str): The installer of the package.
+        **context: The values to substitute for the placeholders.
+
+    Returns:
+        tuple: The name of the rendered template and the rendered content.
+    """
+    if is_locked(installer):
+        name, extension = os.path.splitext(file_name)
+        file_name = f"{name}.locked{extension}"
+        context.update(installer_context(installer))
+    return render_template(folder, file_name, **context)
+
+
+def lock_package(installer, target_dir=".", cache=None):
+    """Write the missing lock files of a generated package.
+
+    This runs the installer's lock command, which resolves the requirements over
+    the network, so it is not part of generating a package: the CLI calls it
+    once the package is written. Lock files that already exist are kept. The
+    result of each resolution is cached by the installer and the content of the
+    requirement files, so locking the same requirements again resolves nothing.
+
+    Args:
+        installer (str): 'pip-tools' or 'uv'.
+        target_dir (str, optional): The root of the generated package.
+        cache (str, optional): The cache directory. Defaults to `cache_dir()`.
+
+    Returns:
+        list: The names of the lock files written.
+
+    Raises:
+        FileNotFoundError: If a requirement file is missing or the lock command is
+            not installed.
+        RuntimeError: If the lock command fails or times out.
+    """
+    import hashlib
+    from pkg_wizard.utils.packs import cache_dir
+
+    locks_dir = os.path.join(cache or cache_dir(), LOCKS_DIR)
+    written, used = [], []
+    for lock_file, names in LOCK_FILES.items():
+        path = os.path.join(target_dir, lock_file)
+        if os.path.exists(path):
+            continue
+        inputs = []
+        for file_name in names:
+            with open(os.path.join(target_dir, file_name), "r") as f:
+                inputs.append((file_name, f.read()))
+
+        digest = hashlib.sha256(f"{installer}\0{lock_file}".encode())
+        for file_name, content in inputs:
+            digest.update(f"\0{file_name}\0{content}".encode())
+        key = digest.hexdigest()
+        cached = os.path.join(locks_dir, key)
+        if os.path.exists(cached):
+            # Mark the lock as recently used for eviction.
+            os.utime(cached)
+            with open(cached, "r") as f:
+                content = f.read()
+        else:
+            content = _resolve(installer, inputs, lock_file)
+            os.makedirs(locks_dir, exist_ok=True)
+            staging = f"{cached}.{os.getpid()}"
+            with open(staging, "w") as f:
+                f.write(content)
+            os.replace(staging, cached)
+
+        with open(path, "w") as f:
+            f.write(content)
+        written.append(lock_file)
+        used.append(key)
+    if used:
+        evict_locks(cache, keep=used)
+    return written
+
+
+def _resolve(installer, inputs, lock_file):
+    # Runs the lock command on copies of the inputs in a temporary directory.
+    import shutil
+    import subprocess
+    import tempfile
+
+    command = LOCK_COMMANDS[installer]
+    if shutil.which(command[0]) is None:
+        raise FileNotFoundError(
+            f"{command[0]} is not installed: install it and run scripts/lock.sh "
+            f"to write {lock_file}."
+        )
+    with tempfile.TemporaryDirectory(prefix="pkg_wizard-lock-") as tmp:
+        for file_name, content in inputs:
+            with open(os.path.join(tmp, file_name), "w") as f:
+                f.write(content)
+        names = [file_name for file_name, _ in inputs]
+        try:
+            subprocess.run(
+                command + [lock_file] + names,
+                cwd=tmp,
+                check=True,
+                capture_output=True,
+                text=True,
+                timeout=LOCK_TIMEOUT,
+            )
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(
+                f"{command[0]} did not lock {lock_file} within {LOCK_TIMEOUT}s: "
+                "run scripts/lock.sh."
+            )
+        except subprocess.CalledProcessError as e:
+            output = (e.stderr or e.stdout or "").strip().splitlines()[-5:]
+            raise RuntimeError(
+                f"{command[0]} could not lock {lock_file}: "
+                + " ".join(output)
+                + " Fix the requirements and run scripts/lock.sh."
+            )
+        with open(os.path.join(tmp, lock_file), "r") as f:
+            return f.read()
+
+
+def evict_locks(cache=None, max_entries=DEFAULT_MAX_LOCKS, max_age=None, keep=()):
+    """Remove cached lock files that are too old or too many.
+
+    Locks unused for longer than `max_age` are removed first, then the least
+    recently used ones until at most `max_entries` are left.
+
+    Args:
+        cache (str, optional): The cache directory. Defaults to `cache_dir()`.
+        max_entries (int, optional): The maximum number of cached locks.
+        max_age (float, optional): The maximum age in seconds since a lock was
+            used. Defaults to the maximum age of cached template packs.
+        keep (iterable, optional): The keys of locks that are never evicted.
+
+    Returns:
+        list: The keys of the evicted locks.
+    """
+    import time
+    from pkg_wizard.utils.packs import DEFAULT_MAX_AGE, cache_dir
+
+    max_age = DEFAULT_MAX_AGE if max_age is None else max_age
+    locks_dir = os.path.join(cache or cache_dir(), LOCKS_DIR)
+    if not os.path.isdir(locks_dir):
+        return []
+    now = time.time()
+    entries = []
+    with os.scandir(locks_dir) as scan:
+        for entry in scan:
+            if "." in entry.name:
+                # A lock being written by another process.
+                continue
+            try:
+                used = entry.stat().st_mtime
+            except OSError:
+                continue
+            entries.append((used, entry.name, entry.path))
+
+    entries.sort()
+    count = len(entries)
+    evicted = []
+    for used, key, path in entries:
+        if key in keep or (now - used <= max_age and count <= max_entries):
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        count -= 1
+        evicted.append(key)
+    return evicted
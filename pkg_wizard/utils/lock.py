@@ -0,0 +1,95 @@
+import hashlib
+import json
+import os
+from pkg_wizard.utils.trace import count_call
+
+LOCK_FILE = ".pkg_wizard.lock"
+LOCK_VERSION = 1
+
+
+def content_hash(data):
+    """Return the sha256 hex digest of some bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_hash(file_path, stats=None):
+    """Return the sha256 hex digest of a file on disk.
+
+    Args:
+        file_path (str): The file to hash.
+        stats (dict, optional): Span arguments counting the filesystem calls.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    with count_call(stats, open, file_path, "rb") as f:
+        return content_hash(count_call(stats, f.read))
+
+
+class Lockfile:
+    """The record of every file a previous generation wrote into a target directory.
+
+    Each entry maps a generated path to the template it was rendered from, the
+    template digest at the time and the sha256 of the written output. Only the
+    output hash is compared on later runs: it tells untouched files from files the
+    user edited since, and whether the new output differs. The template and its
+    digest record where each file came from; every run still renders every file.
+    """
+
+    def __init__(self, entries=None):
+        self.entries = entries if entries is not None else {}
+
+    @classmethod
+    def load(cls, target_dir, stats=None):
+        """Load the lockfile of a target directory.
+
+        Args:
+            target_dir (str): The generation root.
+            stats (dict, optional): Span arguments counting the filesystem calls.
+
+        Returns:
+            Lockfile: The recorded entries, or an empty lockfile if there is none.
+        """
+        try:
+            with count_call(stats, open, os.path.join(target_dir, LOCK_FILE)) as f:
+                data = json.loads(count_call(stats, f.read))
+        except FileNotFoundError:
+            return cls()
+        return cls(data.get("files", {}))
+
+    def save(self, target_dir, stats=None):
+        """Write the lockfile into a target directory.
+
+        Args:
+            target_dir (str): The generation root.
+            stats (dict, optional): Span arguments counting the filesystem calls.
+
+        Raises:
+            OSError: If the lockfile cannot be written.
+        """
+        with count_call(stats, open, os.path.join(target_dir, LOCK_FILE), "w") as f:
+            count_call(stats, f.write, self.dumps())
+
+    def dumps(self):
+        """Return the lockfile serialized as JSON."""
+        data = {"version": LOCK_VERSION, "files": dict(sorted(self.entries.items()))}
+        return json.dumps(data, indent=2) + "\n"
+
+    def get(self, path):
+        """Return the entry recorded for a path, if any."""
+        return self.entries.get(path)
+
+    def record(self, path, output_hash, template=None, template_digest=None):
+        """Record a file that has just been written.
+
+        Args:
+            path (str): The file path, relative to the target directory.
+            output_hash (str): The sha256 of the written content.
+            template (str, optional): The `folder/file` name of the source template.
+            template_digest (str, optional): The sha256 of the source template.
+        """
+        self.entries[path] = {
+            "sha256": output_hash,
+            "template": template,
+            "template_sha256": template_digest,
+        }
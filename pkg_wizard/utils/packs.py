@@ -0,0 +1,305 @@
+import hashlib
+import json
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import time
+from pkg_wizard.utils.template import Template
+
+# Overrides the cache directory, ~/.cache/pkg_wizard by default.
+CACHE_ENV = "PKG_WIZARD_CACHE"
+
+PACKS_DIR = "packs"
+INDEX_FILE = "index.json"
+
+# Least recently used packs are evicted beyond this total size or age.
+DEFAULT_MAX_CACHE_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60
+
+TARBALL_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+_packs = {}
+_packs_lock = threading.Lock()
+
+
+def cache_dir():
+    """Return the pkg_wizard cache directory."""
+    if os.environ.get(CACHE_ENV):
+        return os.environ[CACHE_ENV]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "pkg_wizard")
+
+
+class TemplatePack:
+    """A template pack unpacked into the cache.
+
+    Templates are laid out like `pkg_wizard/content`, as `<folder>/<file_name>`. The
+    index written when the pack was unpacked lists them, so opening a cached pack
+    reads a single file, and templates are parsed when first requested.
+    """
+
+    def __init__(self, path, index):
+        """Initialize a TemplatePack object.
+
+        Args:
+            path (str): The cache directory of the pack.
+            index (dict): The parsed index of the pack.
+        """
+        self.path = path
+        self.index = index
+        self.templates = {}
+
+    @classmethod
+    def load(cls, path):
+        """Open an unpacked pack.
+
+        Raises:
+            OSError: If the index cannot be read.
+        """
+        with open(os.path.join(path, INDEX_FILE), "r") as f:
+            return cls(path, json.load(f))
+
+    def get(self, folder, file_name):
+        """Return the parsed template of the pack, or None if it has none."""
+        key = f"{folder}/{file_name}"
+        template = self.templates.get(key)
+        if template is None and key in self.index["files"]:
+            entry = self.index["files"][key]
+            file_path = os.path.join(self.path, folder, file_name)
+            with open(file_path, "rb") as f:
+                source = f.read().decode("utf-8")
+            mode = 0o755 if entry["executable"] else None
+            template = self.templates[key] = Template(
+                file_name, source, file_path, mode
+            )
+        return template
+
+    def keys(self):
+        """Return the (folder, file_name) pairs of the pack."""
+        return [tuple(key.split("/", 1)) for key in self.index["files"]]
+
+
+class TemplateOverlay:
+    """The built-in templates with a template pack laid over them."""
+
+    def __init__(self, base, pack):
+        """Initialize a TemplateOverlay object.
+
+        Args:
+            base (TemplateRegistry): The built-in templates.
+            pack (TemplatePack): The pack overriding and extending them.
+        """
+        self.base = base
+        self.pack = pack
+
+    def get(self, folder, file_name):
+        """Return the pack template if there is one, else the built-in one.
+
+        Raises:
+            FileNotFoundError: If neither has the template.
+        """
+        template = self.pack.get(folder, file_name)
+        return template if template is not None else self.base.get(folder, file_name)
+
+    def extras(self, folder):
+        """Return the file names the pack adds to a content folder."""
+        names = []
+        for pack_folder, file_name in self.pack.keys():
+            if pack_folder != folder:
+                continue
+            try:
+                self.base.get(folder, file_name)
+            except FileNotFoundError:
+                names.append(file_name)
+        return sorted(names)
+
+
+def _is_tarball(source):
+    return os.path.isfile(source) and source.endswith(TARBALL_SUFFIXES)
+
+
+def pack_key(source):
+    """Return the cache key of a pack.
+
+    A tarball is addressed by the sha256 of its bytes. A directory is addressed by
+    its file names, sizes and modification times, which is enough to notice edits
+    without reading every file.
+
+    Raises:
+        OSError: If the pack cannot be read.
+    """
+    digest = hashlib.sha256()
+    if _is_tarball(source):
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    for root, dirs, files in os.walk(source):
+        dirs.sort()
+        for name in sorted(files):
+            file_path = os.path.join(root, name)
+            info = os.stat(file_path)
+            relative = os.path.relpath(file_path, source).replace(os.sep, "/")
+            digest.update(f"{relative}\0{info.st_size}\0{info.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def _template_key(name):
+    parts = [part for part in name.replace(os.sep, "/").split("/") if part]
+    if any(part in (".", "..") for part in parts):
+        return None
+    return parts
+
+
+def _pack_members(source):
+    """Yield the `(parts, data, executable)` of every file of a pack."""
+    if _is_tarball(source):
+        import tarfile
+
+        with tarfile.open(source, "r:*") as archive:
+            for member in archive:
+                if not member.isfile():
+                    continue
+                parts = _template_key(member.name)
+                if parts:
+                    data = archive.extractfile(member).read()
+                    yield parts, data, bool(member.mode & 0o111)
+        return
+    for root, _, files in os.walk(source):
+        for name in files:
+            file_path = os.path.join(root, name)
+            parts = _template_key(os.path.relpath(file_path, source))
+            if parts:
+                with open(file_path, "rb") as f:
+                    data = f.read()
+                yield parts, data, bool(os.stat(file_path).st_mode & stat.S_IXUSR)
+
+
+def _unpack(source, dest):
+    # Only `<folder>/<file_name>` members are templates. A single top-level
+    # directory wrapping them, as made by `tar czf pack.tgz my_pack`, is stripped.
+    members = list(_pack_members(source))
+    wrapped = len({parts[0] for parts, _, _ in members}) == 1 and any(
+        len(parts) == 3 for parts, _, _ in members
+    )
+    if wrapped:
+        members = [(parts[1:], data, x) for parts, data, x in members]
+
+    files, size = {}, 0
+    for parts, data, executable in members:
+        if len(parts) != 2:
+            continue
+        folder, file_name = parts
+        os.makedirs(os.path.join(dest, folder), exist_ok=True)
+        with open(os.path.join(dest, folder, file_name), "wb") as f:
+            f.write(data)
+        files[f"{folder}/{file_name}"] = {
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "size": len(data),
+            "executable": executable,
+        }
+        size += len(data)
+
+    index = {"source": os.path.abspath(source), "size": size, "files": files}
+    with open(os.path.join(dest, INDEX_FILE), "w") as f:
+        json.dump(index, f, indent=2)
+
+
+def open_pack(source, cache=None):
+    """Return a template pack, unpacking it into the cache on first use.
+
+    Packs are unpacked once per content into `<cache>/packs/<key>` and kept
+    parsed in memory for the rest of the process. Adding a pack to the cache
+    evicts old and least recently used packs.
+
+    Args:
+        source (str): A pack directory or tarball.
+        cache (str, optional): The cache directory. Defaults to `cache_dir()`.
+
+    Returns:
+        TemplatePack: The pack.
+
+    Raises:
+        FileNotFoundError: If the pack does not exist.
+        OSError: If the pack cannot be read or unpacked.
+    """
+    if not os.path.exists(source):
+        raise FileNotFoundError(f"Template pack not found: {source}")
+    cache = cache or cache_dir()
+    key = pack_key(source)
+    with _packs_lock:
+        if key in _packs:
+            return _packs[key]
+
+    packs_dir = os.path.join(cache, PACKS_DIR)
+    path = os.path.join(packs_dir, key)
+    if os.path.exists(os.path.join(path, INDEX_FILE)):
+        # Mark the pack as recently used for eviction.
+        os.utime(os.path.join(path, INDEX_FILE))
+    else:
+        os.makedirs(packs_dir, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".unpack-", dir=packs_dir)
+        try:
+            _unpack(source, staging)
+            os.rename(staging, path)
+        except OSError:
+            # Another process unpacked the same pack first.
+            shutil.rmtree(staging, ignore_errors=True)
+            if not os.path.exists(os.path.join(path, INDEX_FILE)):
+                raise
+        evict(cache, keep=key)
+
+    pack = TemplatePack.load(path)
+    with _packs_lock:
+        return _packs.setdefault(key, pack)
+
+
+def evict(
+    cache=None, max_bytes=DEFAULT_MAX_CACHE_BYTES, max_age=DEFAULT_MAX_AGE, keep=None
+):
+    """Remove cached packs that are too old or over the cache size.
+
+    Packs unused for longer than `max_age` are removed first, then the least
+    recently used ones until the rest fits in `max_bytes`.
+
+    Args:
+        cache (str, optional): The cache directory. Defaults to `cache_dir()`.
+        max_bytes (int, optional): The maximum total size of the cached packs.
+        max_age (float, optional): The maximum age in seconds since a pack was used.
+        keep (str, optional): The key of a pack that is never evicted.
+
+    Returns:
+        list: The keys of the evicted packs.
+    """
+    packs_dir = os.path.join(cache or cache_dir(), PACKS_DIR)
+    if not os.path.isdir(packs_dir):
+        return []
+    now = time.time()
+    entries = []
+    with os.scandir(packs_dir) as scan:
+        for entry in scan:
+            if entry.name.startswith("."):
+                continue
+            index_path = os.path.join(entry.path, INDEX_FILE)
+            try:
+                used = os.stat(index_path).st_mtime
+                with open(index_path, "r") as f:
+                    size = json.load(f)["size"]
+            except (OSError, ValueError, KeyError):
+                used, size = 0, 0
+            entries.append((used, size, entry.name, entry.path))
+
+    entries.sort()
+    total = sum(size for _, size, _, _ in entries)
+    evicted = []
+    for used, size, key, path in entries:
+        if key == keep or (now - used <= max_age and total <= max_bytes):
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+        evicted.append(key)
+        with _packs_lock:
+            _packs.pop(key, None)
+    return evicted
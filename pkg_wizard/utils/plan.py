@@ -0,0 +1,109 @@
+import threading
+from contextlib import contextmanager
+from pkg_wizard.utils.sink import DEFAULT_MAX_WORKERS, FileSystemSink
+
+_local = threading.local()
+
+
+class PlannedFile:
+    """A single file that a generation run intends to write."""
+
+    __slots__ = ("path", "content", "overwrite", "template", "mode")
+
+    def __init__(self, path, content, overwrite=False, template=None, mode=None):
+        self.path = path
+        self.content = content
+        self.overwrite = overwrite
+        self.template = template
+        self.mode = mode
+
+
+class GenerationPlan:
+    """An in-memory list of every directory and file a generation run will produce.
+
+    The plan is built without touching the filesystem and is then written to an
+    output sink in one pass, either a directory on disk or an archive stream.
+    """
+
+    def __init__(self):
+        self.dirs = []
+        self.files = {}
+
+    def add_dir(self, path):
+        """Record a directory that must exist before any file is written.
+
+        Args:
+            path (str): The directory path, relative to the target directory.
+        """
+        if path not in self.dirs:
+            self.dirs.append(path)
+
+    def add_file(self, path, content, overwrite=False, template=None, mode=None):
+        """Record a file to write.
+
+        The first entry for a path wins, the same way an existing file is skipped by
+        `create_file`, unless the later entry asks to overwrite it.
+
+        Args:
+            path (str): The file path, relative to the target directory.
+            content (str): The content of the file.
+            overwrite (bool, optional): Whether an existing file should be replaced.
+            template (tuple, optional): The `(folder, file_name)` of the template the
+                content was rendered from.
+            mode (int, optional): The permission bits of the file, for example 0o755
+                for scripts. Defaults to the platform default.
+        """
+        if path not in self.files or overwrite:
+            self.files[path] = PlannedFile(path, content, overwrite, template, mode)
+
+    def apply(self, target_dir=".", max_workers=DEFAULT_MAX_WORKERS):
+        """Write the plan into a directory on disk.
+
+        Args:
+            target_dir (str, optional): The root the planned paths are relative to.
+                Defaults to the current working directory.
+            max_workers (int, optional): The maximum number of concurrent writers.
+
+        Returns:
+            GenerationResult: The written, skipped and conflicting paths.
+
+        Raises:
+            OSError: If there is an issue creating a directory or writing a file.
+        """
+        return self.write_to(FileSystemSink(target_dir, max_workers=max_workers))
+
+    def write_to(self, sink):
+        """Write the plan to an output sink.
+
+        Args:
+            sink (FileSystemSink | ArchiveSink): Where the files are written.
+
+        Returns:
+            GenerationResult: What the sink wrote.
+        """
+        return sink.write_plan(self)
+
+
+def active_plan():
+    """Return the plan being built on the current thread, if any."""
+    return getattr(_local, "plan", None)
+
+
+@contextmanager
+def planning(plan=None):
+    """Collect `create_file` and directory calls into a plan instead of writing them.
+
+    Args:
+        plan (GenerationPlan, optional): The plan to extend. A new plan is created
+            when omitted.
+
+    Yields:
+        GenerationPlan: The plan being built on the current thread.
+    """
+    plan = plan if plan is not None else GenerationPlan()
+    previous = active_plan()
+    _local.plan = plan
+    try:
+        yield plan
+    finally:
+        _local.plan = previous
@@ -0,0 +1,352 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pkg_wizard.utils.fastcopy import copy_file
+from pkg_wizard.utils.lock import LOCK_FILE, Lockfile, content_hash, file_hash
+from pkg_wizard.utils.template import current_registry
+from pkg_wizard.utils.trace import NULL_TRACER, count_call
+from pkg_wizard.utils.tree import TreeIndex
+
+# Upper bound on the number of files written concurrently by the filesystem sink.
+DEFAULT_MAX_WORKERS = 8
+
+DEFAULT_FILE_MODE = 0o644
+DIR_MODE = 0o755
+
+ARCHIVE_FORMATS = ["tar.gz", "zip"]
+
+
+class GenerationResult:
+    """The outcome of writing a plan to a sink.
+
+    Attributes:
+        target_dir (str): The root the paths are relative to.
+        dirs (list): The directories the plan made sure exist.
+        written (dict): The written file paths mapped to their size in bytes.
+        updated (list): The written file paths that replaced an existing file.
+        skipped (dict): The file paths left as they were, mapped to the size of the
+            content that was not written.
+        conflicts (dict): The file paths edited since they were generated, mapped to
+            the size of the content that was not written.
+    """
+
+    def __init__(self, target_dir, dirs=None):
+        self.target_dir = target_dir
+        self.dirs = list(dirs or [])
+        self.written = {}
+        self.updated = []
+        self.skipped = {}
+        self.conflicts = {}
+
+    @property
+    def bytes_written(self):
+        """The total number of bytes written."""
+        return sum(self.written.values())
+
+    def to_dict(self):
+        """Return the result as plain JSON serializable data."""
+        return {
+            "target_dir": self.target_dir,
+            "dirs": self.dirs,
+            "written": self.written,
+            "updated": self.updated,
+            "skipped": self.skipped,
+            "conflicts": self.conflicts,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a result from the output of `to_dict`."""
+        result = cls(data["target_dir"], data["dirs"])
+        result.written = data["written"]
+        result.updated = data.get("updated", [])
+        result.skipped = data["skipped"]
+        result.conflicts = data["conflicts"]
+        return result
+
+
+def _all_dirs(plan):
+    dirs = set()
+    for path in plan.dirs + [os.path.dirname(path) for path in plan.files]:
+        while path and path not in dirs:
+            dirs.add(path)
+            path = os.path.dirname(path)
+    return sorted(dirs)
+
+
+class FileSystemSink:
+    """Writes a plan into a directory on disk."""
+
+    def __init__(
+        self, target_dir=".", max_workers=DEFAULT_MAX_WORKERS, tracer=NULL_TRACER
+    ):
+        """Initialize a FileSystemSink object.
+
+        Args:
+            target_dir (str, optional): The root the planned paths are relative to.
+                Defaults to the current working directory.
+            max_workers (int, optional): The maximum number of concurrent writers.
+            tracer (Tracer, optional): Records the time, bytes and filesystem calls
+                spent on each directory pass and file.
+        """
+        self.target_dir = target_dir
+        self.max_workers = max_workers
+        self.tracer = tracer
+
+    def write_plan(self, plan):
+        """Create the planned directories and write the planned files.
+
+        Existing files are detected with a single directory listing per parent
+        directory instead of one existence check per file. Nothing is printed and
+        every path is resolved against `target_dir`, so plans can be written from
+        several threads at once.
+
+        Every written file is recorded in the `.pkg_wizard.lock` of the target
+        directory. On later runs every file is rendered and hashed again, but a file
+        that is still identical to what was generated is rewritten only if its
+        output changed, for example after a template upgrade, and a file the user
+        edited since is reported as a conflict instead of being replaced.
+
+        Files rendered from a static template are copied from the template file
+        with `copy_file`, without decoding or encoding their content.
+
+        Args:
+            plan (GenerationPlan): The plan to write.
+
+        Returns:
+            GenerationResult: The written, skipped and conflicting paths.
+
+        Raises:
+            OSError: If there is an issue creating a directory or writing a file.
+        """
+        target_dir, tracer = self.target_dir, self.tracer
+        existing = self._index(_all_dirs(plan))
+        with tracer.span("load", "lock") as args:
+            lock = Lockfile.load(target_dir, args)
+
+        result = GenerationResult(target_dir, plan.dirs)
+        created = []
+        for planned in plan.files.values():
+            with tracer.span(planned.path, "check") as args:
+                payload = _payload(planned)
+                status = self._status(planned, payload[1], existing, lock, args)
+            size = payload[2]
+            if status == "create":
+                replaced = planned.path in existing
+                created.append((planned, payload, "updated" if replaced else "created"))
+                result.written[planned.path] = size
+                if replaced:
+                    result.updated.append(planned.path)
+            elif status == "conflict":
+                result.conflicts[planned.path] = size
+                args["status"] = "conflict"
+            else:
+                result.skipped[planned.path] = size
+                args["status"] = "skipped"
+
+        self._prepare(created, existing)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            list(pool.map(lambda item: self._write(*item), created))
+
+        if created or not lock.entries:
+            with tracer.span("save", "lock") as args:
+                for planned, payload, _ in created:
+                    _record(lock, planned, payload[1])
+                lock.save(target_dir, args)
+
+        return result
+
+    def _index(self, dirs):
+        # Create every planned directory, then list what they already contain.
+        with self.tracer.span("makedirs", "directories") as args:
+            for path in dirs:
+                path = os.path.join(self.target_dir, path)
+                count_call(args, os.makedirs, path, exist_ok=True)
+        with self.tracer.span("scandir", "directories") as args:
+            return self._list_existing(dirs, args)
+
+    def _prepare(self, created, existing):
+        """Create what the files about to be written need, after `_index`.
+
+        `_index` has already created every planned directory, so there is nothing
+        left to do. `RetrofitSink` does not create directories up front and
+        creates the missing ones here instead.
+        """
+
+    def _status(self, planned, digest, existing, lock, args):
+        if planned.overwrite or planned.path not in existing:
+            return "create"
+        return self._compare(planned, digest, lock, args)
+
+    def _compare(self, planned, digest, lock, args):
+        recorded = lock.get(planned.path)
+        if recorded is None or recorded["sha256"] == digest:
+            return "skip"
+        # The output changed since the last run: only replace the file if the user
+        # has not edited it in the meantime.
+        file_path = os.path.join(self.target_dir, planned.path)
+        args["bytes_read"] = count_call(args, os.path.getsize, file_path)
+        if file_hash(file_path, args) == recorded["sha256"]:
+            return "create"
+        return "conflict"
+
+    def _list_existing(self, dirs, args):
+        existing = set()
+        for path in [""] + dirs:
+            scan = count_call(args, os.scandir, os.path.join(self.target_dir, path))
+            with scan as entries:
+                existing.update(os.path.join(path, entry.name) for entry in entries)
+        return existing
+
+    def _write(self, planned, payload, status):
+        data, _, size, source = payload
+        file_path = os.path.join(self.target_dir, planned.path)
+        with self.tracer.span(planned.path, "write", status=status) as args:
+            if source is not None:
+                method = copy_file(source, file_path, planned.mode, args)
+                args.update(bytes_written=size, method=method)
+                return
+            with count_call(args, open, file_path, "wb") as f:
+                count_call(args, f.write, data)
+            args["bytes_written"] = len(data)
+            if planned.mode is not None:
+                count_call(args, os.chmod, file_path, planned.mode)
+
+
+class RetrofitSink(FileSystemSink):
+    """Fills in the missing and stale files of an existing repository.
+
+    The target tree is indexed with a single pruned `os.scandir` walk that only
+    lists the directories generated files live in, instead of checking each file
+    or creating directories up front. Missing files are written, files recorded in
+    the lockfile are refreshed or reported as conflicts as usual, and every other
+    existing file is left alone, even if a feature asks to overwrite it.
+    """
+
+    def _index(self, dirs):
+        with self.tracer.span("scan", "directories") as args:
+            index = TreeIndex.scan(self.target_dir, wanted_dirs=dirs)
+            args["fs_calls"] = index.scanned
+        return index
+
+    def _prepare(self, created, existing):
+        # Only create the directories that are missing and about to receive a file.
+        dirs = {os.path.dirname(planned.path) for planned, _, _ in created}
+        dirs = {path for path in dirs if path and path not in existing}
+        with self.tracer.span("makedirs", "directories") as args:
+            for path in sorted(dirs):
+                path = os.path.join(self.target_dir, path)
+                count_call(args, os.makedirs, path, exist_ok=True)
+
+    def _status(self, planned, digest, existing, lock, args):
+        if planned.path not in existing:
+            return "create"
+        return self._compare(planned, digest, lock, args)
+
+
+def _payload(planned):
+    """Return the bytes, sha256, size and copy source of a planned file.
+
+    A static template rendered unchanged is copied from its template file, so its
+    content is not encoded and its digest and size are those of the template.
+    """
+    if planned.template is not None:
+        template = current_registry().get(*planned.template)
+        if template.is_static and template.path and planned.content is template.source:
+            return None, template.digest, template.size, template.path
+    data = planned.content.encode("utf-8")
+    return data, content_hash(data), len(data), None
+
+
+def _record(lock, planned, output_hash):
+    template, template_digest = None, None
+    if planned.template is not None:
+        template = "/".join(planned.template)
+        template_digest = current_registry().get(*planned.template).digest
+    lock.record(planned.path, output_hash, template, template_digest)
+
+
+class ArchiveSink:
+    """Streams a plan into a tar.gz or zip archive.
+
+    Members are written one after the other straight into the file object, which
+    does not need to be seekable, so the archive can go to a socket or stdout
+    without temporary files. The lockfile is included so that extracting the
+    archive and re-running `gps` behaves like a normal generation.
+    """
+
+    def __init__(self, fileobj, format="tar.gz", root=""):
+        """Initialize an ArchiveSink object.
+
+        Args:
+            fileobj (file): The binary file object to write the archive to.
+            format (str, optional): Either 'tar.gz' or 'zip'. Defaults to 'tar.gz'.
+            root (str, optional): The directory every member is placed under.
+
+        Raises:
+            ValueError: If the archive format is not supported.
+        """
+        if format not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unsupported archive format: {format}")
+        self.fileobj = fileobj
+        self.format = format
+        self.root = root
+
+    def write_plan(self, plan):
+        """Write the planned directories and files into the archive.
+
+        Args:
+            plan (GenerationPlan): The plan to write.
+
+        Returns:
+            GenerationResult: Every file, reported as written.
+        """
+        result = GenerationResult(self.root, plan.dirs)
+        lock = Lockfile()
+        members = []
+        for planned in plan.files.values():
+            data = planned.content.encode("utf-8")
+            members.append((planned.path, data, planned.mode or DEFAULT_FILE_MODE))
+            result.written[planned.path] = len(data)
+            _record(lock, planned, content_hash(data))
+        members.append((LOCK_FILE, lock.dumps().encode("utf-8"), DEFAULT_FILE_MODE))
+
+        dirs = _all_dirs(plan)
+        if self.format == "zip":
+            self._write_zip(dirs, members)
+        else:
+            self._write_tar(dirs, members)
+        return result
+
+    def _name(self, path):
+        return "/".join(filter(None, [self.root] + path.split(os.sep)))
+
+    def _write_tar(self, dirs, members):
+        import io
+        import tarfile
+
+        mtime = time.time()
+        with tarfile.open(fileobj=self.fileobj, mode="w|gz") as archive:
+            for path in [""] + dirs if self.root else dirs:
+                info = tarfile.TarInfo(self._name(path))
+                info.type, info.mode, info.mtime = tarfile.DIRTYPE, DIR_MODE, mtime
+                archive.addfile(info)
+            for path, data, mode in members:
+                info = tarfile.TarInfo(self._name(path))
+                info.size, info.mode, info.mtime = len(data), mode, mtime
+                archive.addfile(info, io.BytesIO(data))
+
+    def _write_zip(self, dirs, members):
+        import zipfile
+
+        date_time = time.localtime()[:6]
+        with zipfile.ZipFile(self.fileobj, "w", zipfile.ZIP_DEFLATED) as archive:
+            for path in [""] + dirs if self.root else dirs:
+                info = zipfile.ZipInfo(self._name(path) + "/", date_time)
+                info.external_attr = ((0o040000 | DIR_MODE) << 16) | 0x10
+                archive.writestr(info, b"")
+            for path, data, mode in members:
+                info = zipfile.ZipInfo(self._name(path), date_time)
+                info.external_attr = (0o100000 | mode) << 16
+                info.compress_type = zipfile.ZIP_DEFLATED
+                archive.writestr(info, data)
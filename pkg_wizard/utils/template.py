@@ -0,0 +1,206 @@
+import hashlib
+import re
+import threading
+from contextlib import contextmanager
+from pkg_wizard.utils.bundle import find_bundle
+
+# Placeholders look like {{package_name}}; anything else is copied literally.
+PLACEHOLDER = re.compile(r"\{\{(\w+)\}\}")
+
+CONTENT_PACKAGE = "pkg_wizard.content"
+
+
+class Template:
+    """A template pre-parsed into alternating literal and placeholder segments."""
+
+    __slots__ = (
+        "name",
+        "source",
+        "segments",
+        "is_static",
+        "digest",
+        "size",
+        "path",
+        "mode",
+    )
+
+    def __init__(self, name, source, path=None, mode=None):
+        """Parse the template source once.
+
+        Args:
+            name (str): The file name of the template.
+            source (str): The raw template text.
+            path (str, optional): The template file on disk, if it is a real file,
+                so that static templates can be copied instead of written.
+            mode (int, optional): The permission bits for files created from the
+                template, when it is not up to the feature.
+        """
+        self.name = name
+        self.source = source
+        self.path = path
+        self.mode = mode
+        # Even indexes hold literals, odd indexes hold placeholder names.
+        self.segments = tuple(PLACEHOLDER.split(source))
+        self.is_static = len(self.segments) == 1
+        data = source.encode("utf-8")
+        self.digest = hashlib.sha256(data).hexdigest()
+        self.size = len(data)
+
+    def render(self, **context):
+        """Render the template in a single pass.
+
+        Placeholders missing from the context are left untouched.
+
+        Args:
+            **context: The values to substitute for the placeholders.
+
+        Returns:
+            str: The rendered content.
+        """
+        if self.is_static:
+            return self.source
+        parts = list(self.segments)
+        for i in range(1, len(parts), 2):
+            name = parts[i]
+            parts[i] = context[name] if name in context else "{{%s}}" % name
+        return "".join(parts)
+
+
+class TemplateRegistry:
+    """All templates under `pkg_wizard/content`, loaded once and kept in memory."""
+
+    def __init__(self, package=CONTENT_PACKAGE, bundle=None):
+        """Load and parse every template of the content package.
+
+        Templates are read through `importlib.resources`, so the registry works the
+        same from a source checkout, a wheel or a zip archive. With a content bundle,
+        as shipped in the zipapp, templates are instead read from the mapped bundle
+        and parsed when first requested.
+
+        Args:
+            package (str, optional): The package holding the template folders.
+            bundle (ContentBundle, optional): The packed templates to read from.
+        """
+        self.templates = {}
+        self.bytes_read = 0
+        self.fs_calls = 0
+        self.bundle = bundle
+        if bundle is not None:
+            return
+        import pathlib
+        from importlib import resources
+
+        # Listing a folder, checking an entry and reading a file (open and read)
+        # are counted as the filesystem calls they make.
+        self.fs_calls += 1
+        for folder in resources.files(package).iterdir():
+            self.fs_calls += 1
+            if not folder.is_dir() or folder.name.startswith("__"):
+                continue
+            self.fs_calls += 1
+            for entry in folder.iterdir():
+                self.fs_calls += 1
+                if entry.is_file() and entry.name != "__init__.py":
+                    data = entry.read_bytes()
+                    self.fs_calls += 2
+                    self.bytes_read += len(data)
+                    path = str(entry) if isinstance(entry, pathlib.Path) else None
+                    self.templates[(folder.name, entry.name)] = Template(
+                        entry.name, data.decode("utf-8"), path
+                    )
+
+    def get(self, folder, file_name):
+        """Return the parsed template for a file of a content folder.
+
+        Raises:
+            FileNotFoundError: If the template does not exist.
+        """
+        template = self.templates.get((folder, file_name))
+        if template is None and self.bundle is not None:
+            try:
+                data = self.bundle.read(folder, file_name)
+            except KeyError:
+                pass
+            else:
+                self.bytes_read += len(data)
+                template = Template(file_name, data.decode("utf-8"))
+                self.templates[(folder, file_name)] = template
+        if template is None:
+            raise FileNotFoundError(f"No template named {folder}/{file_name}")
+        return template
+
+    def extras(self, folder):
+        """Return the file names a template pack adds to a content folder.
+
+        The built-in templates are all created by their feature, so there are none.
+        """
+        return []
+
+    def static_templates(self):
+        """Return the keys of the templates that have no placeholders."""
+        if self.bundle is not None:
+            for key in self.bundle.keys():
+                self.get(*key)
+        return [key for key, template in self.templates.items() if template.is_static]
+
+
+_registry = None
+_registry_lock = threading.Lock()
+_local = threading.local()
+
+
+def registry_loaded():
+    """Return whether the process-wide template registry has been loaded."""
+    return _registry is not None
+
+
+def get_registry():
+    """Return the process-wide template registry, loading it on first use."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = TemplateRegistry(bundle=find_bundle())
+    return _registry
+
+
+def current_registry():
+    """Return the registry templates are rendered from on the current thread.
+
+    This is the process-wide registry unless `using_registry` selected another
+    one, for example the built-in templates overlaid with a template pack.
+    """
+    registry = getattr(_local, "registry", None)
+    return registry if registry is not None else get_registry()
+
+
+@contextmanager
+def using_registry(registry):
+    """Render templates from another registry on the current thread.
+
+    Args:
+        registry (TemplateRegistry | TemplateOverlay): The registry to use.
+
+    Yields:
+        The registry.
+    """
+    previous = getattr(_local, "registry", None)
+    _local.registry = registry
+    try:
+        yield registry
+    finally:
+        _local.registry = previous
+
+
+def render_template(folder, file_name, **context):
+    """Render a template of a content folder.
+
+    Args:
+        folder (str): The content folder of the template.
+        file_name (str): The file name of the template.
+        **context: The values to substitute for the placeholders.
+
+    Returns:
+        tuple: The file name and the rendered content.
+    """
+    return file_name, current_registry().get(folder, file_name).render(**context)
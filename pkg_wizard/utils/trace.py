@@ -0,0 +1,150 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Span arguments that are summed up in the summary table. `fs_calls` counts the
+# open, read, write, stat, directory listing, mkdir and chmod calls actually made.
+COUNTERS = ["bytes_read", "bytes_written", "fs_calls"]
+STAGE_COUNTERS = dict.fromkeys(COUNTERS)
+
+
+def count_call(stats, function, *args, **kwargs):
+    """Make a filesystem call, counting it in the `fs_calls` of some span arguments.
+
+    Args:
+        stats (dict | None): The span arguments to count the call in, or None to
+            only make the call.
+        function (callable): The filesystem function, such as `open` or `os.stat`.
+        *args: Its positional arguments.
+        **kwargs: Its keyword arguments.
+
+    Returns:
+        The result of the call.
+    """
+    if stats is not None:
+        stats["fs_calls"] = stats.get("fs_calls", 0) + 1
+    return function(*args, **kwargs)
+
+
+class Tracer:
+    """Records timed spans of a generation run.
+
+    Each span has a name, a category such as 'feature' or 'file', and arguments
+    like `bytes_read`, `bytes_written`, `fs_calls` and, for files, `status`. Spans
+    can be recorded from several threads and exported in the Chrome trace-event
+    format (chrome://tracing, Perfetto).
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.events = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    @contextmanager
+    def span(self, name, category, **args):
+        """Time a block of code.
+
+        Args:
+            name (str): The name of the span.
+            category (str): The stage the span belongs to.
+            **args: Initial span arguments.
+
+        Yields:
+            dict: The span arguments, which the block may update.
+        """
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            end = time.perf_counter()
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self._origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+            with self._lock:
+                self.events.append(event)
+
+    def export(self, trace_path):
+        """Write the recorded spans as a Chrome trace-event JSON file.
+
+        Args:
+            trace_path (str): The path of the trace file.
+
+        Raises:
+            OSError: If the file cannot be written.
+        """
+        with open(trace_path, "w") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+
+    def totals(self):
+        """Return the wall time and I/O per stage, and the file counts.
+
+        Feature spans are reported per feature class, every other span per category.
+        A counter no span of a stage measured is None.
+
+        Returns:
+            tuple: The stages, mapping each name to its `calls`, `dur` (in µs),
+                `bytes_read`, `bytes_written` and `fs_calls`, and the number of
+                created, updated, skipped and conflicting files.
+        """
+        stages = {}
+        files = {"created": 0, "updated": 0, "skipped": 0, "conflict": 0}
+        for event in self.events:
+            key = event["name"] if event["cat"] == "feature" else event["cat"]
+            stage = stages.setdefault(key, dict(calls=0, dur=0, **STAGE_COUNTERS))
+            stage["calls"] += 1
+            stage["dur"] += event["dur"]
+            for counter in COUNTERS:
+                if counter in event["args"]:
+                    stage[counter] = (stage[counter] or 0) + event["args"][counter]
+            if event["args"].get("status") in files:
+                files[event["args"]["status"]] += 1
+        return stages, files
+
+    def summary(self):
+        """Return a compact table of wall time and I/O per stage.
+
+        A counter no span of a stage measured is shown as '-'. The last line counts
+        created, updated, skipped and conflicting files.
+
+        Returns:
+            str: The table.
+        """
+        stages, files = self.totals()
+        header = ("Stage", "Calls", "Wall ms", "Read B", "Written B", "FS calls")
+        lines = ["{:<28}{:>7}{:>10}{:>10}{:>11}{:>10}".format(*header)]
+        for key, stage in stages.items():
+            counters = ["-" if stage[c] is None else stage[c] for c in COUNTERS]
+            lines.append(
+                "{:<28}{:>7}{:>10.2f}{:>10}{:>11}{:>10}".format(
+                    key, stage["calls"], stage["dur"] / 1000, *counters
+                )
+            )
+        lines.append(
+            "Files: {created} created, {updated} updated, {skipped} skipped, "
+            "{conflict} conflicts".format(**files)
+        )
+        return "\n".join(lines)
+
+
+class NullTracer:
+    """A tracer that records nothing, used when tracing is off."""
+
+    enabled = False
+
+    @contextmanager
+    def span(self, name, category, **args):
+        yield args
+
+
+NULL_TRACER = NullTracer()
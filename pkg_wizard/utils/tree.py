@@ -0,0 +1,80 @@
+import os
+
+# Directories that are never entered when indexing an existing repository.
+PRUNED_DIRS = frozenset(
+    [
+        ".git",
+        ".hg",
+        ".svn",
+        ".venv",
+        "venv",
+        "node_modules",
+        "__pycache__",
+        ".tox",
+        ".nox",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+        ".eggs",
+    ]
+)
+
+
+class TreeIndex:
+    """The paths found below a root directory by a single `os.scandir` walk.
+
+    Attributes:
+        root (str): The indexed directory.
+        files (set): The relative paths of the files (and other non-directories).
+        dirs (set): The relative paths of the directories.
+        scanned (int): The number of directories listed.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.files = set()
+        self.dirs = set()
+        self.scanned = 0
+
+    def __contains__(self, path):
+        return path in self.files or path in self.dirs
+
+    @classmethod
+    def scan(cls, root, wanted_dirs=None, pruned=PRUNED_DIRS):
+        """Walk a directory tree once.
+
+        Symlinked directories are not followed and pruned directories are never
+        listed. When `wanted_dirs` is given, only those directories (and the root)
+        are listed, so a repository with tens of thousands of files costs one
+        `os.scandir` call per directory a generated file lives in.
+
+        Args:
+            root (str): The directory to index.
+            wanted_dirs (iterable, optional): The relative directories to list.
+                Defaults to the whole tree.
+            pruned (iterable, optional): Directory names that are never entered.
+
+        Returns:
+            TreeIndex: The index.
+
+        Raises:
+            OSError: If the root cannot be listed.
+        """
+        index = cls(root)
+        wanted = None if wanted_dirs is None else set(wanted_dirs)
+        pending = [""]
+        while pending:
+            path = pending.pop()
+            index.scanned += 1
+            with os.scandir(os.path.join(root, path)) as entries:
+                for entry in entries:
+                    relative = os.path.join(path, entry.name)
+                    if not entry.is_dir(follow_symlinks=False):
+                        index.files.add(relative)
+                        continue
+                    index.dirs.add(relative)
+                    if entry.name in pruned:
+                        continue
+                    if wanted is None or relative in wanted:
+                        pending.append(relative)
+        return index
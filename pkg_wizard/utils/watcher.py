@@ -0,0 +1,147 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+# From sys/inotify.h.
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# Saving in place closes the file, saving by rename (most editors) moves it in.
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+# struct inotify_event: wd, mask, cookie and the length of the name that follows.
+INOTIFY_EVENT = struct.Struct("iIII")
+
+DEFAULT_POLL_INTERVAL = 0.2
+
+
+class InotifyWatcher:
+    """Waits for files to change in a set of directories, using Linux inotify."""
+
+    def __init__(self, dirs):
+        """Watch directories (not recursively).
+
+        Args:
+            dirs (list): The directories to watch.
+
+        Raises:
+            OSError: If inotify is not available.
+        """
+        libc_name = ctypes.util.find_library("c")
+        if libc_name is None:
+            raise OSError("libc not found")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}
+        for path in dirs:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f"Cannot watch {path}")
+            self.dirs[wd] = path
+
+    def wait(self, timeout=None):
+        """Block until files change.
+
+        Args:
+            timeout (float, optional): The maximum time to wait, in seconds.
+
+        Returns:
+            set: The paths of the changed files, empty on timeout.
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, _, _, size = INOTIFY_EVENT.unpack_from(data, offset)
+                offset += INOTIFY_EVENT.size
+                name = data[offset : offset + size].rstrip(b"\0")
+                offset += size
+                if wd in self.dirs and name:
+                    changed.add(os.path.join(self.dirs[wd], os.fsdecode(name)))
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Waits for files to change in a set of directories by comparing stat results."""
+
+    def __init__(self, dirs, interval=DEFAULT_POLL_INTERVAL):
+        """Watch directories (not recursively).
+
+        Args:
+            dirs (list): The directories to watch.
+            interval (float, optional): The time between two scans, in seconds.
+        """
+        self.dirs = list(dirs)
+        self.interval = interval
+        self.state = self._scan()
+
+    def _scan(self):
+        state = {}
+        for path in self.dirs:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        info = entry.stat()
+                        state[entry.path] = (info.st_mtime_ns, info.st_size)
+        return state
+
+    def wait(self, timeout=None):
+        """Block until files change.
+
+        Args:
+            timeout (float, optional): The maximum time to wait, in seconds.
+
+        Returns:
+            set: The paths of the changed files, empty on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            time.sleep(self.interval)
+            state = self._scan()
+            changed = {
+                path for path, info in state.items() if self.state.get(path) != info
+            }
+            self.state = state
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+def create_watcher(dirs, polling=False):
+    """Return an inotify watcher, or a polling one where inotify is unavailable.
+
+    Args:
+        dirs (list): The directories to watch.
+        polling (bool, optional): Always poll, for example on network filesystems.
+
+    Returns:
+        InotifyWatcher | PollingWatcher: The watcher.
+    """
+    if not polling:
+        try:
+            return InotifyWatcher(dirs)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(dirs)
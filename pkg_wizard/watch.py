@@ -0,0 +1,187 @@
+import copy
+import os
+import time
+from pkg_wizard.features import load_feature, selected_features
+from pkg_wizard.generator import generate
+from pkg_wizard.utils.file import BASE_PATH
+from pkg_wizard.utils.packs import TemplateOverlay, open_pack
+from pkg_wizard.utils.plan import GenerationPlan, planning
+from pkg_wizard.utils.sink import FileSystemSink
+from pkg_wizard.utils.template import Template, get_registry, using_registry
+from pkg_wizard.utils.watcher import create_watcher
+
+CONTENT_DIR = os.path.join(BASE_PATH, "content")
+
+
+def content_folders(content_dir=CONTENT_DIR):
+    """Return the template folders of a content directory."""
+    return sorted(
+        entry.path
+        for entry in os.scandir(content_dir)
+        if entry.is_dir() and not entry.name.startswith("__")
+    )
+
+
+class PreviewWatcher:
+    """Keeps preview trees in sync with the templates they were generated from.
+
+    Every preview is generated once. The watcher then records, per template, the
+    features and output files of each preview that depend on it. When a template
+    file changes, only those features are planned again, in memory, and only the
+    files rendered from the changed template are written.
+    """
+
+    def __init__(self, previews, events, content_dir=CONTENT_DIR):
+        """Initialize a PreviewWatcher object.
+
+        Args:
+            previews (list): `(PackageSpec, target_dir)` tuples, one per preview tree.
+            events (EventSink): Where to report the re-rendered files.
+            content_dir (str, optional): The template sources to render from and
+                watch.
+
+        Raises:
+            ValueError: If pkg_wizard runs from the zipapp, which has no template
+                sources to watch.
+        """
+        self.previews = previews
+        self.events = events
+        self.content_dir = content_dir
+        registry = get_registry()
+        if registry.bundle is not None:
+            raise ValueError("gps watch needs the template sources, not a bundle.")
+        # Changed templates are loaded into a copy, so that anything else
+        # generating in this process keeps rendering the installed templates.
+        self.registry = copy.copy(registry)
+        self.registry.templates = dict(registry.templates)
+        # (folder, file_name) -> {(preview index, feature name)}
+        self.dependencies = {}
+        for folder in content_folders(content_dir):
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name != "__init__.py":
+                        self._load(entry.path)
+
+    def _load(self, path):
+        key = (os.path.basename(os.path.dirname(path)), os.path.basename(path))
+        with open(path, "rb") as f:
+            source = f.read().decode("utf-8")
+        self.registry.templates[key] = Template(key[1], source, path)
+        return key
+
+    def start(self):
+        """Generate every preview and build the template dependency map."""
+        with using_registry(self.registry):
+            self._start()
+        self.events.flush()
+
+    def _start(self):
+        for index, (spec, target_dir) in enumerate(self.previews):
+            os.makedirs(target_dir, exist_ok=True)
+            result = generate(spec, target_dir)
+            self.events.emit(
+                "package",
+                package_name=spec.package_name,
+                target_dir=target_dir,
+                created=len(result.written) - len(result.updated),
+                updated=len(result.updated),
+                skipped=len(result.skipped),
+                conflicts=len(result.conflicts),
+            )
+            for name in selected_features(spec):
+                for planned in self._plan(spec, name).files.values():
+                    if planned.template is not None:
+                        key = tuple(planned.template)
+                        self.dependencies.setdefault(key, set()).add((index, name))
+
+    def _registry(self, spec):
+        # Packs are kept open by open_pack(), so this is cheap after the first call.
+        if spec.template_pack is None:
+            return self.registry
+        return TemplateOverlay(self.registry, open_pack(spec.template_pack))
+
+    def _plan(self, spec, feature_name):
+        with using_registry(self._registry(spec)), planning() as plan:
+            load_feature(feature_name).from_spec(spec).create_files()
+        return plan
+
+    def update(self, changed_paths):
+        """Re-render the outputs of changed template files.
+
+        Args:
+            changed_paths (iterable): The paths of the changed files.
+
+        Returns:
+            int: The number of files written.
+        """
+        start = time.perf_counter()
+        keys = set()
+        for path in changed_paths:
+            key = (os.path.basename(os.path.dirname(path)), os.path.basename(path))
+            if key in self.dependencies and os.path.isfile(path):
+                keys.add(self._load(path))
+
+        affected = {}
+        for key in keys:
+            for index, name in self.dependencies[key]:
+                affected.setdefault(index, set()).add(name)
+
+        written = self._write(affected, keys)
+
+        if keys:
+            elapsed = (time.perf_counter() - start) * 1000
+            templates = ", ".join("/".join(key) for key in sorted(keys))
+            self.events.emit(
+                "message",
+                text=f"Re-rendered {written} files from {templates} in {elapsed:.1f} ms",
+            )
+            self.events.flush()
+        return written
+
+    def _write(self, affected, keys):
+        written = 0
+        for index, names in sorted(affected.items()):
+            spec, target_dir = self.previews[index]
+            plan = GenerationPlan()
+            for name in sorted(names):
+                for planned in self._plan(spec, name).files.values():
+                    if planned.template is not None and tuple(planned.template) in keys:
+                        plan.add_file(
+                            planned.path,
+                            planned.content,
+                            overwrite=True,
+                            template=planned.template,
+                            mode=planned.mode,
+                        )
+            with using_registry(self._registry(spec)):
+                result = plan.write_to(FileSystemSink(target_dir))
+            for path, size in result.written.items():
+                self.events.emit(
+                    "file",
+                    path=os.path.join(target_dir, path),
+                    status="updated" if path in result.updated else "created",
+                    bytes=size,
+                )
+            written += len(result.written)
+        return written
+
+    def run(self, polling=False):
+        """Watch the template sources until interrupted.
+
+        Args:
+            polling (bool, optional): Poll instead of using inotify.
+        """
+        self.start()
+        watcher = create_watcher(content_folders(self.content_dir), polling)
+        self.events.emit(
+            "message",
+            text=f"Watching {self.content_dir} ({type(watcher).__name__})",
+        )
+        self.events.flush()
+        try:
+            while True:
+                self.update(watcher.wait())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watcher.close()
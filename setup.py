@@ -13,6 +13,7 @@ setup(
     packages=find_packages(include=["pkg_wizard", "pkg_wizard.*"]),
     include_package_data=True,  # Ensure package data is included
     install_requires=[],
+    extras_require={"yaml": ["pyyaml"]},
     entry_points={
         "console_scripts": [
             "generate=pkg_wizard.cli:main",
@@ -24,5 +25,5 @@ setup(
         "Operating System :: OS Independent",
         "License :: OSI Approved :: MIT License",
     ],
-    python_requires=">=3.6",
+    python_requires=">=3.9",
 )
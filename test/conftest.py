@@ -0,0 +1,47 @@
+import os
+import sys
+
+import pytest
+
+# Make the checkout importable without installing it.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path_factory, monkeypatch):
+    """Keep template packs out of the user's cache."""
+    path = str(tmp_path_factory.mktemp("cache"))
+    monkeypatch.setenv("PKG_WIZARD_CACHE", path)
+    return path
+
+
+@pytest.fixture
+def pack_dir(tmp_path):
+    """Return a function writing a template pack with the given templates."""
+
+    def make(templates, name="pack"):
+        root = tmp_path / name
+        for key, source in templates.items():
+            path = root / key
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(source)
+        return str(root)
+
+    return make
+
+
+def _read_tree(root):
+    files = {}
+    for dir_path, dirs, names in os.walk(root):
+        dirs[:] = [name for name in dirs if name != "__pycache__"]
+        for name in names:
+            path = os.path.join(dir_path, name)
+            with open(path, "rb") as f:
+                files[os.path.relpath(path, root).replace(os.sep, "/")] = f.read()
+    return files
+
+
+@pytest.fixture
+def read_tree():
+    """Return a function mapping every file below a directory to its bytes."""
+    return _read_tree
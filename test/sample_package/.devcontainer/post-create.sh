@@ -1,7 +1,44 @@
 #!/bin/sh
+# Installs the development dependencies, unless the image or a previous run
+# already installed them from requirement files with the same hashes.
+set -e
 
-echo $1
+cd "${1:-.}"
+echo "$PWD"
 
-pip install -r $1/dev_requirements.txt
-pip install docker
-pre-commit install
\ No newline at end of file
+STAMP_DIR=/opt/devcontainer
+PRE_COMMIT_HOME=${PRE_COMMIT_HOME:-$HOME/.cache/pre-commit}
+
+requirements_hash() {
+    sha256sum requirements.txt dev_requirements.txt 2>/dev/null || true
+}
+
+# The requirement files are only there with the config feature.
+requirement_args() {
+    for file in requirements.txt dev_requirements.txt; do
+        if [ -f "$file" ]; then printf -- '-r %s ' "$file"; fi
+    done
+}
+
+if [ "$(requirements_hash)" != "$(cat "$STAMP_DIR/requirements.sha256" 2>/dev/null)" ]; then
+    pip install $(requirement_args) docker
+    mkdir -p "$STAMP_DIR"
+    requirements_hash > "$STAMP_DIR/requirements.sha256"
+else
+    echo "Requirements unchanged, skipping pip install"
+fi
+
+if [ -f .pre-commit-config.yaml ]; then
+    command -v pre-commit > /dev/null || pip install pre-commit
+    pre-commit install
+    # The hooks live in the pre-commit cache volume of this package. Docker fills
+    # a new volume with the hooks baked into the image; after the config changes,
+    # the volume keeps the old hooks until they are installed again here.
+    stamp="$PRE_COMMIT_HOME/smart_py.sha256"
+    if [ "$(sha256sum .pre-commit-config.yaml)" != "$(cat "$stamp" 2>/dev/null)" ]; then
+        pre-commit install-hooks
+        sha256sum .pre-commit-config.yaml > "$stamp"
+    else
+        echo "Pre-commit config unchanged, skipping hook installation"
+    fi
+fi
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Measure how long each pre-commit hook takes.
+
+Every hook of the config runs on its own, a few times, after a warm-up run that
+installs its environment and applies its fixes. Hooks that still fail are
+reported as such rather than timed. Pass another config to compare
+pre-commit profiles:
+
+    python scripts/time_hooks.py
+    python scripts/time_hooks.py --config /path/to/other/.pre-commit-config.yaml
+"""
+import argparse
+import statistics
+import subprocess
+import time
+
+import yaml
+
+
+def hooks(config):
+    """Return the (hook id, stage) pairs of a pre-commit config."""
+    with open(config, "r") as f:
+        data = yaml.safe_load(f)
+    result = []
+    for repo in data.get("repos", []):
+        for hook in repo.get("hooks", []):
+            stages = hook.get("stages") or ["pre-commit"]
+            stage = "manual" if stages == ["manual"] else "pre-commit"
+            result.append((hook["id"], stage))
+    return result
+
+
+def run_hook(config, hook_id, stage, all_files):
+    command = ["pre-commit", "run", hook_id, "--config", config]
+    command += ["--hook-stage", stage]
+    if all_files:
+        command.append("--all-files")
+    start = time.perf_counter()
+    process = subprocess.run(
+        command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    return time.perf_counter() - start, process.returncode == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the pre-commit hooks.")
+    parser.add_argument("--config", default=".pre-commit-config.yaml")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument(
+        "--staged",
+        action="store_true",
+        help="Run on the staged files, as on commit, instead of all files.",
+    )
+    args = parser.parse_args()
+
+    commit_total = 0.0
+    print(f"{'hook':<28}{'stage':<12}{'median (s)':>12}")
+    for hook_id, stage in hooks(args.config):
+        run_hook(args.config, hook_id, stage, not args.staged)
+        runs = [
+            run_hook(args.config, hook_id, stage, not args.staged)
+            for _ in range(args.runs)
+        ]
+        if not all(passed for _, passed in runs):
+            print(f"{hook_id:<28}{stage:<12}{'failed':>12}")
+            continue
+        median = statistics.median(elapsed for elapsed, _ in runs)
+        if stage != "manual":
+            commit_total += median
+        print(f"{hook_id:<28}{stage:<12}{median:>12.3f}")
+    print(f"{'total on commit':<40}{commit_total:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
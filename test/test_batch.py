@@ -0,0 +1,71 @@
+"""Manifests are generated in a process pool with per-package errors."""
+
+import io
+import json
+
+import pytest
+
+from pkg_wizard.batch import load_manifest, report_batch, run_batch
+from pkg_wizard.utils.events import get_event_sink
+
+
+def _write_manifest(tmp_path, data):
+    manifest = tmp_path / "packages.json"
+    manifest.write_text(json.dumps(data))
+    return str(manifest)
+
+
+def test_load_manifest_resolves_target_dirs(tmp_path):
+    manifest = _write_manifest(
+        tmp_path,
+        {"packages": [{"package_name": "one"}, {"name": "two", "target_dir": "x"}]},
+    )
+
+    entries = load_manifest(manifest)
+
+    assert [spec.package_name for spec, _ in entries] == ["one", "two"]
+    assert [target for _, target in entries] == [
+        str(tmp_path / "one"),
+        str(tmp_path / "x"),
+    ]
+
+
+def test_run_batch_generates_every_package(tmp_path):
+    manifest = _write_manifest(
+        tmp_path, [{"package_name": "one"}, {"package_name": "two", "llm": True}]
+    )
+
+    results = run_batch(manifest, max_workers=2)
+
+    assert [result["package_name"] for result in results] == ["one", "two"]
+    assert not any("error" in result for result in results)
+    assert (tmp_path / "two" / "two" / "llm" / "llm.py").is_file()
+
+
+def test_failed_packages_are_reported_without_stopping_the_batch(tmp_path):
+    manifest = _write_manifest(
+        tmp_path,
+        [
+            {"package_name": "good"},
+            {"package_name": "bad", "include_features": ["no_such_feature"]},
+        ],
+    )
+
+    results = run_batch(manifest, max_workers=2)
+    stream = io.StringIO()
+    succeeded = report_batch(results, get_event_sink("human", stream))
+
+    assert not succeeded
+    assert "error" not in results[0]
+    assert "Unknown feature: no_such_feature" in results[1]["error"]
+    assert (tmp_path / "good" / "setup.py").is_file()
+    assert "Failed to generate bad" in stream.getvalue()
+    assert "Generated 1/2 packages" in stream.getvalue()
+
+
+@pytest.mark.parametrize("entry", [{}, "pkg", {"package_name": "pkg", "sub_dirs": 4}])
+def test_malformed_entries_name_the_manifest_and_entry(tmp_path, entry):
+    manifest = _write_manifest(tmp_path, [{"package_name": "good"}, entry])
+
+    with pytest.raises(ValueError, match=r"Invalid entry 1 of the manifest .*packages"):
+        load_manifest(manifest)
@@ -0,0 +1,59 @@
+"""The zipapp reads its templates from a bundle mapped straight from the archive."""
+
+import os
+import subprocess
+import sys
+import zipfile
+
+import pytest
+
+from pkg_wizard.generator import generate
+from pkg_wizard.spec import PackageSpec
+from pkg_wizard.utils.bundle import BUNDLE_FILE, _find_in_zip, pack_bundle
+from pkg_wizard.watch import CONTENT_DIR
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MEMBER = f"pkg_wizard/{BUNDLE_FILE}"
+
+
+def _zipapp(path, compression=zipfile.ZIP_STORED):
+    with open(path, "wb") as f:
+        f.write(b"#!/usr/bin/env python3\n")
+        with zipfile.ZipFile(f, "w") as archive:
+            archive.writestr("pkg_wizard/__init__.py", "")
+            archive.writestr(MEMBER, pack_bundle(CONTENT_DIR), compression)
+            archive.writestr("__main__.py", "")
+    return str(path)
+
+
+def test_bundled_templates_are_read_from_the_archive(tmp_path):
+    bundle = _find_in_zip(_zipapp(tmp_path / "gps.pyz"), MEMBER)
+
+    assert ("configurations", "setup.py") in bundle.keys()
+    for folder, file_name in bundle.keys():
+        with open(os.path.join(CONTENT_DIR, folder, file_name), "rb") as f:
+            assert bundle.read(folder, file_name) == f.read()
+
+
+def test_compressed_or_missing_bundles_are_not_used(tmp_path):
+    compressed = _zipapp(tmp_path / "gps.pyz", zipfile.ZIP_DEFLATED)
+
+    assert _find_in_zip(compressed, MEMBER) is None
+    assert _find_in_zip(compressed, "pkg_wizard/missing.bundle") is None
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="the zipapp needs a shebang")
+def test_zipapp_generates_the_same_package(tmp_path, read_tree):
+    zipapp = str(tmp_path / "gps.pyz")
+    build = os.path.join(REPO_ROOT, "tools", "build_zipapp.py")
+    subprocess.run([sys.executable, build, "-o", zipapp], check=True)
+    (tmp_path / "zipapp").mkdir()
+
+    subprocess.run(
+        [sys.executable, zipapp, "demo", "--event_format", "quiet"],
+        cwd=tmp_path / "zipapp",
+        check=True,
+    )
+    generate(PackageSpec("demo"), str(tmp_path / "local"))
+
+    assert read_tree(tmp_path / "zipapp") == read_tree(tmp_path / "local")
@@ -0,0 +1,104 @@
+"""Each event format reports a generation with one write per flush."""
+
+import io
+import json
+
+import pytest
+
+from pkg_wizard.generator import generate
+from pkg_wizard.spec import PackageSpec
+from pkg_wizard.utils.events import emit_result, get_event_sink
+
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+@pytest.fixture
+def conflicting(tmp_path, pack_dir):
+    """Return a re-run that writes some files and conflicts on an edited one."""
+    generate(PackageSpec("demo"), str(tmp_path))
+    (tmp_path / ".gitignore").write_text("edited\n")
+    pack = pack_dir({"configurations/.gitignore": "upgraded\n"})
+    (tmp_path / "setup.py").unlink()
+    return generate(PackageSpec("demo", template_pack=pack), str(tmp_path))
+
+
+@pytest.mark.parametrize("event_format", ["human", "quiet", "json"])
+def test_events_are_written_once_when_flushed(tmp_path, event_format):
+    stream = CountingStream()
+    events = get_event_sink(event_format, stream)
+
+    emit_result(events, generate(PackageSpec("demo"), str(tmp_path)), "demo")
+    events.emit("error", package_name="demo", error="boom")
+    assert stream.writes == 0
+
+    events.flush()
+    assert stream.writes == 1
+    events.flush()
+    assert stream.writes == 1
+
+
+def test_human_format_writes_the_familiar_messages(conflicting):
+    stream = io.StringIO()
+    events = get_event_sink("human", stream)
+
+    emit_result(events, conflicting, "demo")
+    events.emit("message", text="Done")
+    events.flush()
+
+    lines = stream.getvalue().splitlines()
+    assert "Created file: setup.py" in lines
+    assert "Conflict (modified since generated): .gitignore" in lines
+    assert "Skipped file (already exists): readme.md" in lines
+    assert lines[-1] == "Done"
+
+
+def test_quiet_format_only_writes_errors_and_conflicts(conflicting):
+    stream = io.StringIO()
+    events = get_event_sink("quiet", stream)
+
+    emit_result(events, conflicting, "demo")
+    events.emit("message", text="Done")
+    events.emit("error", package_name="other", error="boom")
+    events.flush()
+
+    assert stream.getvalue().splitlines() == [
+        "Conflict (modified since generated): .gitignore",
+        "Failed to generate other: boom",
+    ]
+
+
+def test_json_format_writes_one_object_per_event(conflicting):
+    stream = io.StringIO()
+    events = get_event_sink("json", stream)
+
+    emit_result(events, conflicting, "demo")
+    events.flush()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    files = {line["path"]: line for line in lines if line["event"] == "file"}
+    assert files["setup.py"]["status"] == "created"
+    assert files["setup.py"]["bytes"] == conflicting.written["setup.py"]
+    assert files[".gitignore"]["status"] == "conflict"
+    assert lines[-1] == {
+        "event": "package",
+        "package_name": "demo",
+        "target_dir": conflicting.target_dir,
+        "created": 1,
+        "updated": 0,
+        "skipped": len(conflicting.skipped),
+        "conflicts": 1,
+        "bytes_written": conflicting.bytes_written,
+    }
+
+
+def test_unknown_formats_are_rejected():
+    with pytest.raises(ValueError, match="Unsupported event format: xml"):
+        get_event_sink("xml")
@@ -0,0 +1,92 @@
+"""Static templates are copied with the fastest method the filesystem supports."""
+
+import errno
+import os
+
+import pytest
+
+from pkg_wizard.utils import fastcopy
+
+
+@pytest.fixture(autouse=True)
+def unsupported(monkeypatch):
+    """Forget which methods failed in other tests."""
+    monkeypatch.setattr(fastcopy, "_unsupported", set())
+    return fastcopy._unsupported
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "source"
+    path.write_bytes(os.urandom(256 * 1024))
+    return path
+
+
+def _fail(error):
+    def method(*args, **kwargs):
+        raise OSError(error, os.strerror(error))
+
+    return method
+
+
+def _partial_copy(error):
+    def method(src_fd, dst_fd, size, stats):
+        os.write(dst_fd, b"partial")
+        raise OSError(error, os.strerror(error))
+
+    return method
+
+
+def test_copies_fall_back_until_a_method_works(tmp_path, source, monkeypatch):
+    monkeypatch.setattr(
+        fastcopy,
+        "COPY_METHODS",
+        [
+            ("reflink", _fail(errno.EOPNOTSUPP)),
+            ("copy_file_range", _partial_copy(errno.EXDEV)),
+            ("sendfile", fastcopy._sendfile),
+        ],
+    )
+    destination = tmp_path / "copy"
+
+    assert fastcopy.copy_file(str(source), str(destination)) == "sendfile"
+    assert destination.read_bytes() == source.read_bytes()
+
+
+def test_copies_fall_back_to_a_buffered_copy(tmp_path, source, monkeypatch):
+    monkeypatch.setattr(fastcopy.fcntl, "ioctl", _fail(errno.ENOTTY))
+    monkeypatch.setattr(os, "copy_file_range", _fail(errno.ENOSYS), raising=False)
+    monkeypatch.setattr(os, "sendfile", _fail(errno.EINVAL), raising=False)
+    destination = tmp_path / "copy"
+
+    assert fastcopy.copy_file(str(source), str(destination), mode=0o755) == "copy"
+    assert destination.read_bytes() == source.read_bytes()
+    assert os.stat(destination).st_mode & 0o777 == 0o755
+
+
+def test_unsupported_methods_are_not_tried_again(tmp_path, source, monkeypatch):
+    calls = []
+
+    def reflink(*args):
+        calls.append("reflink")
+        raise OSError(errno.EXDEV, "cross-device")
+
+    monkeypatch.setattr(
+        fastcopy,
+        "COPY_METHODS",
+        [("reflink", reflink), ("copy_file_range", fastcopy._copy_file_range)],
+    )
+
+    for name in ["one", "two"]:
+        assert fastcopy.copy_file(str(source), str(tmp_path / name)) == (
+            "copy_file_range"
+        )
+    assert calls == ["reflink"]
+
+
+def test_copy_errors_are_raised(tmp_path, source, monkeypatch):
+    monkeypatch.setattr(fastcopy, "COPY_METHODS", [("reflink", _fail(errno.EIO))])
+
+    with pytest.raises(OSError) as error:
+        fastcopy.copy_file(str(source), str(tmp_path / "copy"))
+    assert error.value.errno == errno.EIO
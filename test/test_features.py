@@ -0,0 +1,91 @@
+"""Features are built in or registered by installed plugins."""
+
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from pkg_wizard import cli, features
+from pkg_wizard.features import BUILTIN_FEATURES, available_features, load_feature
+from pkg_wizard.generator import build_plan
+from pkg_wizard.spec import PackageSpec
+
+PLUGIN = """
+from pkg_wizard.utils.file import create_file
+
+
+class HelloSupport:
+    dev_requirements = ["hello-lint"]
+
+    def __init__(self, package_name):
+        self.package_name = package_name
+
+    @classmethod
+    def from_spec(cls, spec):
+        return cls(spec.package_name)
+
+    def create_files(self):
+        create_file("HELLO.md", f"Hello from {self.package_name}\\n")
+"""
+
+
+@pytest.fixture
+def plugin(tmp_path, monkeypatch):
+    """Register a `hello` feature and a plugin trying to replace `docker`."""
+    (tmp_path / "hello_plugin.py").write_text(PLUGIN)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    entry_points = [
+        SimpleNamespace(name="hello", value="hello_plugin:HelloSupport"),
+        SimpleNamespace(name="docker", value="hello_plugin:HelloSupport"),
+    ]
+    monkeypatch.setattr(features, "_entry_points", lambda: entry_points)
+
+
+@pytest.fixture
+def no_plugins(monkeypatch):
+    """Fail when the installed distributions are scanned."""
+
+    def scan():
+        raise AssertionError("entry points were scanned")
+
+    monkeypatch.setattr(features, "_entry_points", scan)
+
+
+def test_plugins_are_generated_after_the_builtin_features(plugin):
+    spec = PackageSpec("demo", include_features=["hello", "config"])
+
+    plan = build_plan(spec)
+
+    assert plan.files["HELLO.md"].content == "Hello from demo\n"
+    requirements = plan.files["dev_requirements.txt"].content
+    assert requirements.splitlines()[-1] == "hello-lint"
+
+
+def test_plugins_cannot_replace_builtin_features(plugin):
+    assert available_features()["hello"] == "hello_plugin:HelloSupport"
+    assert available_features()["docker"] == BUILTIN_FEATURES["docker"]
+    assert load_feature("docker").__name__ == "DockerSupport"
+
+
+def test_builtin_features_are_resolved_without_scanning(no_plugins):
+    plan = build_plan(PackageSpec("demo"))
+
+    assert "Dockerfile" in plan.files
+
+
+def test_unknown_features_are_rejected(plugin):
+    with pytest.raises(ValueError, match="Unknown feature: no_such"):
+        load_feature("no_such")
+    with pytest.raises(ValueError, match="Unknown feature: no_such"):
+        build_plan(PackageSpec("demo", include_features=["config", "no_such"]))
+
+
+def test_cli_names_the_unknown_features(plugin, monkeypatch, capsys):
+    argv = ["gps", "demo", "--include_features", "hello", "no_such", "other"]
+    monkeypatch.setattr(sys, "argv", argv)
+
+    with pytest.raises(SystemExit) as exc_info:
+        cli.main()
+
+    assert exc_info.value.code == 2
+    assert "unknown features: no_such, other" in capsys.readouterr().err
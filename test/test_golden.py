@@ -0,0 +1,27 @@
+"""The default output matches the sample packages checked into test/."""
+
+import os
+
+import pytest
+
+from pkg_wizard.generator import generate
+from pkg_wizard.spec import PackageSpec
+
+GOLDEN_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.mark.parametrize(
+    "golden, spec",
+    [
+        ("sample_package", PackageSpec("smart_py")),
+        ("sample_package2", PackageSpec("smart_py", sub_dirs=["core", "utils"])),
+        (
+            "sample_package3",
+            PackageSpec("smart_py_with_llm", sub_dirs=["core", "utils"], llm=True),
+        ),
+    ],
+)
+def test_output_matches_the_golden_tree(tmp_path, read_tree, golden, spec):
+    generate(spec, str(tmp_path))
+
+    assert read_tree(tmp_path) == read_tree(os.path.join(GOLDEN_DIR, golden))
@@ -0,0 +1,118 @@
+"""Locked installers: lock files are resolved after generation, and cached."""
+
+import os
+import subprocess
+import time
+
+import pytest
+
+from pkg_wizard.generator import build_plan, generate
+from pkg_wizard.spec import PackageSpec
+from pkg_wizard.utils.installers import LOCK_FILES, LOCKS_DIR, evict_locks, lock_package
+
+FAKE_PIP_COMPILE = """#!/bin/sh
+# Writes the requirement files it is given into the --output-file.
+while [ "$1" != "--output-file" ]; do shift; done
+output=$2
+shift 2
+[ -n "$FAIL" ] && { echo "resolution impossible" >&2; exit 1; }
+cat "$@" > "$output"
+"""
+
+
+@pytest.fixture
+def fake_tools(tmp_path, monkeypatch):
+    """Put a fake pip-compile, and nothing else, on the PATH."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "pip-compile"
+    script.write_text(FAKE_PIP_COMPILE)
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}/bin{os.pathsep}/usr/bin")
+    return bin_dir
+
+
+def test_generation_writes_the_lock_script_without_resolving(tmp_path, monkeypatch):
+    def run(*args, **kwargs):
+        raise AssertionError("generation must not run the lock command")
+
+    monkeypatch.setattr(subprocess, "run", run)
+    result = generate(PackageSpec("demo", installer="pip-tools"), str(tmp_path))
+
+    assert os.path.join("scripts", "lock.sh") in result.written
+    assert "build_requirements.txt" in result.written
+    assert not any(path.endswith(".lock") for path in result.written)
+
+
+@pytest.mark.parametrize("installer", ["pip-tools", "uv"])
+@pytest.mark.parametrize("variant", ["simple", "multistage"])
+def test_every_dockerfile_installs_from_the_locks(installer, variant):
+    spec = PackageSpec(
+        "demo",
+        include_features=["docker"],
+        docker_variant=variant,
+        docker_runtime="slim",
+        installer=installer,
+    )
+    plan = build_plan(spec)
+
+    for name in ["Dockerfile", "Dockerfile.runtime"]:
+        content = plan.files[name].content
+        assert "--require-hashes" in content
+        assert "requirements.txt" not in content
+
+
+def test_lock_package_writes_and_caches_lock_files(tmp_path, fake_tools, cache):
+    generate(PackageSpec("demo", installer="pip-tools"), str(tmp_path / "one"))
+    generate(PackageSpec("demo", installer="pip-tools"), str(tmp_path / "two"))
+
+    assert lock_package("pip-tools", str(tmp_path / "one")) == list(LOCK_FILES)
+    (fake_tools / "pip-compile").unlink()
+    # The same requirements are locked from the cache, without pip-compile.
+    assert lock_package("pip-tools", str(tmp_path / "two")) == list(LOCK_FILES)
+    for lock_file in LOCK_FILES:
+        one = (tmp_path / "one" / lock_file).read_text()
+        assert one == (tmp_path / "two" / lock_file).read_text()
+    assert "pytest" in (tmp_path / "one" / "dev_requirements.lock").read_text()
+    assert len(os.listdir(os.path.join(cache, LOCKS_DIR))) == len(LOCK_FILES)
+
+
+def test_lock_package_keeps_existing_lock_files(tmp_path, fake_tools):
+    generate(PackageSpec("demo", installer="pip-tools"), str(tmp_path))
+    (tmp_path / "requirements.lock").write_text("# mine\n")
+
+    assert "requirements.lock" not in lock_package("pip-tools", str(tmp_path))
+    assert (tmp_path / "requirements.lock").read_text() == "# mine\n"
+
+
+def test_missing_lock_command_fails_loudly(tmp_path, fake_tools):
+    generate(PackageSpec("demo", installer="uv"), str(tmp_path))
+
+    with pytest.raises(FileNotFoundError, match="uv is not installed"):
+        lock_package("uv", str(tmp_path))
+    assert not (tmp_path / "requirements.lock").exists()
+
+
+def test_failed_resolution_fails_loudly(tmp_path, fake_tools, monkeypatch, cache):
+    monkeypatch.setenv("FAIL", "1")
+    generate(PackageSpec("demo", installer="pip-tools"), str(tmp_path))
+
+    with pytest.raises(RuntimeError, match="resolution impossible"):
+        lock_package("pip-tools", str(tmp_path))
+    assert not (tmp_path / "requirements.lock").exists()
+    assert not os.path.exists(os.path.join(cache, LOCKS_DIR))
+
+
+def test_evict_locks_removes_old_and_least_recently_used_locks(cache):
+    locks_dir = os.path.join(cache, LOCKS_DIR)
+    os.makedirs(locks_dir)
+    now = time.time()
+    for age, key in [(10, "new"), (20, "recent"), (30, "older"), (10**9, "stale")]:
+        path = os.path.join(locks_dir, key)
+        open(path, "w").close()
+        os.utime(path, (now - age, now - age))
+
+    evicted = evict_locks(cache, max_entries=2, max_age=3600, keep=["older"])
+
+    assert sorted(evicted) == ["recent", "stale"]
+    assert sorted(os.listdir(locks_dir)) == ["new", "older"]
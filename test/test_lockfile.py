@@ -0,0 +1,71 @@
+"""Re-runs rewrite stale generated files and report edited ones as conflicts."""
+
+import io
+import json
+
+from pkg_wizard.generator import generate
+from pkg_wizard.spec import PackageSpec
+from pkg_wizard.utils.events import emit_result, get_event_sink
+from pkg_wizard.utils.lock import LOCK_FILE, Lockfile, file_hash
+
+
+def test_lockfile_records_every_written_file(tmp_path):
+    result = generate(PackageSpec("demo"), str(tmp_path))
+    lock = Lockfile.load(str(tmp_path))
+
+    assert set(lock.entries) == set(result.written)
+    entry = lock.get(".gitignore")
+    assert entry["template"] == "configurations/.gitignore"
+    assert entry["sha256"] == file_hash(str(tmp_path / ".gitignore"))
+
+
+def test_template_upgrade_rewrites_untouched_files(tmp_path, pack_dir):
+    generate(PackageSpec("demo"), str(tmp_path))
+    pack = pack_dir({"configurations/.gitignore": "upgraded\n"})
+
+    result = generate(PackageSpec("demo", template_pack=pack), str(tmp_path))
+
+    assert ".gitignore" in result.written
+    assert result.updated == [".gitignore"]
+    assert (tmp_path / ".gitignore").read_text() == "upgraded\n"
+    assert Lockfile.load(str(tmp_path)).get(".gitignore")["sha256"] == file_hash(
+        str(tmp_path / ".gitignore")
+    )
+
+
+def test_template_upgrade_reports_edited_files_as_conflicts(tmp_path, pack_dir):
+    generate(PackageSpec("demo"), str(tmp_path))
+    (tmp_path / ".gitignore").write_text("edited\n")
+    pack = pack_dir({"configurations/.gitignore": "upgraded\n"})
+
+    result = generate(PackageSpec("demo", template_pack=pack), str(tmp_path))
+
+    assert ".gitignore" in result.conflicts
+    assert ".gitignore" not in result.written
+    assert (tmp_path / ".gitignore").read_text() == "edited\n"
+
+
+def test_files_without_a_lock_entry_are_left_alone(tmp_path, pack_dir):
+    generate(PackageSpec("demo"), str(tmp_path))
+    with open(tmp_path / LOCK_FILE, "w") as f:
+        json.dump({"version": 1, "files": {}}, f)
+    pack = pack_dir({"configurations/.gitignore": "upgraded\n"})
+
+    result = generate(PackageSpec("demo", template_pack=pack), str(tmp_path))
+
+    assert ".gitignore" in result.skipped
+    assert (tmp_path / ".gitignore").read_text() != "upgraded\n"
+
+
+def test_rewritten_files_are_reported_as_updated(tmp_path, pack_dir):
+    generate(PackageSpec("demo"), str(tmp_path))
+    pack = pack_dir({"configurations/.gitignore": "upgraded\n"})
+    result = generate(PackageSpec("demo", template_pack=pack), str(tmp_path))
+
+    stream = io.StringIO()
+    events = get_event_sink("human", stream)
+    emit_result(events, result, "demo")
+    events.flush()
+
+    assert "Updated file: .gitignore" in stream.getvalue()
+    assert "Created file" not in stream.getvalue()
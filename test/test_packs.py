@@ -0,0 +1,65 @@
+"""Template packs are unpacked into the cache once and evicted when unused."""
+
+import os
+import time
+
+import pytest
+
+from pkg_wizard.utils import packs
+from pkg_wizard.utils.packs import INDEX_FILE, PACKS_DIR, evict, open_pack
+
+
+@pytest.fixture(autouse=True)
+def loaded(monkeypatch):
+    """Forget the packs other tests kept in memory."""
+    monkeypatch.setattr(packs, "_packs", {})
+
+
+def _cached(cache, pack, age):
+    """Mark a cached pack as last used `age` seconds ago."""
+    index_path = os.path.join(cache, PACKS_DIR, os.path.basename(pack.path), INDEX_FILE)
+    used = time.time() - age
+    os.utime(index_path, (used, used))
+    return os.path.basename(pack.path)
+
+
+def test_packs_are_unpacked_once_and_kept_in_memory(cache, pack_dir):
+    source = pack_dir({"configurations/setup.py": "setup()\n"})
+
+    pack = open_pack(source)
+
+    assert open_pack(source) is pack
+    assert pack.path == os.path.join(cache, PACKS_DIR, os.path.basename(pack.path))
+    assert pack.get("configurations", "setup.py") is not None
+    assert pack.get("configurations", "missing.py") is None
+
+
+def test_evict_removes_packs_unused_for_too_long(cache, pack_dir):
+    old = open_pack(pack_dir({"a/old.txt": "old"}, name="old"))
+    new = open_pack(pack_dir({"a/new.txt": "new"}, name="new"))
+    old_key, new_key = _cached(cache, old, 7200), _cached(cache, new, 10)
+
+    assert evict(cache, max_age=3600) == [old_key]
+    assert os.listdir(os.path.join(cache, PACKS_DIR)) == [new_key]
+    # The evicted pack is unpacked again rather than served from memory.
+    assert old_key not in packs._packs
+    assert open_pack(pack_dir({"a/old.txt": "old"}, name="old")) is not old
+
+
+def test_evict_removes_least_recently_used_packs_over_the_size(cache, pack_dir):
+    sources = [pack_dir({"a/file.txt": str(i) * 100}, name=str(i)) for i in range(3)]
+    keys = [_cached(cache, open_pack(s), age) for s, age in zip(sources, (30, 20, 10))]
+
+    assert evict(cache, max_bytes=250, keep=keys[0]) == [keys[1]]
+    assert sorted(os.listdir(os.path.join(cache, PACKS_DIR))) == sorted(
+        [keys[0], keys[2]]
+    )
+
+
+def test_opening_a_pack_evicts_the_others(cache, pack_dir):
+    stale = _cached(cache, open_pack(pack_dir({"a/a.txt": "a"}, name="a")), 10**9)
+
+    fresh = open_pack(pack_dir({"a/b.txt": "b"}, name="b"))
+
+    assert os.listdir(os.path.join(cache, PACKS_DIR)) == [os.path.basename(fresh.path)]
+    assert stale not in packs._packs
@@ -0,0 +1,149 @@
+"""The plan phase builds the package in memory, the apply phase writes it."""
+
+import os
+
+import pytest
+
+from pkg_wizard.generator import build_plan, generate
+from pkg_wizard.spec import PackageSpec
+from pkg_wizard.utils.lock import LOCK_FILE
+
+
+def test_build_plan_does_not_touch_the_filesystem(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    plan = build_plan(PackageSpec("demo", sub_dirs=["core"]))
+
+    assert os.listdir(tmp_path) == []
+    assert "demo" in plan.dirs
+    assert os.path.join("demo", "core") in plan.dirs
+    assert os.path.join("demo", "core", "__init__.py") in plan.files
+    assert "setup.py" in plan.files
+
+
+def test_build_plan_only_plans_selected_features():
+    plan = build_plan(PackageSpec("demo", include_features=["docker"]))
+
+    assert "Dockerfile" in plan.files
+    assert "setup.py" not in plan.files
+    assert ".pre-commit-config.yaml" not in plan.files
+
+
+def test_apply_writes_every_planned_file(tmp_path, read_tree):
+    plan = build_plan(PackageSpec("demo", sub_dirs=["core", "utils"]))
+    result = plan.apply(str(tmp_path))
+
+    files = read_tree(tmp_path)
+    assert set(result.written) == set(plan.files)
+    assert set(files) == set(plan.files) | {LOCK_FILE}
+    for path, planned in plan.files.items():
+        assert files[path.replace(os.sep, "/")] == planned.content.encode("utf-8")
+
+
+def test_apply_keeps_file_modes(tmp_path):
+    plan = build_plan(PackageSpec("demo"))
+    plan.apply(str(tmp_path))
+
+    mode = os.stat(tmp_path / ".devcontainer" / "post-create.sh").st_mode
+    assert mode & 0o777 == 0o755
+
+
+def test_apply_skips_existing_files(tmp_path):
+    (tmp_path / "setup.py").write_text("# mine\n")
+    result = generate(PackageSpec("demo"), str(tmp_path))
+
+    assert "setup.py" in result.skipped
+    assert (tmp_path / "setup.py").read_text() == "# mine\n"
+
+
+def test_generation_is_repeatable(tmp_path):
+    spec = PackageSpec("demo")
+    first = generate(spec, str(tmp_path))
+    second = generate(spec, str(tmp_path))
+
+    assert first.written
+    assert second.written == {}
+    assert set(second.skipped) == set(first.written)
+
+
+def test_features_add_their_dev_requirements():
+    spec = PackageSpec("demo", include_features=["config", "benchmarks"])
+
+    requirements = build_plan(spec).files["dev_requirements.txt"].content
+    assert requirements.splitlines()[-1] == "pytest-benchmark"
+    assert "pytest-benchmark" not in (
+        build_plan(PackageSpec("demo")).files["dev_requirements.txt"].content
+    )
+
+
+def test_lazy_init_imports_feature_subpackages():
+    spec = PackageSpec(
+        "demo",
+        sub_dirs=["core"],
+        include_features=["config", "profiling"],
+        lazy_init=True,
+    )
+
+    init = build_plan(spec).files[os.path.join("demo", "__init__.py")].content
+    assert '_SUBMODULES = ("core", "profiling")' in init
+
+
+def test_devcontainer_pre_commit_volume_is_per_package():
+    plan = build_plan(PackageSpec("demo", include_features=["dev_container"]))
+
+    devcontainer = plan.files[os.path.join(".devcontainer", "devcontainer.json")]
+    assert "source=devcontainer-demo-pre-commit-cache," in devcontainer.content
+
+
+NO_CONFIG = ["docker", "dev_container", "pre_commit"]
+
+FAKE_PIP = """#!/bin/sh
+# Records its arguments, and provides pre-commit once it is installed.
+echo "pip $*" >> "$LOG"
+if [ "$*" = "install pre-commit" ]; then
+    cat > "$(dirname "$0")/pre-commit" <<'END'
+#!/bin/sh
+echo "pre-commit $*" >> "$LOG"
+mkdir -p "$HOME/.cache/pre-commit"
+END
+    chmod +x "$(dirname "$0")/pre-commit"
+fi
+"""
+
+
+@pytest.mark.parametrize("installer", ["pip", "uv"])
+def test_devcontainer_copies_only_files_the_package_has(installer):
+    spec = PackageSpec("demo", include_features=NO_CONFIG, installer=installer)
+    plan = build_plan(spec)
+
+    dockerfile = plan.files[os.path.join(".devcontainer", "Dockerfile")].content
+    for line in dockerfile.splitlines():
+        if line.startswith("COPY ") and "--from" not in line:
+            for source in line.split()[1:-1]:
+                assert source in plan.files or "[" in source
+
+
+def test_post_create_works_without_the_config_feature(tmp_path):
+    import subprocess
+
+    generate(PackageSpec("demo", include_features=NO_CONFIG), str(tmp_path / "pkg"))
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (bin_dir / "pip").write_text(FAKE_PIP)
+    (bin_dir / "pip").chmod(0o755)
+    log = tmp_path / "log"
+    env = {
+        "PATH": f"{bin_dir}:/usr/bin:/bin",
+        "HOME": str(tmp_path),
+        "LOG": str(log),
+    }
+
+    subprocess.run(
+        ["sh", ".devcontainer/post-create.sh"],
+        cwd=tmp_path / "pkg",
+        env=env,
+        check=True,
+        capture_output=True,
+    )
+
+    assert "pip install pre-commit" in log.read_text()
+    assert "pre-commit install-hooks" in log.read_text()
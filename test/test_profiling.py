@@ -0,0 +1,91 @@
+"""The generated profiling package writes one set of profiles per profiled call."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from pkg_wizard.generator import generate
+from pkg_wizard.spec import PackageSpec
+
+SCRIPT = """
+import time
+
+from demo.profiling import profile_block, profiled
+
+
+def busy():
+    deadline = time.perf_counter() + 0.1
+    data = []
+    while time.perf_counter() < deadline:
+        data.append(bytearray(100))
+    return data
+
+
+@profiled
+def handle():
+    with profile_block("nested"):
+        return busy()
+
+
+handle()
+print(handle.__name__, profiled(busy) is busy)
+"""
+
+
+@pytest.fixture
+def run_profiled(tmp_path):
+    """Return a function running the script in a generated package."""
+    generate(PackageSpec("demo", include_features=["profiling"]), str(tmp_path))
+    (tmp_path / "script.py").write_text(SCRIPT)
+
+    def run(profile):
+        env = dict(os.environ, DEMO_PROFILE_DIR=str(tmp_path / "out"))
+        env.pop("DEMO_PROFILE", None)
+        if profile:
+            env["DEMO_PROFILE"] = profile
+        process = subprocess.run(
+            [sys.executable, "script.py"],
+            cwd=tmp_path,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        out = tmp_path / "out"
+        return process.stdout, sorted(out.iterdir()) if out.exists() else []
+
+    return run
+
+
+def test_every_profiler_writes_its_files(run_profiled):
+    import pstats
+    import tracemalloc
+
+    stdout, paths = run_profiled("cprofile,tracemalloc,sampling")
+
+    assert stdout == "handle False\n"
+    # The nested block is part of the profile of the call, not a profile of its own.
+    assert [path.suffix for path in paths] == [
+        ".folded",
+        ".prof",
+        ".tracemalloc",
+        ".txt",
+    ]
+    assert all(path.name.startswith("__main__.handle-") for path in paths)
+    prof, folded = paths[1], paths[0]
+    functions = {name for _, _, name in pstats.Stats(str(prof)).stats}
+    assert "busy" in functions
+    assert tracemalloc.Snapshot.load(str(paths[2])).traces
+    assert paths[3].read_text().startswith("current: ")
+    stacks = folded.read_text().splitlines()
+    assert any("busy (script.py:" in line for line in stacks)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in stacks)
+
+
+def test_profiling_is_off_by_default(run_profiled):
+    stdout, paths = run_profiled(None)
+
+    assert stdout == "handle True\n"
+    assert paths == []
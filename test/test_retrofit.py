@@ -0,0 +1,132 @@
+"""Retrofitting fills in the missing and stale files of an existing repository."""
+
+import os
+import sys
+
+from pkg_wizard import cli
+from pkg_wizard.generator import generate
+from pkg_wizard.spec import PackageSpec
+from pkg_wizard.utils.plan import GenerationPlan
+from pkg_wizard.utils.sink import RetrofitSink
+from pkg_wizard.utils.tree import TreeIndex
+
+FEATURES = ["config", "github_actions", "pre_commit"]
+
+
+def _repository(root):
+    """Create a repository with its own setup.py and heavy unrelated directories."""
+    for path in [
+        "setup.py",
+        ".git/objects/ab/cdef",
+        "node_modules/left-pad/index.js",
+        "src/app/main.py",
+    ]:
+        path = root / path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("# existing\n")
+
+
+def test_scan_prunes_vcs_and_dependency_directories(tmp_path):
+    _repository(tmp_path)
+
+    index = TreeIndex.scan(str(tmp_path))
+
+    assert ".git" in index.dirs and "node_modules" in index.dirs
+    assert not any(path.startswith((".git/", "node_modules/")) for path in index.dirs)
+    assert not any(path.startswith((".git/", "node_modules/")) for path in index.files)
+    assert os.path.join("src", "app", "main.py") in index.files
+    # The root, src and src/app.
+    assert index.scanned == 3
+
+
+def test_retrofit_walks_the_tree_once(tmp_path, monkeypatch):
+    _repository(tmp_path)
+    listed = []
+    scandir = os.scandir
+
+    def counting_scandir(path):
+        listed.append(os.path.relpath(path, tmp_path))
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", counting_scandir)
+    generate(
+        PackageSpec("demo", include_features=FEATURES), str(tmp_path), retrofit=True
+    )
+
+    assert listed and len(listed) == len(set(listed))
+    assert not any(path.startswith((".git", "node_modules", "src")) for path in listed)
+
+
+def test_retrofit_only_writes_missing_files(tmp_path):
+    _repository(tmp_path)
+
+    result = generate(
+        PackageSpec("demo", include_features=FEATURES), str(tmp_path), retrofit=True
+    )
+
+    assert "setup.py" in result.skipped
+    assert (tmp_path / "setup.py").read_text() == "# existing\n"
+    assert ".pre-commit-config.yaml" in result.written
+    assert (tmp_path / ".pre-commit-config.yaml").is_file()
+
+
+def test_retrofit_keeps_existing_files_asked_to_be_overwritten(tmp_path):
+    (tmp_path / "notes.txt").write_text("mine\n")
+    plan = GenerationPlan()
+    plan.add_file("notes.txt", "generated\n", overwrite=True)
+    plan.add_file("extra.txt", "generated\n", overwrite=True)
+
+    result = plan.write_to(RetrofitSink(str(tmp_path)))
+
+    assert "notes.txt" in result.skipped
+    assert (tmp_path / "notes.txt").read_text() == "mine\n"
+    assert (tmp_path / "extra.txt").read_text() == "generated\n"
+
+
+def test_retrofit_creates_only_the_directories_files_go_into(tmp_path):
+    _repository(tmp_path)
+
+    generate(
+        PackageSpec("demo", sub_dirs=["core"], include_features=FEATURES),
+        str(tmp_path),
+        retrofit=True,
+    )
+
+    # The package directories are not created, only those receiving a file.
+    assert not (tmp_path / "demo").exists()
+    assert (tmp_path / ".github" / "workflows").is_dir()
+    for dir_path, dirs, files in os.walk(tmp_path / ".github"):
+        assert dirs or files
+
+
+def test_retrofit_refreshes_stale_files_and_reports_edited_ones(tmp_path, pack_dir):
+    spec = PackageSpec("demo", include_features=FEATURES)
+    generate(spec, str(tmp_path), retrofit=True)
+    (tmp_path / "requirements.txt").write_text("edited\n")
+    pack = pack_dir(
+        {
+            "configurations/.gitignore": "upgraded\n",
+            "configurations/requirements.txt": "upgraded\n",
+        }
+    )
+
+    spec = PackageSpec("demo", include_features=FEATURES, template_pack=pack)
+    result = generate(spec, str(tmp_path), retrofit=True)
+
+    assert result.updated == [".gitignore"]
+    assert (tmp_path / ".gitignore").read_text() == "upgraded\n"
+    assert "requirements.txt" in result.conflicts
+    assert (tmp_path / "requirements.txt").read_text() == "edited\n"
+
+
+def test_retrofit_does_not_print_publishing_instructions(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(
+        sys, "argv", ["gps", "demo", "--retrofit", "--include_features", "config"]
+    )
+
+    cli.main()
+
+    output = capsys.readouterr().out
+    assert "Retrofitted demo" in output
+    assert "PyPI" not in output
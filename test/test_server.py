@@ -0,0 +1,177 @@
+"""The daemon round-trip and the in-process fallback of the client."""
+
+import io
+import json
+import os
+import stat
+import tarfile
+import threading
+
+import pytest
+
+from pkg_wizard.client import (
+    TOKEN_HEADER,
+    _connect,
+    archive_via_daemon,
+    generate_via_daemon,
+    token_path,
+)
+from pkg_wizard.generator import generate
+from pkg_wizard.server import create_server
+from pkg_wizard.spec import PackageSpec
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    socket_path = str(tmp_path / "gps.sock")
+    server = create_server(socket_path)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield socket_path
+    server.shutdown()
+    server.server_close()
+
+
+def test_daemon_writes_the_package(tmp_path, read_tree, daemon):
+    spec = PackageSpec("demo", sub_dirs=["core"])
+    result = generate_via_daemon(spec, str(tmp_path / "out"), daemon)
+    generate(spec, str(tmp_path / "local"))
+
+    assert result.written
+    assert read_tree(tmp_path / "out") == read_tree(tmp_path / "local")
+
+
+def test_daemon_streams_archives(daemon):
+    stream = io.BytesIO()
+    archive_via_daemon(PackageSpec("demo"), stream, "tar.gz", daemon)
+
+    with tarfile.open(fileobj=io.BytesIO(stream.getvalue()), mode="r:gz") as archive:
+        assert "demo/setup.py" in archive.getnames()
+
+
+def test_daemon_errors_are_raised(tmp_path, daemon):
+    spec = PackageSpec("demo", include_features=["no_such_feature"])
+
+    with pytest.raises(ValueError, match="Unknown feature"):
+        generate_via_daemon(spec, str(tmp_path / "out"), daemon)
+
+
+def test_client_generates_in_process_without_a_daemon(tmp_path):
+    missing = str(tmp_path / "missing.sock")
+    result = generate_via_daemon(PackageSpec("demo"), str(tmp_path / "out"), missing)
+
+    assert (tmp_path / "out" / "setup.py").is_file()
+    assert "setup.py" in result.written
+
+
+def test_failed_archives_are_answered_with_an_error(tmp_path, daemon):
+    spec = PackageSpec("demo", template_pack=str(tmp_path / "missing"))
+    stream = io.BytesIO()
+
+    with pytest.raises(ValueError, match="Template pack not found"):
+        archive_via_daemon(spec, stream, "tar.gz", daemon)
+    assert stream.getvalue() == b""
+
+
+def _post(address, body, headers):
+    connection = _connect(address)
+    try:
+        connection.request("POST", "/generate", body, headers)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def test_token_file_is_private(daemon):
+    assert stat.S_IMODE(os.stat(token_path(daemon)).st_mode) == 0o600
+
+
+@pytest.mark.parametrize(
+    "headers, status",
+    [
+        ({"Content-Type": "text/plain"}, 415),
+        ({"Content-Type": "application/json"}, 403),
+        ({"Content-Type": "application/json", TOKEN_HEADER: "guess"}, 403),
+    ],
+)
+def test_unauthenticated_requests_are_rejected(tmp_path, daemon, headers, status):
+    body = json.dumps({"spec": {"package_name": "demo"}, "target_dir": str(tmp_path)})
+
+    assert _post(daemon, body, headers)[0] == status
+    assert not (tmp_path / "setup.py").exists()
+
+
+@pytest.mark.parametrize(
+    "request_data",
+    [[1], {"spec": "demo", "archive": "zip"}, {"spec": {"package_name": "demo"}}],
+)
+def test_malformed_requests_are_answered_with_an_error(daemon, request_data):
+    with open(token_path(daemon)) as f:
+        headers = {"Content-Type": "application/json", TOKEN_HEADER: f.read()}
+
+    status, data = _post(daemon, json.dumps(request_data), headers)
+
+    assert status == 400
+    assert data["error"]
+
+
+def test_client_does_not_fall_back_once_the_request_was_sent(tmp_path):
+    import socket
+
+    socket_path = str(tmp_path / "hangup.sock")
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(socket_path)
+    listener.listen()
+
+    def hang_up():
+        connection, _ = listener.accept()
+        connection.recv(65536)
+        connection.close()
+
+    thread = threading.Thread(target=hang_up, daemon=True)
+    thread.start()
+    try:
+        with pytest.raises(OSError):
+            generate_via_daemon(PackageSpec("demo"), str(tmp_path / "out"), socket_path)
+    finally:
+        thread.join()
+        listener.close()
+    assert not (tmp_path / "out").exists()
+
+
+@pytest.fixture
+def tcp_daemon():
+    server = create_server(host="127.0.0.1", port=0)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def test_clients_find_the_token_for_any_spelling_of_the_host(tmp_path, tcp_daemon):
+    result = generate_via_daemon(
+        PackageSpec("demo"), str(tmp_path / "out"), f"localhost:{tcp_daemon}"
+    )
+
+    assert "setup.py" in result.written
+    assert token_path(f"localhost:{tcp_daemon}") == token_path(f":{tcp_daemon}")
+
+
+def test_serve_removes_the_token_of_the_port_it_was_given(monkeypatch):
+    from http.server import ThreadingHTTPServer
+
+    from pkg_wizard.server import serve
+
+    token_files = []
+
+    def serve_forever(server, poll_interval=0.5):
+        token_files.append(token_path(f"127.0.0.1:{server.server_address[1]}"))
+        assert os.path.exists(token_files[0])
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(ThreadingHTTPServer, "serve_forever", serve_forever)
+    serve(host="127.0.0.1", port=0)
+
+    assert not os.path.exists(token_files[0])
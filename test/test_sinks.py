@@ -0,0 +1,71 @@
+"""Archive sinks hold the same files as a generation on disk."""
+
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from pkg_wizard.generator import generate
+from pkg_wizard.spec import PackageSpec
+from pkg_wizard.utils.lock import LOCK_FILE
+from pkg_wizard.utils.sink import ArchiveSink
+
+
+def _tar_files(data):
+    with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as archive:
+        return {
+            member.name: (archive.extractfile(member).read(), member.mode)
+            for member in archive
+            if member.isfile()
+        }
+
+
+def _zip_files(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        return {
+            info.filename: (archive.read(info), info.external_attr >> 16 & 0o777)
+            for info in archive.infolist()
+            if not info.is_dir()
+        }
+
+
+@pytest.mark.parametrize("archive_format", ["tar.gz", "zip"])
+def test_archive_matches_the_generated_tree(tmp_path, read_tree, archive_format):
+    spec = PackageSpec("demo", sub_dirs=["core"])
+    generate(spec, str(tmp_path))
+    expected = read_tree(tmp_path)
+
+    stream = io.BytesIO()
+    result = generate(spec, sink=ArchiveSink(stream, archive_format, root="demo"))
+    read = _tar_files if archive_format == "tar.gz" else _zip_files
+    members = read(stream.getvalue())
+
+    assert {name: data for name, (data, _) in members.items()} == {
+        f"demo/{path}": data for path, data in expected.items()
+    }
+    assert set(result.written) | {LOCK_FILE} == set(expected)
+    assert members["demo/.devcontainer/post-create.sh"][1] == 0o755
+
+
+def test_archive_sink_writes_to_unseekable_streams():
+    class Unseekable(io.RawIOBase):
+        def __init__(self):
+            self.data = bytearray()
+
+        def writable(self):
+            return True
+
+        def write(self, data):
+            self.data += data
+            return len(data)
+
+    stream = Unseekable()
+    generate(PackageSpec("demo"), sink=ArchiveSink(stream, "tar.gz"))
+
+    assert "setup.py" in _tar_files(bytes(stream.data))
+
+
+def test_archive_sink_rejects_unknown_formats():
+    with pytest.raises(ValueError):
+        ArchiveSink(io.BytesIO(), "rar")
@@ -0,0 +1,72 @@
+"""Spans count the filesystem calls that were actually made, and are reported."""
+
+import io
+import json
+import os
+
+import pytest
+
+from pkg_wizard.generator import generate
+from pkg_wizard.spec import PackageSpec
+from pkg_wizard.utils.events import emit_timings, get_event_sink
+from pkg_wizard.utils.trace import Tracer, count_call
+
+
+def _spans(tracer, category):
+    return {
+        event["name"]: event["args"]
+        for event in tracer.events
+        if event["cat"] == category
+    }
+
+
+def test_count_call_counts_into_span_arguments(tmp_path):
+    args = {}
+    count_call(args, os.stat, str(tmp_path))
+    count_call(args, os.listdir, str(tmp_path))
+
+    assert args == {"fs_calls": 2}
+    assert count_call(None, os.path.isdir, str(tmp_path))
+
+
+def test_writes_count_their_calls(tmp_path):
+    tracer = Tracer()
+    generate(PackageSpec("demo"), str(tmp_path), tracer=tracer)
+    writes = _spans(tracer, "write")
+
+    # A rendered file is opened and written, a script is also chmod-ed.
+    assert writes["readme.md"]["fs_calls"] == 2
+    assert writes[os.path.join(".devcontainer", "post-create.sh")]["fs_calls"] == 3
+    assert all(args["fs_calls"] >= 2 for args in writes.values())
+    # The lockfile did not exist yet: a failed open, then an open and a write.
+    assert _spans(tracer, "lock")["load"]["fs_calls"] == 1
+    assert _spans(tracer, "lock")["save"]["fs_calls"] == 2
+
+
+def test_unchanged_reruns_make_no_write_calls(tmp_path):
+    generate(PackageSpec("demo"), str(tmp_path))
+    tracer = Tracer()
+    generate(PackageSpec("demo"), str(tmp_path), tracer=tracer)
+
+    assert _spans(tracer, "write") == {}
+    assert _spans(tracer, "lock")["load"]["fs_calls"] == 2
+    assert "Files: 0 created, 0 updated" in tracer.summary()
+
+
+@pytest.mark.parametrize("event_format", ["human", "quiet", "json"])
+def test_every_event_format_writes_the_timings(tmp_path, event_format):
+    tracer = Tracer()
+    generate(PackageSpec("demo"), str(tmp_path), tracer=tracer)
+    stream = io.StringIO()
+    events = get_event_sink(event_format, stream)
+
+    emit_timings(events, tracer)
+    events.flush()
+
+    if event_format == "json":
+        event = json.loads(stream.getvalue())
+        assert event["event"] == "timings"
+        assert event["stages"]["write"]["fs_calls"] > 0
+        assert event["files"]["created"] > 0
+    else:
+        assert "FS calls" in stream.getvalue()
@@ -0,0 +1,57 @@
+"""gps watch re-renders previews from its own copy of the templates."""
+
+import argparse
+import io
+import shutil
+
+from pkg_wizard.cli import add_spec_arguments, spec_from_args
+from pkg_wizard.generator import generate
+from pkg_wizard.spec import PackageSpec
+from pkg_wizard.utils.events import get_event_sink
+from pkg_wizard.utils.template import get_registry
+from pkg_wizard.watch import CONTENT_DIR, PreviewWatcher
+
+
+def _watcher(tmp_path, spec):
+    content_dir = tmp_path / "content"
+    shutil.copytree(CONTENT_DIR, content_dir)
+    events = get_event_sink("human", io.StringIO())
+    watcher = PreviewWatcher([(spec, str(tmp_path / "preview"))], events, content_dir)
+    watcher.start()
+    return content_dir, watcher
+
+
+def test_changed_templates_are_re_rendered(tmp_path):
+    content_dir, watcher = _watcher(tmp_path, PackageSpec("demo"))
+    template = content_dir / "configurations" / ".gitignore"
+    template.write_text("changed\n")
+
+    assert watcher.update([str(template)]) == 1
+    assert (tmp_path / "preview" / ".gitignore").read_text() == "changed\n"
+
+
+def test_changed_templates_do_not_leak_into_other_generations(tmp_path):
+    content_dir, watcher = _watcher(tmp_path, PackageSpec("demo"))
+    template = content_dir / "configurations" / ".gitignore"
+    template.write_text("changed\n")
+    watcher.update([str(template)])
+
+    generate(PackageSpec("other"), str(tmp_path / "other"))
+
+    assert (tmp_path / "other" / ".gitignore").read_text() != "changed\n"
+    assert get_registry().get("configurations", ".gitignore").source != "changed\n"
+
+
+def test_watch_accepts_every_spec_option():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("package_name")
+    add_spec_arguments(parser)
+    args = parser.parse_args(
+        ["demo", "--lazy_init", "--installer", "uv", "--pre_commit_profile", "fast"]
+    )
+
+    spec = spec_from_args(parser, args)
+
+    assert spec.lazy_init
+    assert spec.installer == "uv"
+    assert spec.pre_commit_profile == "fast"
@@ -0,0 +1,94 @@
+"""Build `gps` as a single-file zipapp.
+
+The archive holds the `pkg_wizard` package as precompiled bytecode and all of
+`pkg_wizard/content` packed into one indexed bundle, stored uncompressed as the
+first member so that it is memory-mapped straight from the `.pyz` at runtime.
+
+    python tools/build_zipapp.py              # writes dist/gps.pyz
+    python dist/gps.pyz my_package
+
+Bytecode is specific to a Python minor version: the archive runs on the
+interpreter that built it, which the shebang names.
+"""
+
+import argparse
+import compileall
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_DIR = os.path.join(REPO_ROOT, "pkg_wizard")
+
+sys.path.insert(0, REPO_ROOT)
+
+from pkg_wizard.utils.bundle import BUNDLE_FILE, pack_bundle  # noqa: E402
+
+DEFAULT_OUTPUT = os.path.join(REPO_ROOT, "dist", "gps.pyz")
+DEFAULT_INTERPRETER = "/usr/bin/env python{}.{}".format(*sys.version_info[:2])
+
+MAIN = "from pkg_wizard.cli import main\n\nmain()\n"
+
+
+def _stage(staging, keep_sources):
+    package_dir = os.path.join(staging, "pkg_wizard")
+    shutil.copytree(
+        PACKAGE_DIR,
+        package_dir,
+        ignore=shutil.ignore_patterns("content", "__pycache__", "*.pyc", BUNDLE_FILE),
+    )
+    compileall.compile_dir(package_dir, quiet=1, legacy=True, optimize=0)
+    if not keep_sources:
+        for root, _, files in os.walk(package_dir):
+            for name in files:
+                if name.endswith(".py"):
+                    os.remove(os.path.join(root, name))
+    return package_dir
+
+
+def build(output=DEFAULT_OUTPUT, interpreter=DEFAULT_INTERPRETER, keep_sources=False):
+    """Build the zipapp.
+
+    Args:
+        output (str, optional): The path of the `.pyz` file.
+        interpreter (str, optional): The interpreter named in the shebang.
+        keep_sources (bool, optional): Ship the `.py` files next to the bytecode,
+            for readable tracebacks.
+
+    Returns:
+        str: The path of the `.pyz` file.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with tempfile.TemporaryDirectory() as staging:
+        package_dir = _stage(staging, keep_sources)
+        with open(output, "wb") as f:
+            f.write(f"#!{interpreter}\n".encode("utf-8"))
+            with zipfile.ZipFile(f, "w", zipfile.ZIP_STORED) as archive:
+                archive.writestr(
+                    f"pkg_wizard/{BUNDLE_FILE}",
+                    pack_bundle(os.path.join(PACKAGE_DIR, "content")),
+                )
+                for root, dirs, files in os.walk(package_dir):
+                    dirs.sort()
+                    for name in sorted(files):
+                        path = os.path.join(root, name)
+                        archive.write(path, os.path.relpath(path, staging))
+                archive.writestr("__main__.py", MAIN)
+    os.chmod(output, 0o755)
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("-p", "--python", default=DEFAULT_INTERPRETER)
+    parser.add_argument("--keep_sources", action="store_true")
+    args = parser.parse_args()
+    output = build(args.output, args.python, args.keep_sources)
+    print(f"Built {output} ({os.path.getsize(output)} bytes)")
+
+
+if __name__ == "__main__":
+    main()